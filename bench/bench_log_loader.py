@@ -0,0 +1,100 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       bench\bench_log_loader.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+#
+# Rows/second of LogReader on a synthetic DxSetup log (10 million rows, mixed line endings) vs the csv module
+# Run from the repository root: python -m bench.bench_log_loader [rows]
+########################################################################################################################
+
+# python packages
+from datetime import datetime
+import tempfile
+import time
+import csv
+import sys
+import os
+# custom packages
+from src.options.LogReader import LogReader
+
+ROWS = 10000000
+BLOCK = 100000
+CSV_ROWS = 1000000
+
+
+########################################################################################################################
+def write_log(filename, rows):
+    """
+    Synthetic VL53L4CD log, one sample per ms, header like DxRecord, every third row ends with \r\n
+    """
+    with open(filename, 'wb') as file:
+        file.write(b"Date, 2026 10 18 - 10:00:00\r\nInterface,Herb Sensors,v1.00 - 09.04.2024\nDistance Setup\n"
+                   b"Port,COM3\r\nTime, Status, Distance (mm), Signal (kcps/spad)\r\n")
+        for start in range(0, rows, BLOCK):
+            lines = []
+            for i in range(start, min(start + BLOCK, rows)):
+                second, ms = divmod(i, 1000)
+                minute, second = divmod(second, 60)
+                hour, minute = divmod(minute, 60)
+                lines.append("{:02d}:{:02d}:{:02d}:{:06d}, {}, {}, {}{}".format(
+                    (10 + hour) % 24, minute, second, ms * 1000, 0, 100 + i % 1000, 2000 + i % 77,
+                    "\r\n" if i % 3 == 0 else "\n"))
+            file.write("".join(lines).encode())
+
+
+def load_csv(filename, rows):
+    """
+    Reference: csv module and datetime.strptime, first rows only
+    """
+    data = []
+    with open(filename, newline='') as file:
+        reader = csv.reader(file)
+        for _ in range(5):
+            next(reader)
+        for i, row in enumerate(reader):
+            if i == rows:
+                break
+            data.append((datetime.strptime(row[0], "%H:%M:%S:%f"), *map(float, row[1:])))
+    return data
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    with tempfile.TemporaryDirectory() as folder:
+        filename = os.path.join(folder, "DxSetup_log_bench.csv")
+        print("[INFO] Writing {:,} rows...".format(rows))
+        write_log(filename, rows)
+        print("[INFO] {:.0f} MB".format(os.path.getsize(filename) / 1e6))
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        csv_rows = min(rows, CSV_ROWS)
+        start = time.perf_counter()
+        load_csv(filename, csv_rows)
+        elapsed = time.perf_counter() - start
+        print("{:<36}{:>14,.0f} rows/s".format("csv + strptime ({:,} rows)".format(csv_rows), csv_rows / elapsed))
+
+        start = time.perf_counter()
+        data = LogReader(filename).load()
+        elapsed = time.perf_counter() - start
+        print("{:<36}{:>14,.0f} rows/s".format("LogReader.load", len(data) / elapsed))
+
+        start = time.perf_counter()
+        count = 0
+        for chunk in LogReader(filename, chunk_size=1 << 24).chunks():
+            count += len(chunk)
+        elapsed = time.perf_counter() - start
+        print("{:<36}{:>14,.0f} rows/s".format("LogReader.chunks (16 MB)", count / elapsed))
+        assert count == len(data) == rows
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       bench\bench_parsers.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+#
+# Micro-benchmark of the line parsers, lines/second before (str.replace chains) and after (src.core.Parsers), one
+# line at a time, one large buffer and chunks as drained by the readers (parse_samples, the acquisition path)
+# Run from the repository root: python -m bench.bench_parsers
+########################################################################################################################
+
+# python packages
+import time
+# custom packages
+from src.core.Parsers import *
+
+N_LINES = 200000
+# lines drained from the port at once, about 60 ms at 1 kHz
+CHUNK_LINES = 64
+
+
+########################################################################################################################
+# parsers as they were in the device classes
+def legacy_mlx90614(line):
+    line = line.decode("utf-8").replace("\n", "")
+    data = (line.replace("Ambient = ", "").replace("Object = ", "").
+            replace("*C", "").replace("\r\n", "").split("\t"))
+    return float(data[0]), float(data[1])
+
+
+def legacy_vl53l4cd(line):
+    line = line.decode("utf-8").replace("\n", "")
+    data = (line.replace("Status = ", "").
+            replace("Distance = ", "").replace(" mm", "").
+            replace("Signal = ", "").replace(" kcps/spad", "").
+            replace("\t", "").replace("\r\n", "").split(","))
+    return int(data[0]), int(data[1]), int(data[2])
+
+
+def legacy_hc_sr04(line):
+    line = line.decode("utf-8").replace("\n", "")
+    data = line.replace("1: ", "").replace(" cm", "").replace("\t", "").replace("\r\n", "")
+    return float(data)
+
+
+def legacy_amg8833_row(line):
+    line = line.decode("utf-8").replace("\n", "")
+    data = line.replace("[", "").replace("\n", "").split(", ")
+    data.remove('\r')
+    return [float(x) for x in data]
+
+
+FORMATS = (
+    ("MLX90614", b"Ambient = 21.53*C\tObject = 30.25*C\r\n", legacy_mlx90614, MLX90614_CELSIUS),
+    ("VL53L4CD", b"Status =   0, Distance =   123 mm, Signal =    456 kcps/spad\r\n", legacy_vl53l4cd, VL53L4CD),
+    ("HC-SR04", b"1: 12.50 cm\r\n", legacy_hc_sr04, HC_SR04),
+    ("AMG8833 row", b"[25.00, 25.25, 25.50, 25.00, 24.75, 25.00, 25.25, 25.00, \r\n", legacy_amg8833_row,
+     AMG8833_ROW),
+)
+
+
+########################################################################################################################
+def lines_per_second(function, lines):
+    start = time.perf_counter()
+    for line in lines:
+        function(line)
+    return len(lines) / (time.perf_counter() - start)
+
+
+def main():
+    print("{:<12} {:>14} {:>14} {:>14} {:>14}".format("format", "legacy l/s", "parse l/s", "batch l/s", "chunk l/s"))
+    for name, line, legacy, parser in FORMATS:
+        lines = [line] * N_LINES
+        buffer = line * N_LINES
+
+        legacy_rate = lines_per_second(legacy, lines)
+        parse_rate = lines_per_second(parser.parse, lines)
+
+        start = time.perf_counter()
+        parser.parse_batch(buffer)
+        batch_rate = N_LINES / (time.perf_counter() - start)
+
+        # rows of a frame have no time of their own, they are only parsed
+        chunk = line * CHUNK_LINES
+        parse_chunk = getattr(parser, 'parse_samples', None) or (lambda buffer, seconds: parser.parse_batch(buffer))
+        start = time.perf_counter()
+        for _ in range(N_LINES // CHUNK_LINES):
+            parse_chunk(chunk, 0.0)
+        chunk_rate = N_LINES // CHUNK_LINES * CHUNK_LINES / (time.perf_counter() - start)
+
+        print("{:<12} {:>14,.0f} {:>14,.0f} {:>14,.0f} {:>14,.0f}".format(name, legacy_rate, parse_rate, batch_rate,
+                                                                        chunk_rate))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       bench\bench_ports.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+#
+# Scaling of the acquisition from 1 to 16 simulated ports (src.simulate, one process per board): samples delivered to
+# the sink with one reading thread per port ('thread' transport) vs one reading process per port ('process'
+# transport, shared memory), and CPU load left in the main (GUI) process. Linux/macOS only (pseudo-terminals):
+#   python -m bench.bench_ports
+#   python -m bench.bench_ports --sensor AMG8833 --rate 500 --ports 1,4,16 --duration 5
+########################################################################################################################
+
+# python packages
+import subprocess
+import argparse
+import sys
+import time
+# custom packages
+from src.acquire import SENSORS, SampleCounter
+from src.comm.ProcessReader import ProcessReader
+from src.comm.SerialReader import SerialReader
+
+WARMUP = 1.0
+
+
+########################################################################################################################
+def start_simulators(sensor, rate, n):
+    """
+    :return: list of (simulator process, port)
+    """
+    simulators = []
+    for i in range(n):
+        process = subprocess.Popen([sys.executable, '-m', 'src.simulate', '--sensor', sensor, '--rate', str(rate)],
+                                   stdout=subprocess.PIPE, text=True)
+        # "[INFO] <sensor> simulated on <port>"
+        simulators.append((process, process.stdout.readline().split()[-1]))
+    return simulators
+
+
+def stop_simulators(simulators):
+    for process, port in simulators:
+        process.terminate()
+        process.wait()
+
+
+# ******************************************************************************************************************** #
+def run(sensor, rate, n, transport, duration):
+    """
+    :return: (samples delivered per second, CPU load of this process in %)
+    """
+    simulators = start_simulators(sensor, rate, n)
+    counter = SampleCounter()
+    readers = []
+    for process, port in simulators:
+        settings = {'setup': sensor, 'com_port': port, 'scales': 'Celsius', 'debug': False, 'record': False}
+        acquisition = SENSORS[sensor](settings=settings)
+        if transport == 'process':
+            reader = ProcessReader(acquisition=acquisition, settings=settings, sink=counter.push)
+        else:
+            reader = SerialReader(port=port, baudrate=acquisition.baudrate, parser=acquisition.handle_chunk,
+                                  sink=counter.push)
+        readers.append(reader)
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+    for reader in readers:
+        reader.start()
+    # reading processes need time to start (imports), measures begin once all ports are open
+    for reader in readers:
+        if transport == 'process':
+            reader.ready.wait(timeout=60)
+    time.sleep(WARMUP)
+
+    samples = counter.samples
+    cpu = time.process_time()
+    start = time.perf_counter()
+    time.sleep(duration)
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu
+    samples = counter.samples - samples
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+    for reader in readers:
+        reader.stop()
+    stop_simulators(simulators)
+    return samples / elapsed, 100 * cpu / elapsed
+
+
+########################################################################################################################
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scaling of the acquisition with the number of ports")
+    parser.add_argument('--sensor', default='AMG8833', choices=sorted(SENSORS))
+    parser.add_argument('--rate', default=200.0, type=float, help="samples (frames) per second per port")
+    parser.add_argument('--ports', default='1,2,4,8,16', help="numbers of ports, comma separated")
+    parser.add_argument('--transports', default='thread,process', help="transports, comma separated")
+    parser.add_argument('--duration', default=3.0, type=float, help="seconds measured per run (default: 3)")
+    args = parser.parse_args(argv)
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+    print("{} at {:g} samples/s per port, {:g} s per run".format(args.sensor, args.rate, args.duration))
+    print("{:>5}  {:<8} {:>14} {:>10} {:>10}".format("ports", "mode", "delivered/s", "of sent", "main CPU"))
+    for n in [int(n) for n in args.ports.split(',')]:
+        for transport in args.transports.split(','):
+            delivered, cpu = run(args.sensor, args.rate, n, transport, args.duration)
+            print("{:>5}  {:<8} {:>14,.0f} {:>9.1f}% {:>9.1f}%".format(n, transport, delivered,
+                                                                       100 * delivered / (n * args.rate), cpu))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       bench\bench_recorder.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+#
+# Sustained samples/second of the recorders: legacy per-sample write vs buffered background writer
+# Run from the repository root: python -m bench.bench_recorder
+########################################################################################################################
+
+# python packages
+from datetime import datetime
+import tempfile
+import time
+import os
+# custom packages
+from src.options.DxRecord import DxRecord
+
+SAMPLES = 200000
+
+
+########################################################################################################################
+def legacy(filename):
+    file = open(filename, 'w')
+    start = time.perf_counter()
+    for i in range(SAMPLES):
+        file.write("{}, {}, {}, {}\n".format(datetime.now().strftime("%H:%M:%S:%f"), 0, i, 1234))
+    file.close()
+    elapsed = time.perf_counter() - start
+    return SAMPLES / elapsed, SAMPLES / elapsed
+
+
+def buffered(filename, **options):
+    record = DxRecord({'com_port': 'bench'}, filename=filename, **options)
+    start = time.perf_counter()
+    for i in range(SAMPLES):
+        record.save_data(0, i, 1234)
+    # time spent in the caller (acquisition thread)
+    enqueued = time.perf_counter() - start
+    record.close_record()
+    # time until everything is on disk
+    written = time.perf_counter() - start
+    return SAMPLES / enqueued, SAMPLES / written
+
+
+def main():
+    with tempfile.TemporaryDirectory() as folder:
+        filename = os.path.join(folder, "bench.csv")
+        print("{:<32}{:>16}{:>16}".format("recorder", "caller [S/s]", "on disk [S/s]"))
+        caller, disk = legacy(filename)
+        print("{:<32}{:>16.0f}{:>16.0f}".format("legacy write per sample", caller, disk))
+        for flush_interval, max_batch in ((1.0, 100), (1.0, 1000), (1.0, 10000), (0.1, 1000)):
+            caller, disk = buffered(filename, flush_interval=flush_interval, max_batch=max_batch)
+            label = "engine flush {}s batch {}".format(flush_interval, max_batch)
+            print("{:<32}{:>16.0f}{:>16.0f}".format(label, caller, disk))
+        for compression in ('gzip', 'zstd'):
+            caller, disk = buffered(filename, compression=compression, rotate_size=10000000)
+            label = "engine {} rotate 10 MB".format(compression)
+            print("{:<32}{:>16.0f}{:>16.0f}".format(label, caller, disk))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,354 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       bench\bench_suite.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+#
+# Benchmark of every stage of the hot path on synthetic data: parse, frame assembly, rolling window, recorder and
+# pyqtgraph rendering (offscreen), plus startup of a fresh interpreter (import of the program, time to the first
+# sample of a simulated sensor, Linux/macOS only). Reports samples/second and p50/p99 latency per call, results are
+# saved as JSON to compare commits:
+#   python -m bench.bench_suite                                  -> bench/results/suite_<commit>.json
+#   python -m bench.bench_suite --compare bench/results/suite_<other commit>.json
+#   python -m bench.bench_suite --filter parse --duration 2
+########################################################################################################################
+
+# python packages
+from datetime import datetime
+from pathlib import *
+import numpy as np
+import subprocess
+import itertools
+import argparse
+import platform
+import tempfile
+import json
+import time
+import sys
+import os
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+# custom packages
+from src.core.FrameAssembler import FrameAssembler
+from src.core.Parsers import *
+from src.core.RingBuffer import RingBuffer
+from src.core.Upscaler import Upscaler
+
+RESULTS = Path("bench/results")
+
+# one line of each firmware, with small variations
+MLX90614_LINES = [b"Ambient = %.2f*C\tObject = %.2f*C\r\n" % (22 + i / 100, 30 + i / 10) for i in range(100)]
+VL53L4CD_LINES = [b"Status = %3u, Distance = %5u mm, Signal = %6u kcps/spad\r\n" % (0, 100 + i, 2000 - i)
+                  for i in range(100)]
+HC_SR04_LINES = [b"1: %.2f cm\r\n" % (50 + i / 10) for i in range(100)]
+AMG8833_ROWS = [b"".join(b"%.2f, " % (20 + (i + j) / 10) for j in range(8)) + b"\r\n" for i in range(8)]
+AMG8833_FRAME = [b"[" + AMG8833_ROWS[0]] + AMG8833_ROWS[1:] + [b"]\r\n", b"\r\n"]
+
+# run by a fresh interpreter: dialog settings, view of one sensor (setup, sensor) on a simulated port, exits once the
+# first samples reached the view
+STARTUP_SCRIPT = """
+import os, sys
+os.environ['QT_QPA_PLATFORM'] = 'offscreen'
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QApplication
+from src.ComSelect import ComSelect
+from src.comm.SensorSimulator import SensorSimulator
+from src.main import create_device
+app = QApplication([])
+simulator = SensorSimulator(sys.argv[2], rate=100)
+simulator.start()
+settings = dict(ComSelect().settings, setup=sys.argv[1], com_port=simulator.port, scales='Celsius', t_min=20,
+                t_max=40, debug=False)
+view = create_device(settings)[3]
+view.init_vi()
+view.bridge.samples_ready.connect(lambda samples: app.exit(0))
+QTimer.singleShot(10000, lambda: app.exit(1))
+view.start_comm()
+code = app.exec()
+view.stop_comm()
+simulator.stop()
+sys.exit(code)
+"""
+
+
+########################################################################################################################
+# CASES: each one returns (function called once per measure, samples handled per call, cleanup or None)
+def case_parse(parser, lines):
+    lines = itertools.cycle(lines)
+    return lambda: parser.parse(next(lines)), 1, None
+
+
+def case_parse_batch(parser, lines, size=1000):
+    buffer = b"".join(itertools.islice(itertools.cycle(lines), size))
+    return lambda: parser.parse_batch(buffer), size, None
+
+
+def case_frame_assembly():
+    assembler = FrameAssembler()
+
+    def call():
+        for line in AMG8833_FRAME:
+            assembler.feed(line)
+    return call, 1, None
+
+
+def case_ring_buffer(batch):
+    window = RingBuffer(capacity=1000, channels=4)
+    samples = np.random.rand(batch, 4)
+
+    def call():
+        window.extend(samples)
+        window.view()
+    return call, batch, None
+
+
+def case_upscale(method):
+    upscaler = Upscaler(out_shape=(64, 64), method=method)
+    frame = (20 + 10 * np.random.rand(8, 8)).astype(np.float32)
+    return lambda: upscaler.apply(frame), 1, None
+
+
+def case_recorder():
+    from src.options.DxRecord import DxRecord
+    folder = tempfile.TemporaryDirectory()
+    record = DxRecord({'com_port': 'bench'}, filename=os.path.join(folder.name, "bench.csv"))
+    counter = itertools.count()
+
+    def cleanup():
+        record.close_record()
+        folder.cleanup()
+    return lambda: record.save_data(0, next(counter), 1234), 1, cleanup
+
+
+def case_render(points, paint, high_rate=False):
+    from PyQt6.QtWidgets import QApplication
+    from src.plots.DxPlot import DxPlot
+    app = QApplication.instance() or QApplication([])
+    plot = DxPlot(tittle='Distance', y_max=1000, high_rate=high_rate)
+    plot.show()
+    t = np.arange(points) * 0.01
+    curves = itertools.cycle([500 + 300 * np.sin(t + phase) for phase in np.linspace(0, 6, 10)])
+
+    def call():
+        plot.update_plot(t, next(curves))
+        if paint:
+            app.processEvents()
+    return call, points, plot.close
+
+
+def case_render_temp2(points, high_rate=False):
+    from PyQt6.QtWidgets import QApplication
+    from src.plots.Temp2Plot import Temp2Plot
+    app = QApplication.instance() or QApplication([])
+    plot = Temp2Plot(plot_tittle='Temperature', scale='Celsius', high_rate=high_rate)
+    plot.show()
+    t = np.arange(points) * 0.01
+    y = 25 + 5 * np.sin(t)
+
+    def call():
+        plot.update_plot(t, y, y + 1)
+        app.processEvents()
+    return call, points, plot.close
+
+
+def case_view_high_rate(rate, frame_rate=30):
+    """
+    One frame of the VL53L4CD view at `rate` Hz, default window of the dialog and high-rate plots: ingest of the
+    samples received during a frame, then render. A simulated sensor at `rate` Hz first fills the window, to check that
+    the plot then draws the decimated window and not every sample
+    """
+    from PyQt6.QtCore import QTimer
+    from PyQt6.QtWidgets import QApplication
+    from src.ComSelect import ComSelect
+    from src.comm.SensorSimulator import SensorSimulator
+    from src.main import create_device
+    app = QApplication.instance() or QApplication([])
+    simulator = SensorSimulator('VL53L4CD', rate=rate)
+    settings = dict(ComSelect().settings, setup='VL53L4CD', com_port=simulator.port, high_rate=True, debug=False)
+    view = create_device(settings)[3]
+    view.init_vi()
+    view.show()
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+    simulator.start()
+    view.start_comm()
+    QTimer.singleShot(int((settings['window'] + 1) * 1000), lambda: app.exit(0))
+    app.exec()
+    view.stop_comm()
+    simulator.stop()
+    view.render()
+    shown = view.window.view().shape[1]
+    drawn = len(view.distance_plot.value_plot.xData)
+    if shown <= 2 * max(int(view.distance_plot.view_box.width()), 1) or drawn >= shown:
+        raise RuntimeError("{} samples in the {} s window, {} drawn: decimation not used".format(
+            shown, settings['window'], drawn))
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+    # timed frames use synthetic samples, at the same rate
+    view.reset_view()
+    batch = max(int(rate / frame_rate), 1)
+    counter = itertools.count()
+
+    def call():
+        t = (next(counter) * batch + np.arange(batch)) / rate
+        view.update_view(np.column_stack((t, np.zeros(batch), 500 + 300 * np.sin(t), 2000 - t % 100)))
+        view.render()
+        app.processEvents()
+    return call, batch, view.close
+
+
+def case_startup(*arguments):
+    """
+    One call: a fresh interpreter runs the arguments, e.g. ('-c', 'import src.main')
+    """
+    command = [sys.executable] + list(arguments)
+    return lambda: subprocess.run(command, check=True, capture_output=True), 1, None
+
+
+def case_import_main():
+    """
+    One call: a fresh interpreter imports the program. Fails if a sensor module is imported with it
+    """
+    result = subprocess.run([sys.executable, '-c', LAZY_IMPORTS_SCRIPT], capture_output=True, text=True)
+    if result.returncode:
+        raise RuntimeError(result.stderr.strip())
+    return case_startup('-c', LAZY_IMPORTS_SCRIPT)
+
+
+CASES = [
+    ('parse', 'MLX90614 line', lambda: case_parse(MLX90614_CELSIUS, MLX90614_LINES)),
+    ('parse', 'VL53L4CD line', lambda: case_parse(VL53L4CD, VL53L4CD_LINES)),
+    ('parse', 'HC-SR04 line', lambda: case_parse(HC_SR04, HC_SR04_LINES)),
+    ('parse', 'AMG8833 row', lambda: case_parse(AMG8833_ROW, AMG8833_ROWS)),
+    ('parse', 'VL53L4CD batch 1000', lambda: case_parse_batch(VL53L4CD, VL53L4CD_LINES)),
+    ('frame', 'AMG8833 frame assembly', case_frame_assembly),
+    ('frame', 'AMG8833 upscale bilinear 64', lambda: case_upscale('bilinear')),
+    ('frame', 'AMG8833 upscale bicubic 64', lambda: case_upscale('bicubic')),
+    ('window', 'ring buffer extend 1', lambda: case_ring_buffer(1)),
+    ('window', 'ring buffer extend 100', lambda: case_ring_buffer(100)),
+    ('record', 'DxRecord save_data', case_recorder),
+    ('render', 'DxPlot setData 1000', lambda: case_render(1000, False)),
+    ('render', 'DxPlot setData+paint 1000', lambda: case_render(1000, True)),
+    ('render', 'DxPlot setData+paint 10000', lambda: case_render(10000, True)),
+    ('render', 'Temp2Plot setData+paint 1000', lambda: case_render_temp2(1000)),
+    ('render', 'DxPlot high-rate paint 10000', lambda: case_render(10000, True, high_rate=True)),
+    ('render', 'DxPlot setData+paint 100000', lambda: case_render(100000, True)),
+    ('render', 'DxPlot high-rate paint 100000', lambda: case_render(100000, True, high_rate=True)),
+    ('render', 'Temp2Plot high-rate paint 100000', lambda: case_render_temp2(100000, high_rate=True)),
+    ('render', 'VL53L4CD view 1 kHz high-rate', lambda: case_view_high_rate(1000)),
+    ('startup', 'python interpreter', lambda: case_startup('-c', 'pass')),
+    ('startup', 'import src.main', case_import_main),
+    ('startup', 'AMG8833 first sample', lambda: case_startup('-c', STARTUP_SCRIPT, 'devices', 'AMG8833')),
+    ('startup', 'MLX90614 first sample', lambda: case_startup('-c', STARTUP_SCRIPT, 'MLX90614', 'MLX90614')),
+    ('startup', 'VL53L4CD first sample', lambda: case_startup('-c', STARTUP_SCRIPT, 'VL53L4CD', 'VL53L4CD')),
+    ('startup', 'HC-SR04 first sample', lambda: case_startup('-c', STARTUP_SCRIPT, 'HC-SR04', 'HC-SR04')),
+]
+
+# sensor modules are only imported once a sensor is chosen: none of them may come with the program
+LAZY_IMPORTS_SCRIPT = """
+import sys
+import src.main
+loaded = sorted(name for name in sys.modules if name == 'src.acquire' or name.startswith(('src.acquisition.',
+                'src.devices.')) or name.startswith('src.options.') and name.endswith('Record'))
+if loaded:
+    sys.exit("imported with src.main: " + ", ".join(loaded))
+"""
+
+
+########################################################################################################################
+def measure(call, samples_per_call, duration):
+    """
+    Call repeatedly during duration seconds, every call is timed
+    :return: samples/s and per-call latency statistics
+    """
+    # warm up
+    for _ in range(10):
+        call()
+
+    latencies = []
+    clock = time.perf_counter_ns
+    end = clock() + int(duration * 1e9)
+    while True:
+        start = clock()
+        call()
+        stop = clock()
+        latencies.append(stop - start)
+        if stop > end:
+            break
+
+    latencies = np.array(latencies) / 1000
+    return {
+        'calls': len(latencies),
+        'samples_per_s': samples_per_call * len(latencies) / (latencies.sum() / 1e6),
+        'p50_us': float(np.percentile(latencies, 50)),
+        'p99_us': float(np.percentile(latencies, 99)),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark of the acquisition and display stages")
+    parser.add_argument('--duration', default=0.5, type=float, help="seconds per case (default: 0.5)")
+    parser.add_argument('--filter', default='', help="only cases whose stage or name contains this text")
+    parser.add_argument('--output', default=None, help="JSON file (default: bench/results/suite_<commit>.json)")
+    parser.add_argument('--compare', default=None, help="JSON file of a previous run")
+    args = parser.parse_args(argv)
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+    reference = {}
+    if args.compare:
+        with open(args.compare) as file:
+            reference = {(case['stage'], case['name']): case for case in json.load(file)['cases']}
+
+    commit = git_commit()
+    results = {
+        'commit': commit,
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'cases': [],
+    }
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+    print("{:<8}{:<32}{:>14}{:>11}{:>11}{}".format("stage", "case", "samples/s", "p50 [us]", "p99 [us]",
+                                                    "   vs ref" if reference else ""))
+    for stage, name, case in CASES:
+        if args.filter not in stage and args.filter not in name:
+            continue
+        call, samples_per_call, cleanup = case()
+        result = measure(call, samples_per_call, args.duration)
+        if cleanup is not None:
+            cleanup()
+        results['cases'].append(dict(stage=stage, name=name, **result))
+
+        ratio = ""
+        if (stage, name) in reference:
+            ratio = "{:>8.2f}x".format(result['samples_per_s'] / reference[(stage, name)]['samples_per_s'])
+        print("{:<8}{:<32}{:>14,.0f}{:>11.2f}{:>11.2f}{}".format(stage, name, result['samples_per_s'],
+                                                                 result['p50_us'], result['p99_us'], ratio))
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+    output = Path(args.output) if args.output else RESULTS.joinpath("suite_{}.json".format(commit))
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as file:
+        json.dump(results, file, indent=4)
+    print("[INFO] Results saved to: {}".format(output))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       bench\bench_upscale.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+#
+# Frames/second of the AMG8833 upscaler for each output size
+# Run from the repository root: python -m bench.bench_upscale
+########################################################################################################################
+
+# python packages
+import numpy as np
+import time
+# custom packages
+from src.core.Upscaler import Upscaler
+
+SIZES = (16, 32, 64, 128, 256, 512)
+DURATION = 0.5
+
+
+########################################################################################################################
+def frames_per_second(upscaler, frame):
+    n = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < DURATION:
+        for _ in range(100):
+            upscaler.apply(frame)
+        n += 100
+    return n / (time.perf_counter() - start)
+
+
+def main():
+    frame = (20 + 10 * np.random.rand(8, 8)).astype(np.float32)
+    print("{:>8} {:>14} {:>14}".format("size", "bilinear f/s", "bicubic f/s"))
+    for size in SIZES:
+        rates = [frames_per_second(Upscaler(out_shape=(size, size), method=method), frame)
+                 for method in ('bilinear', 'bicubic')]
+        print("{:>8} {:>14,.0f} {:>14,.0f}".format("{0}x{0}".format(size), *rates))
+
+
+if __name__ == '__main__':
+    main()
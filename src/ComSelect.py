@@ -17,6 +17,14 @@
 from PyQt6.QtCore import *
 from PyQt6.QtSerialPort import *
 from PyQt6.QtWidgets import *
+# custom packages
+from src.comm.PortProbe import PortProbe
+from src.comm.RenderLoop import MAX_RATE, MIN_RATE, clamp_rate
+from src.core.Units import parse_duration, parse_size
+
+# sensors of the setup combobox, in the same order, as named by the port probe and as setups of main.DEVICES
+SETUP_SENSORS = ('AMG8833', 'MLX90614', 'VL53L4CD', 'HC-SR04')
+SETUPS = ('devices', 'MLX90614', 'VL53L4CD', 'HC-SR04')
 
 
 ########################################################################################################################
@@ -36,8 +44,19 @@ class ComSelect(QDialog):
             'scales': '',
             't_min': 0.0,
             't_max': 0.0,
+            'window': 10.0,
+            'render_rate': 30.0,
+            'display': 'raw',
+            'display_size': 64,
             'debug':  True,
             'record':  False,
+            'record_options': {},
+            'transport': 'thread',
+            'metrics': False,
+            'high_rate': False,
+            'replay': '',
+            'replay_speed': 1.0,
+            'sensors': [],
         }
 
         # ------------------------------------------------------------------------------------------------------------ #
@@ -63,12 +82,39 @@ class ComSelect(QDialog):
         self.com_port_comboBox = QComboBox(self)
         self.com_port_comboBox.addItems(com_ports11)
         self.com_port_comboBox.addItems(com_ports12)
+        # any port can be typed, e.g. /dev/pts/3 of src.simulate
+        self.com_port_comboBox.setEditable(True)
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # sensors identified from what they send, all ports probed in background
+        self.probe = PortProbe(parent=self)
+        self.probe.identified.connect(self.sensor_identified)
+        self.probe.finished.connect(self.detection_finished)
+        self.detected = []
+        # session entries added by the last detection, replaced by the next one
+        self.detected_items = []
+        # sensor, port or units chosen by the user: detection does not overwrite them
+        self.selection_edited = False
+        for combo in (self.setup_comboBox, self.com_port_comboBox):
+            combo.activated.connect(self.edit_selection)
+        self.com_port_comboBox.lineEdit().textEdited.connect(self.edit_selection)
+
+        self.detect_button = QPushButton("Detect")
+        self.detect_button.setFixedWidth(60)
+        self.detect_button.clicked.connect(self.start_detection)
+
+        self.detect_label = QLabel("")
+
+        detect_layout = QHBoxLayout()
+        detect_layout.addWidget(self.detect_button)
+        detect_layout.addWidget(self.detect_label)
         # ------------------------------------------------------------------------------------------------------------ #
         # list all available scales in the combobox for current(s) display(s)
         self.scales_comboBox = QComboBox(self)
         self.scales_comboBox.addItem("Celsius")
         self.scales_comboBox.setEnabled(False)
         self.setup_comboBox.currentTextChanged.connect(self.update_scale_combo)
+        self.scales_comboBox.activated.connect(self.edit_selection)
         # ------------------------------------------------------------------------------------------------------------ #
         t_min_name = QLabel("T. Min (°C):")
         t_min_name.setFixedWidth(80)
@@ -90,16 +136,109 @@ class ComSelect(QDialog):
         range_layout.addWidget(t_max_name)
         range_layout.addWidget(self.t_max_edit)
 
+        # ------------------------------------------------------------------------------------------------------------ #
+        # thermal image display: raw 8x8 pixels or upscaled heatmap
+        self.display_comboBox = QComboBox(self)
+        self.display_comboBox.addItems(('Raw 8x8', 'Bilinear', 'Bicubic'))
+
+        self.display_size_edit = QLineEdit("64")
+        self.display_size_edit.setAlignment(Qt.AlignmentFlag.AlignLeft)
+        self.display_size_edit.setFixedWidth(50)
+
+        display_layout = QHBoxLayout()
+        display_layout.addWidget(self.display_comboBox)
+        display_layout.addWidget(QLabel("Size:"))
+        display_layout.addWidget(self.display_size_edit)
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # length of the rolling plot window, from seconds up to hours
+        self.window_edit = QLineEdit("10")
+        self.window_edit.setAlignment(Qt.AlignmentFlag.AlignLeft)
+        self.window_edit.setFixedWidth(80)
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # refresh rate of plots and labels, whatever the rate of the sensors
+        self.render_rate_edit = QLineEdit("30")
+        self.render_rate_edit.setAlignment(Qt.AlignmentFlag.AlignLeft)
+        self.render_rate_edit.setFixedWidth(80)
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # long recordings: log split by duration (e.g. 24h) and/or size on disk (e.g. 500M), optionally compressed.
+        # Empty fields: one file, not compressed
+        self.rotate_every_edit = QLineEdit("")
+        self.rotate_every_edit.setPlaceholderText("e.g. 24h")
+        self.rotate_every_edit.setFixedWidth(80)
+
+        self.rotate_size_edit = QLineEdit("")
+        self.rotate_size_edit.setPlaceholderText("e.g. 500M")
+        self.rotate_size_edit.setFixedWidth(80)
+
+        self.compression_comboBox = QComboBox(self)
+        self.compression_comboBox.addItems(('Plain CSV', 'gzip', 'zstd'))
+
+        log_layout = QHBoxLayout()
+        log_layout.addWidget(QLabel("Split every:"))
+        log_layout.addWidget(self.rotate_every_edit)
+        log_layout.addWidget(QLabel("or:"))
+        log_layout.addWidget(self.rotate_size_edit)
+        log_layout.addWidget(self.compression_comboBox)
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # recording played instead of the board (empty: live acquisition)
+        self.replay_edit = QLineEdit("")
+        self.replay_edit.setPlaceholderText("Live")
+
+        replay_button = QPushButton("...")
+        replay_button.setFixedWidth(30)
+        replay_button.clicked.connect(self.browse_replay)
+
+        self.replay_speed_comboBox = QComboBox(self)
+        self.replay_speed_comboBox.addItems(('1x', '10x', '100x', 'Max'))
+
+        replay_layout = QHBoxLayout()
+        replay_layout.addWidget(self.replay_edit)
+        replay_layout.addWidget(replay_button)
+        replay_layout.addWidget(self.replay_speed_comboBox)
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # session: sensors opened together in one window, each on its own port (empty: only the sensor above)
+        self.session_list = QListWidget(self)
+        self.session_list.setFixedHeight(70)
+
+        add_button = QPushButton("Add")
+        add_button.setFixedWidth(60)
+        add_button.clicked.connect(self.add_sensor)
+
+        remove_button = QPushButton("Remove")
+        remove_button.setFixedWidth(60)
+        remove_button.clicked.connect(self.remove_sensor)
+
+        session_buttons_layout = QVBoxLayout()
+        session_buttons_layout.addWidget(add_button)
+        session_buttons_layout.addWidget(remove_button)
+        session_buttons_layout.addStretch(1)
+
+        session_layout = QHBoxLayout()
+        session_layout.addWidget(self.session_list)
+        session_layout.addLayout(session_buttons_layout)
+
         # ------------------------------------------------------------------------------------------------------------ #
         setup_layout = QFormLayout(setup_groupbox)
         setup_layout.addRow("Setup:", self.setup_comboBox)
         setup_layout.addRow("Units:", self.scales_comboBox)
         setup_layout.addRow(range_layout)
+        setup_layout.addRow("Display:", display_layout)
+        setup_layout.addRow("Window (s):", self.window_edit)
+        setup_layout.addRow("Refresh (Hz):", self.render_rate_edit)
         setup_layout.addRow(QLabel(""))
         setup_layout.addRow("Board:", self.com_port_comboBox)
+        setup_layout.addRow("", detect_layout)
         self.board_instruction_label = QLabel("Please select COM port with description: 'CSP2102'")
         setup_layout.addRow(self.board_instruction_label)
         setup_layout.addRow(QLabel("Try to disconnect and reconnect microcontroller if unable to ""connect\n"))
+        setup_layout.addRow("Session:", session_layout)
+        setup_layout.addRow("Log files:", log_layout)
+        setup_layout.addRow("Replay:", replay_layout)
         setup_groupbox.setLayout(setup_layout)
         # ************************************************************************************************************ #
         # Option(s) selection
@@ -125,11 +264,55 @@ class ComSelect(QDialog):
         record_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
         record_label.setFixedWidth(100)
         # ------------------------------------------------------------------------------------------------------------ #
+        # check box to use event-driven serial port (QSerialPort) instead of a reading thread
+        self.event_checkBox = QCheckBox()
+        self.event_checkBox.setChecked(False)
+        self.event_checkBox.setFixedWidth(15)
+
+        event_label = QLabel("Event-driven")
+        event_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
+        event_label.setFixedWidth(100)
+        # ------------------------------------------------------------------------------------------------------------ #
+        # check box to read and parse every port in its own process
+        self.process_checkBox = QCheckBox()
+        self.process_checkBox.setChecked(False)
+        self.process_checkBox.setFixedWidth(15)
+
+        process_label = QLabel("Process per port")
+        process_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
+        process_label.setFixedWidth(100)
+        # ------------------------------------------------------------------------------------------------------------ #
+        # check box to show timings and rates of acquisition and display
+        self.metrics_checkBox = QCheckBox()
+        self.metrics_checkBox.setChecked(False)
+        self.metrics_checkBox.setFixedWidth(15)
+
+        metrics_label = QLabel("Metrics")
+        metrics_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
+        metrics_label.setFixedWidth(100)
+        # ------------------------------------------------------------------------------------------------------------ #
+        # check box to decimate plots to their width, for kHz sensors
+        self.high_rate_checkBox = QCheckBox()
+        self.high_rate_checkBox.setChecked(False)
+        self.high_rate_checkBox.setFixedWidth(15)
+
+        high_rate_label = QLabel("High-rate plots")
+        high_rate_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
+        high_rate_label.setFixedWidth(100)
+        # ------------------------------------------------------------------------------------------------------------ #
         options_layout = QHBoxLayout(options_groupbox)
         options_layout.addWidget(self.debug_checkBox)
         options_layout.addWidget(debug_label)
         options_layout.addWidget(self.record_checkBox)
         options_layout.addWidget(record_label)
+        options_layout.addWidget(self.event_checkBox)
+        options_layout.addWidget(event_label)
+        options_layout.addWidget(self.process_checkBox)
+        options_layout.addWidget(process_label)
+        options_layout.addWidget(self.metrics_checkBox)
+        options_layout.addWidget(metrics_label)
+        options_layout.addWidget(self.high_rate_checkBox)
+        options_layout.addWidget(high_rate_label)
         options_groupbox.setLayout(options_layout)
 
         # ------------------------------------------------------------------------------------------------------------ #
@@ -162,62 +345,310 @@ class ComSelect(QDialog):
             self.scales_comboBox.setEnabled(False)
             self.t_min_edit.setEnabled(True)
             self.t_max_edit.setEnabled(True)
+            self.display_comboBox.setEnabled(True)
+            self.display_size_edit.setEnabled(True)
             self.board_instruction_label.setText("Please select COM port with description: 'CP210x'")
         elif text == "Temp. #2 (MLX90614)":
             self.scales_comboBox.addItems(('Celsius', 'Fahrenheit'))
             self.scales_comboBox.setEnabled(True)
             self.t_min_edit.setEnabled(False)
             self.t_max_edit.setEnabled(False)
+            self.display_comboBox.setEnabled(False)
+            self.display_size_edit.setEnabled(False)
             self.board_instruction_label.setText("Please select COM port with description: 'Arduino Micro'")
         elif text == "Dist. #1 (VL53L4CD)":
             self.scales_comboBox.addItem('Millimeters')
             self.scales_comboBox.setEnabled(False)
             self.t_min_edit.setEnabled(False)
             self.t_max_edit.setEnabled(False)
+            self.display_comboBox.setEnabled(False)
+            self.display_size_edit.setEnabled(False)
             self.board_instruction_label.setText("Please select one of COM ports with description: 'USB Serial Device'")
         elif text == "Dist. #2 (HC-SR04)":
             self.scales_comboBox.addItem('Centimeters')
             self.scales_comboBox.setEnabled(False)
             self.t_min_edit.setEnabled(False)
             self.t_max_edit.setEnabled(False)
+            self.display_comboBox.setEnabled(False)
+            self.display_size_edit.setEnabled(False)
             self.board_instruction_label.setText("Please select COM port with description: 'Arduino Micro'")
 
     # **************************************************************************************************************** #
-    def get_settings(self):
+    def start_detection(self):
         """
-        Get settings chosen by user
+        Probe every listed port in background, the dialog is filled as sensors are identified
+        """
+        ports = [self.com_port_comboBox.itemText(i).split(" ")[0] for i in range(self.com_port_comboBox.count())]
+        self.detected = []
+        self.detect_button.setEnabled(False)
+        self.detect_label.setText("Detecting sensors on {} port(s)...".format(len(ports)))
+        self.probe.start(ports)
+
+    # **************************************************************************************************************** #
+    def detect(self):
+        """
+        Probe every listed port and wait for the result, without showing the dialog
+        :return: number of sensors found
+        """
+        loop = QEventLoop()
+        self.probe.finished.connect(loop.quit)
+        self.start_detection()
+        if self.probe.running:
+            loop.exec()
+        self.probe.finished.disconnect(loop.quit)
+        return len(self.detected)
+
+    # **************************************************************************************************************** #
+    def sensor_identified(self, port, sensor, scales):
+        """
+        One sensor found by the probe
+        """
+        self.detected.append((port, sensor, scales))
+        self.detect_label.setText("{} on {}".format(sensor, port))
+        if self.debug_checkBox.isChecked():
+            print("[INFO] {} found on {}".format(sensor, port))
+
+    # **************************************************************************************************************** #
+    def detection_finished(self, found):
+        """
+        Fill the dialog with the sensors found: the first one is selected, several ones make a session
+        """
+        self.detect_button.setEnabled(True)
+        self.detect_label.setText("{} sensor(s) found".format(found) if found else "No sensor found")
+        # entries of the previous detection are replaced, the ones added by the user are kept
+        for item in self.detected_items:
+            row = self.session_list.row(item)
+            if row >= 0:
+                self.session_list.takeItem(row)
+        self.detected_items = []
+        if not self.detected:
+            return
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        if len(self.detected) > 1:
+            ports = [self.session_list.item(i).data(Qt.ItemDataRole.UserRole)['com_port']
+                     for i in range(self.session_list.count())]
+            for port, sensor, scales in self.detected:
+                if port not in ports:
+                    index = SETUP_SENSORS.index(sensor)
+                    item = self.session_item(self.setup_comboBox.itemText(index),
+                                             {'setup': SETUPS[index], 'com_port': port, 'scales': scales})
+                    self.detected_items.append(item)
+        # sensor and port chosen by the user are not overwritten
+        if not self.selection_edited:
+            self.select_sensor(*self.detected[0])
+
+    # **************************************************************************************************************** #
+    def edit_selection(self):
+        """
+        Sensor or port chosen by the user
+        """
+        self.selection_edited = True
+
+    # **************************************************************************************************************** #
+    def select_sensor(self, port, sensor, scales):
+        """
+        Show a sensor in the setup, units and board comboboxes
+        """
+        self.setup_comboBox.setCurrentIndex(SETUP_SENSORS.index(sensor))
+        self.scales_comboBox.setCurrentText(scales)
+        for i in range(self.com_port_comboBox.count()):
+            if self.com_port_comboBox.itemText(i).split(" ")[0] == port:
+                self.com_port_comboBox.setCurrentIndex(i)
+                break
+        else:
+            self.com_port_comboBox.setEditText(port)
+
+    # **************************************************************************************************************** #
+    def done(self, result):
+        """
+        Fields are checked before the dialog is accepted, it stays open on a typing error. Ports still probed are
+        released before the acquisition opens them
+        """
+        if result == QDialog.DialogCode.Accepted:
+            error = self.check_fields()
+            if error is not None:
+                QMessageBox.warning(self, "Invalid setting", error)
+                return
+
+        self.probe.stop()
+        QDialog.done(self, result)
+
+    # **************************************************************************************************************** #
+    def check_fields(self):
+        """
+        Check the numbers typed by the user, get_settings converts them without checking
+        :return: error message about the first invalid field, None if all are valid
+        """
+        # (name, field, conversion, empty allowed, must be positive)
+        fields = (
+            ("T. Min", self.t_min_edit, int, False, False),
+            ("T. Max", self.t_max_edit, int, False, False),
+            ("Display size", self.display_size_edit, int, False, True),
+            ("Window", self.window_edit, float, False, True),
+            ("Refresh", self.render_rate_edit, float, False, True),
+            ("Split every", self.rotate_every_edit, parse_duration, True, True),
+            ("Split size", self.rotate_size_edit, parse_size, True, True),
+        )
+        for name, edit, convert, optional, positive in fields:
+            text = edit.text().strip()
+            if not text and optional:
+                continue
+            try:
+                value = convert(text)
+            except ValueError:
+                return "{}: '{}' is not a valid value".format(name, text)
+            if positive and not value > 0:
+                return "{}: must be greater than 0".format(name)
+        return None
+
+    # **************************************************************************************************************** #
+    def browse_replay(self):
+        """
+        Choose a recording to replay: CSV log, or header.json of a thermal recording
+        """
+        filename, _ = QFileDialog.getOpenFileName(self, "Replay recording", "logs",
+                                                  "Recordings (*.csv *.csv.gz *.csv.zst header.json)")
+        if filename:
+            self.replay_edit.setText(filename)
+
+    # **************************************************************************************************************** #
+    def current_sensor(self):
         """
-        match self.setup_comboBox.currentIndex():
-            case 0:
-                self.settings['setup'] = "devices"
-            case 1:
-                self.settings['setup'] = "MLX90614"
-            case 2:
-                self.settings['setup'] = "VL53L4CD"
-            case 3:
-                self.settings['setup'] = "HC-SR04"
+        Sensor currently selected
+        :return: dict with setup, com port and scales
+        """
+        sensor = {'setup': SETUPS[self.setup_comboBox.currentIndex()]}
 
         # get com port chosen by user
-        self.settings['com_port'] = self.com_port_comboBox.currentText().split(" ")[0]
+        sensor['com_port'] = self.com_port_comboBox.currentText().split(" ")[0]
 
         # get scales chosen by user
-        self.settings['scales'] = self.scales_comboBox.currentText()
+        sensor['scales'] = self.scales_comboBox.currentText()
+
+        return sensor
+
+    # **************************************************************************************************************** #
+    def add_sensor(self):
+        """
+        Add the sensor currently selected to the session, one sensor per port
+        """
+        sensor = self.current_sensor()
+        if not sensor['com_port']:
+            return
+
+        for i in range(self.session_list.count()):
+            if self.session_list.item(i).data(Qt.ItemDataRole.UserRole)['com_port'] == sensor['com_port']:
+                print("[ERR] Port {} already in session".format(sensor['com_port']))
+                return
+
+        self.session_item(self.setup_comboBox.currentText(), sensor)
+
+    # **************************************************************************************************************** #
+    def session_item(self, text, sensor):
+        """
+        Append a sensor to the session list
+        :param text: name of the sensor in the setup combobox
+        :param sensor: dict with setup, com port and scales
+        :return: item of the list
+        """
+        item = QListWidgetItem("{} on {}".format(text, sensor['com_port']))
+        item.setData(Qt.ItemDataRole.UserRole, sensor)
+        self.session_list.addItem(item)
+        return item
+
+    # **************************************************************************************************************** #
+    def remove_sensor(self):
+        """
+        Remove selected sensor from the session
+        """
+        row = self.session_list.currentRow()
+        if row >= 0:
+            self.session_list.takeItem(row)
+
+    # **************************************************************************************************************** #
+    def get_settings(self):
+        """
+        Get settings chosen by user
+        """
+        # ports still probed are released before the acquisition opens them
+        self.probe.stop()
+
+        # get sensors of the session, or only the selected one. A recording is always replayed alone
+        sensor = self.current_sensor()
+        sensors = [self.session_list.item(i).data(Qt.ItemDataRole.UserRole) for i in range(self.session_list.count())]
+        if not sensors or self.replay_edit.text().strip():
+            sensors = [sensor]
+        self.settings['sensors'] = sensors
+        # first sensor of the session is also the main setup
+        self.settings.update(sensors[0])
 
         # get range chosen by user
         self.settings['t_min'] = int(self.t_min_edit.text())
         self.settings['t_max'] = int(self.t_max_edit.text())
 
+        # get thermal image display chosen by user
+        self.settings['display'] = ('raw', 'bilinear', 'bicubic')[self.display_comboBox.currentIndex()]
+        self.settings['display_size'] = int(self.display_size_edit.text())
+
+        # get plot window chosen by user
+        self.settings['window'] = float(self.window_edit.text())
+
+        # get display refresh rate chosen by user
+        render_rate = float(self.render_rate_edit.text())
+        self.settings['render_rate'] = clamp_rate(render_rate)
+        if self.settings['render_rate'] != render_rate:
+            print("[ERR] Refresh rate must be between {:g} and {:g} Hz, {:g} Hz used".format(
+                MIN_RATE, MAX_RATE, self.settings['render_rate']))
+
         # get debug status chosen by user
         self.settings['debug'] = self.debug_checkBox.isChecked()
 
         # get record status chosen by user
         self.settings['record'] = self.record_checkBox.isChecked()
 
+        # get log rotation and compression chosen by user (CSV logs, thermal recordings are not split)
+        rotate_every = self.rotate_every_edit.text().strip()
+        rotate_size = self.rotate_size_edit.text().strip()
+        self.settings['record_options'] = {
+            'rotate_interval': parse_duration(rotate_every) if rotate_every else None,
+            'rotate_size': parse_size(rotate_size) if rotate_size else None,
+            'compression': (None, 'gzip', 'zstd')[self.compression_comboBox.currentIndex()],
+        }
+
+        # get serial transport chosen by user
+        self.settings['transport'] = 'event' if self.event_checkBox.isChecked() else 'thread'
+        if self.process_checkBox.isChecked():
+            self.settings['transport'] = 'process'
+
+        # get instrumentation status chosen by user
+        self.settings['metrics'] = self.metrics_checkBox.isChecked()
+
+        # get plotting mode chosen by user
+        self.settings['high_rate'] = self.high_rate_checkBox.isChecked()
+
+        # get recording to replay chosen by user, nothing is recorded while replaying
+        self.settings['replay'] = self.replay_edit.text().strip()
+        self.settings['replay_speed'] = (1.0, 10.0, 100.0, 0.0)[self.replay_speed_comboBox.currentIndex()]
+        if self.settings['replay']:
+            self.settings['record'] = False
+
         if self.settings['debug']:
-            print("[INFO] Setup: {}".format(self.settings['setup']))
-            print("[INFO] Units: {}".format(self.settings['scales']))
-            print("[INFO] Com port {}".format(self.settings['com_port']))
+            for sensor in self.settings['sensors']:
+                print("[INFO] Setup: {}".format(sensor['setup']))
+                print("[INFO] Units: {}".format(sensor['scales']))
+                print("[INFO] Com port {}".format(sensor['com_port']))
+            print("[INFO] Window: {} s".format(self.settings['window']))
+            print("[INFO] Refresh: {} Hz".format(self.settings['render_rate']))
             print("[INFO] Debug: {}".format(self.settings['debug']))
             print("[INFO] Record: {}".format(self.settings['record']))
+            if self.settings['record']:
+                print("[INFO] Log files: {}".format(self.settings['record_options']))
+            print("[INFO] Transport: {}".format(self.settings['transport']))
+            print("[INFO] Metrics: {}".format(self.settings['metrics']))
+            print("[INFO] High-rate plots: {}".format(self.settings['high_rate']))
+            if self.settings['replay']:
+                speed = "{:g}x".format(self.settings['replay_speed']) if self.settings['replay_speed'] else "max"
+                print("[INFO] Replay: {} ({})".format(self.settings['replay'], speed))
 
         return self.settings
@@ -0,0 +1,119 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       src\acquire.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+#
+# Headless acquisition and recording, never imports Qt:
+#   python -m src.acquire --sensor MLX90614 --port /dev/ttyACM0 --record out.csv --duration 8h
+########################################################################################################################
+
+# python packages
+import argparse
+import threading
+import time
+# custom packages
+from src.acquisition.AMG8833 import AMG8833Acquisition
+from src.acquisition.HC_SR04 import HCSR04Acquisition
+from src.acquisition.MLX90614 import MLX90614Acquisition
+from src.acquisition.VL53L4CD import VL53L4CDAcquisition
+from src.comm.SerialReader import SerialReader
+from src.core.Metrics import Metrics
+from src.core.Units import parse_duration, parse_size
+
+SENSORS = {
+    'AMG8833': AMG8833Acquisition,
+    'MLX90614': MLX90614Acquisition,
+    'VL53L4CD': VL53L4CDAcquisition,
+    'HC-SR04': HCSR04Acquisition,
+}
+
+
+# ******************************************************************************************************************** #
+class SampleCounter:
+    """
+    Sink of the acquisition thread when no GUI is attached: only counts samples
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = 0
+
+    def push(self, samples):
+        with self.lock:
+            self.samples += len(samples)
+
+
+# ******************************************************************************************************************** #
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless acquisition of one sensor")
+    parser.add_argument('--sensor', required=True, choices=sorted(SENSORS))
+    parser.add_argument('--port', required=True, help="serial port, e.g. COM3 or /dev/ttyACM0")
+    parser.add_argument('--record', default=None, metavar='FILE',
+                        help="record samples to FILE, a folder for AMG8833 (default: no recording)")
+    parser.add_argument('--rotate-size', default=None, type=parse_size,
+                        help="start a new record file every SIZE bytes on disk, e.g. 100M")
+    parser.add_argument('--rotate-every', default=None, type=parse_duration,
+                        help="start a new record file every DURATION, e.g. 1h")
+    parser.add_argument('--compress', default=None, choices=('gzip', 'zstd', 'auto'),
+                        help="compress record files, auto uses zstd when installed")
+    parser.add_argument('--duration', default=None, type=parse_duration,
+                        help="stop after this duration, e.g. 30m, 8h (default: until Ctrl+C)")
+    parser.add_argument('--scales', default='Celsius', choices=('Celsius', 'Fahrenheit'),
+                        help="MLX90614 unit")
+    parser.add_argument('--metrics', default=None, metavar='FILE',
+                        help="measure timings and rates of every stage, saved to FILE (JSON) at the end")
+    parser.add_argument('--debug', action='store_true', help="print every line received")
+    args = parser.parse_args(argv)
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+    # same settings as the ones returned by ComSelect
+    settings = {
+        'setup': args.sensor,
+        'com_port': args.port,
+        'scales': args.scales,
+        'debug': args.debug,
+        'record': args.record is not None,
+        'record_file': args.record,
+        'record_options': {
+            'rotate_size': args.rotate_size,
+            'rotate_interval': args.rotate_every,
+            'compression': args.compress,
+        },
+    }
+
+    metrics = Metrics() if args.metrics else None
+    acquisition = SENSORS[args.sensor](settings=settings, metrics=metrics)
+    counter = SampleCounter()
+    reader = SerialReader(port=args.port, baudrate=acquisition.baudrate, parser=acquisition.handle_chunk,
+                          sink=counter.push, debug=args.debug, metrics=metrics)
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+    print("[INFO] Acquisition of {} on {} started".format(args.sensor, args.port))
+    start = time.monotonic()
+    deadline = None if args.duration is None else start + args.duration
+    reader.start()
+    try:
+        while deadline is None or time.monotonic() < deadline:
+            time.sleep(1.0 if deadline is None else max(0.0, min(1.0, deadline - time.monotonic())))
+    except KeyboardInterrupt:
+        print("[INFO] Interrupted")
+
+    reader.stop()
+    acquisition.stop()
+    print("[INFO] {} samples in {:.1f} s".format(counter.samples, time.monotonic() - start))
+    if metrics is not None:
+        print(metrics.report())
+        metrics.dump(args.metrics)
+
+
+if __name__ == '__main__':
+    main()
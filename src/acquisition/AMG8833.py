@@ -0,0 +1,114 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       src\acquisition\AMG8833.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+########################################################################################################################
+
+# python packages
+import numpy as np
+# custom packages
+from src.core.Clock import now, to_wall
+from src.core.FrameAssembler import FrameAssembler
+from src.core.Parsers import spread
+from src.options.ThermalRecord import ThermalRecord
+
+
+########################################################################################################################
+class AMG8833Acquisition:
+    """
+    GUI-free acquisition of the AMG8833 thermal camera: assemble 8x8 frames and record them
+    """
+    baudrate = 9600
+    # values of a frame after its time, as stored in shared memory by the 'process' transport
+    sample_shape = (8, 8)
+
+    def __init__(self, settings=None, metrics=None):
+        # ------------------------------------------------------------------------------------------------------------ #
+        self.settings = settings
+        self.metrics = metrics
+        # 8x8 frames are assembled in the acquisition thread, synchronised on '[' / ']'
+        self.assembler = FrameAssembler()
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # init file to record data
+        self.RecordData = None
+        if self.settings['record']:
+            self.RecordData = ThermalRecord(parameters=self.settings, filename=self.settings.get('record_file'))
+
+        if self.metrics is not None:
+            self.metrics.watch('frames_torn', lambda: self.assembler.torn_frames)
+            if self.RecordData is not None:
+                self.metrics.watch('frames_recorded', lambda: self.RecordData.count)
+
+    # **************************************************************************************************************** #
+    # CALLBACK (acquisition thread)
+    def handle_chunk(self, block, timestamp=None, previous=None):
+        """
+        Accumulate the lines of thermal frames received in one chunk
+        :param block: raw lines read from serial port, separated by b"\n"
+        :param timestamp: arrival time of the chunk (monotonic, ns), now if None
+        :param previous: arrival time of the previous chunk (monotonic, ns), the samples are spread in between
+        :return: array with one row (time [s], then the flattened 8x8 frame) per frame completed
+        """
+        frames = []
+        for line in block.split(b"\n"):
+            torn_frames = self.assembler.torn_frames
+            frame = self.assembler.feed(line)
+
+            if self.settings['debug']:
+                if self.assembler.torn_frames != torn_frames:
+                    print("[ERR] torn frame dropped ({} so far)".format(self.assembler.torn_frames))
+                if frame is not None:
+                    print("[TAB] {}".format(frame.tolist()))
+
+            if frame is not None:
+                frames.append(frame)
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # last frame time is the arrival of the chunk completing it, the others were completed since the previous one
+        if timestamp is None:
+            timestamp = now()
+        since = None if previous is None else previous / 1e9
+        samples = np.empty((len(frames), 1 + int(np.prod(self.sample_shape))))
+        samples[:, 0] = spread(len(frames), timestamp / 1e9, since)
+        for row, frame in zip(samples, frames):
+            row[1:] = frame.ravel()
+
+        # save data to file
+        if len(samples):
+            self.save_block(samples)
+
+        return samples
+
+    # **************************************************************************************************************** #
+    def save_block(self, rows):
+        """
+        Record several frames with one call, if recording
+        :param rows: array of shape (n, 65): time [s], then the flattened 8x8 frame, as returned by handle_chunk
+        """
+        if self.RecordData is None:
+            return
+
+        if self.metrics is not None:
+            start = self.metrics.clock()
+        self.RecordData.save_block(frames=rows[:, 1:].reshape(-1, *self.sample_shape),
+                                   timestamps=to_wall(np.round(rows[:, 0] * 1e9).astype(np.int64)))
+        if self.metrics is not None:
+            self.metrics.record('record', start)
+
+    # **************************************************************************************************************** #
+    def stop(self):
+        """
+        Stop recording
+        """
+        if self.RecordData is not None:
+            self.RecordData.close_record()
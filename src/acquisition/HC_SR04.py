@@ -0,0 +1,97 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       src\acquisition\HC_SR04.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+########################################################################################################################
+
+# python packages
+import numpy as np
+# custom packages
+from src.core.Clock import now, to_wall
+from src.core.Parsers import HC_SR04
+from src.options.Dx2Record import Dx2Record
+
+
+########################################################################################################################
+class HCSR04Acquisition:
+    """
+    GUI-free acquisition of the HC-SR04 distance sensor: parse lines and record samples
+    """
+    baudrate = 9600
+    # values of a sample after its time, as stored in shared memory by the 'process' transport
+    sample_shape = (1,)
+
+    def __init__(self, settings=None, metrics=None):
+        # ------------------------------------------------------------------------------------------------------------ #
+        self.settings = settings
+        self.metrics = metrics
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # init file to record data
+        self.RecordData = None
+        if self.settings['record']:
+            self.RecordData = Dx2Record(port_name=self.settings['com_port'], filename=self.settings.get('record_file'),
+                                        **self.settings.get('record_options', {}))
+            if self.metrics is not None:
+                self.metrics.watch('bytes_flushed', self.RecordData.engine.bytes_written)
+
+    # **************************************************************************************************************** #
+    # CALLBACK (acquisition thread)
+    def handle_chunk(self, block, timestamp=None, previous=None):
+        """
+        Parse the complete lines received in one chunk and record them
+        :param block: raw lines read from serial port, separated by b"\n"
+        :param timestamp: arrival time of the chunk (monotonic, ns), now if None
+        :param previous: arrival time of the previous chunk (monotonic, ns), the samples are spread in between
+        :return: array with one row (time [s], distance) per measure found
+        """
+        # ------------------------------------------------------------------------------------------------------------ #
+        # handle data, only sensor 1 is displayed
+        if timestamp is None:
+            timestamp = now()
+        since = None if previous is None else previous / 1e9
+        samples = HC_SR04.parse_samples(block, timestamp / 1e9, since)
+
+        if self.settings['debug']:
+            for line in block.split(b"\n"):
+                if HC_SR04.parse(line) is not None:
+                    print("[DBG] {}".format(line.decode("utf-8", errors="replace").rstrip()))
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # save data to file
+        if len(samples):
+            self.save_block(samples)
+
+        return samples
+
+    # **************************************************************************************************************** #
+    def save_block(self, rows):
+        """
+        Record several samples with one call, if recording
+        :param rows: array of shape (n, 2): time [s], distance, as returned by handle_chunk
+        """
+        if self.RecordData is None:
+            return
+
+        if self.metrics is not None:
+            start = self.metrics.clock()
+        self.RecordData.save_block(timestamps=to_wall(np.round(rows[:, 0] * 1e9).astype(np.int64)), rows=rows[:, 1:])
+        if self.metrics is not None:
+            self.metrics.record('record', start)
+
+    # **************************************************************************************************************** #
+    def stop(self):
+        """
+        Stop recording
+        """
+        if self.RecordData is not None:
+            self.RecordData.close_record()
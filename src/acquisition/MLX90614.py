@@ -0,0 +1,99 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       src\acquisition\MLX90614.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+########################################################################################################################
+
+# python packages
+import numpy as np
+# custom packages
+from src.core.Clock import now, to_wall
+from src.core.Parsers import MLX90614_CELSIUS, MLX90614_FAHRENHEIT
+from src.options.Temp2Record import Temp2Record
+
+
+########################################################################################################################
+class MLX90614Acquisition:
+    """
+    GUI-free acquisition of the MLX90614 thermal sensor: parse lines and record samples
+    """
+    baudrate = 9600
+    # values of a sample after its time, as stored in shared memory by the 'process' transport
+    sample_shape = (2,)
+
+    def __init__(self, settings=None, metrics=None):
+        # ------------------------------------------------------------------------------------------------------------ #
+        self.settings = settings
+        self.metrics = metrics
+        self.parser = MLX90614_FAHRENHEIT if self.settings['scales'] == 'Fahrenheit' else MLX90614_CELSIUS
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # init file to record data
+        self.RecordData = None
+        if self.settings['record']:
+            self.RecordData = Temp2Record(parameters=self.settings, filename=self.settings.get('record_file'),
+                                          **self.settings.get('record_options', {}))
+            if self.metrics is not None:
+                self.metrics.watch('bytes_flushed', self.RecordData.engine.bytes_written)
+
+    # **************************************************************************************************************** #
+    # CALLBACK (acquisition thread)
+    def handle_chunk(self, block, timestamp=None, previous=None):
+        """
+        Parse the complete lines received in one chunk and record them
+        :param block: raw lines read from serial port, separated by b"\n"
+        :param timestamp: arrival time of the chunk (monotonic, ns), now if None
+        :param previous: arrival time of the previous chunk (monotonic, ns), the samples are spread in between
+        :return: array with one row (time [s], ambient, object) per measure found
+        """
+        if self.settings['debug']:
+            for line in block.split(b"\n"):
+                if line.strip():
+                    print("[DBG] {}".format(line.decode("utf-8", errors="replace").rstrip()))
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # handle data
+        if timestamp is None:
+            timestamp = now()
+        since = None if previous is None else previous / 1e9
+        samples = self.parser.parse_samples(block, timestamp / 1e9, since)
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # save data to file
+        if len(samples):
+            self.save_block(samples)
+
+        return samples
+
+    # **************************************************************************************************************** #
+    def save_block(self, rows):
+        """
+        Record several samples with one call, if recording
+        :param rows: array of shape (n, 3): time [s], ambient, object, as returned by handle_chunk
+        """
+        if self.RecordData is None:
+            return
+
+        if self.metrics is not None:
+            start = self.metrics.clock()
+        self.RecordData.save_block(timestamps=to_wall(np.round(rows[:, 0] * 1e9).astype(np.int64)),
+                                   rows=np.column_stack((rows[:, 1:], rows[:, 2] - rows[:, 1])))
+        if self.metrics is not None:
+            self.metrics.record('record', start)
+
+    # **************************************************************************************************************** #
+    def stop(self):
+        """
+        Stop recording
+        """
+        if self.RecordData is not None:
+            self.RecordData.close_record()
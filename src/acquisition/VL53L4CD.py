@@ -0,0 +1,101 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       src\acquisition\VL53L4CD.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+########################################################################################################################
+
+# python packages
+import numpy as np
+# custom packages
+from src.core.Clock import now, to_wall
+from src.core.Parsers import VL53L4CD
+from src.options.DxRecord import DxRecord
+
+
+########################################################################################################################
+class VL53L4CDAcquisition:
+    """
+    GUI-free acquisition of the VL53L4CD distance sensor: parse lines and record samples
+    """
+    baudrate = 115200
+    # values of a sample after its time, as stored in shared memory by the 'process' transport
+    sample_shape = (3,)
+
+    def __init__(self, settings=None, metrics=None):
+        # ------------------------------------------------------------------------------------------------------------ #
+        self.settings = settings
+        self.metrics = metrics
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # init file to record data
+        self.RecordData = None
+        if self.settings['record']:
+            self.RecordData = DxRecord(parameters=self.settings, filename=self.settings.get('record_file'),
+                                       **self.settings.get('record_options', {}))
+            if self.metrics is not None:
+                self.metrics.watch('bytes_flushed', self.RecordData.engine.bytes_written)
+
+    # **************************************************************************************************************** #
+    # CALLBACK (acquisition thread)
+    def handle_chunk(self, block, timestamp=None, previous=None):
+        """
+        Parse the complete lines received in one chunk and record them
+        :param block: raw lines read from serial port, separated by b"\n"
+        :param timestamp: arrival time of the chunk (monotonic, ns), now if None
+        :param previous: arrival time of the previous chunk (monotonic, ns), the samples are spread in between
+        :return: array with one row (time [s], status, distance, signal) per measure found
+        """
+        if self.settings['debug']:
+            for line in block.split(b"\n"):
+                if line.strip():
+                    print("[DBG] {}".format(line.decode("utf-8", errors="replace").rstrip()))
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # handle data
+        if timestamp is None:
+            timestamp = now()
+        since = None if previous is None else previous / 1e9
+        samples = VL53L4CD.parse_samples(block, timestamp / 1e9, since)
+        # distance is not valid if status is not 0
+        samples[samples[:, 1] != 0, 2] = 0
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # save data to file
+        if len(samples):
+            self.save_block(samples)
+
+        return samples
+
+    # **************************************************************************************************************** #
+    def save_block(self, rows):
+        """
+        Record several samples with one call, if recording
+        :param rows: array of shape (n, 4): time [s], status, distance, signal, as returned by handle_chunk
+        """
+        if self.RecordData is None:
+            return
+
+        if self.metrics is not None:
+            start = self.metrics.clock()
+        # the log keeps integers
+        self.RecordData.save_block(timestamps=to_wall(np.round(rows[:, 0] * 1e9).astype(np.int64)),
+                                   rows=rows[:, 1:].astype(np.int64))
+        if self.metrics is not None:
+            self.metrics.record('record', start)
+
+    # **************************************************************************************************************** #
+    def stop(self):
+        """
+        Stop recording
+        """
+        if self.RecordData is not None:
+            self.RecordData.close_record()
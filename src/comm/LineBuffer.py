@@ -0,0 +1,81 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       src\comm\LineBuffer.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+########################################################################################################################
+
+
+########################################################################################################################
+class LineBuffer:
+    """
+    Split a stream of bytes into complete lines. An incomplete line at the end of a chunk is kept until the rest of
+    it is received.
+    """
+
+    def __init__(self, skip_first=True):
+        # ------------------------------------------------------------------------------------------------------------ #
+        # first line received after opening the port is most likely incomplete
+        self.skip_first = skip_first
+        self.partial = b""
+        # bytes of incomplete lines thrown away
+        self.dropped = 0
+
+    # **************************************************************************************************************** #
+    def feed(self, chunk):
+        """
+        Add received bytes and return the complete lines
+        :param chunk: bytes received from serial port
+        :return: list of lines, as returned by Serial.readline() but without the trailing b"\\n"
+        """
+        data = self.partial + chunk
+        end = data.rfind(b"\n")
+        if end < 0:
+            self.partial = data
+            return []
+
+        self.partial = data[end + 1:]
+        lines = data[:end].split(b"\n")
+        if self.skip_first:
+            self.skip_first = False
+            self.dropped += len(lines[0]) + 1
+            lines = lines[1:]
+        return lines
+
+    # **************************************************************************************************************** #
+    def feed_block(self, chunk):
+        """
+        Add received bytes and return the complete lines as one block, without splitting them
+        :param chunk: bytes received from serial port
+        :return: complete lines separated by b"\n" (no trailing one), b"" if there is none
+        """
+        data = self.partial + chunk
+        end = data.rfind(b"\n")
+        if end < 0:
+            self.partial = data
+            return b""
+
+        self.partial = data[end + 1:]
+        start = 0
+        if self.skip_first:
+            self.skip_first = False
+            start = data.find(b"\n") + 1
+            self.dropped += start
+        return data[start:end] if start <= end else b""
+
+    # **************************************************************************************************************** #
+    def clear(self):
+        """
+        Forget incomplete line, e.g. after a reconnection
+        """
+        self.dropped += len(self.partial)
+        self.partial = b""
+        self.skip_first = True
@@ -0,0 +1,181 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       src\comm\PortProbe.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+########################################################################################################################
+
+# python packages
+from PyQt6.QtCore import *
+from serial import *
+import threading
+import time
+
+# seconds spent listening to a port, shared by its baud rates, slowest firmwares send a line every second
+PROBE_TIMEOUT = 2.0
+# complete lines of an unknown output after which a baud rate is given up before the timeout
+PROBE_LINES = 2
+# bytes which are not text after which a baud rate is given up: the board sends at another one
+PROBE_GARBLED = 8
+# bytes of the firmware outputs, anything else is read at the wrong baud rate
+TEXT = bytes(range(0x20, 0x7f)) + b"\t\r\n"
+
+# output signature of every firmware: (sensor, scales, baud rate, parser of one line in src.core.Parsers)
+SIGNATURES = [
+    ('MLX90614', 'Celsius', 9600, 'MLX90614_CELSIUS'),
+    ('MLX90614', 'Fahrenheit', 9600, 'MLX90614_FAHRENHEIT'),
+    ('HC-SR04', 'Centimeters', 9600, 'HC_SR04'),
+    ('AMG8833', 'Celsius', 9600, 'AMG8833_ROW'),
+    ('VL53L4CD', 'Millimeters', 115200, 'VL53L4CD'),
+]
+BAUDRATES = sorted({signature[2] for signature in SIGNATURES})
+
+
+########################################################################################################################
+def identify(lines, baudrate):
+    """
+    Sensor sending these lines
+    :param lines: complete lines read from a port
+    :param baudrate: baud rate of the port, only the firmwares using it are tried
+    :return: (sensor, scales) or None
+    """
+    # parsers (and numpy) are imported by the first probe, not with the dialog
+    from src.core import Parsers
+
+    for sensor, scales, signature_baudrate, name in SIGNATURES:
+        parser = getattr(Parsers, name)
+        if signature_baudrate == baudrate and any(parser.parse(line) is not None for line in lines):
+            return sensor, scales
+    return None
+
+
+# ******************************************************************************************************************** #
+def probe_port(port, timeout=PROBE_TIMEOUT, stopping=None):
+    """
+    Listen to a port at each baud rate of the sensors and classify what it sends. Nothing is written to the port.
+    The port is opened exclusively, a port already used (acquisition, other program) is skipped. The timeout is
+    shared by the baud rates: one is left as soon as a sensor is identified, PROBE_LINES complete lines of something
+    else are read or PROBE_GARBLED bytes show that the board sends at another baud rate. A silent port is given up
+    after the timeout, it would be silent at any baud rate.
+    :param port: system location of the port, e.g. COM3 or /dev/ttyACM0
+    :param timeout: seconds spent on the port, all baud rates together
+    :param stopping: optional threading.Event to give up early
+    :return: (sensor, scales) or None if nothing known was read
+    """
+    end = time.perf_counter() + timeout
+    for baudrate in BAUDRATES:
+        try:
+            ser = Serial(port, baudrate, timeout=0.05, exclusive=True)
+        except (SerialException, OSError, ValueError) as err_com_port:
+            print("[INFO] Port {} skipped: {}".format(port, err_com_port))
+            return None
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # first line is usually cut, only complete lines are classified
+        data = b""
+        with ser:
+            ser.reset_input_buffer()
+            while time.perf_counter() < end:
+                if stopping is not None and stopping.is_set():
+                    return None
+                try:
+                    data += ser.read(max(ser.in_waiting, 1))
+                except (SerialException, OSError):
+                    return None
+                lines = data.split(b"\n")[1:-1]
+                result = identify(lines, baudrate)
+                if result is not None:
+                    return result
+                if len(lines) >= PROBE_LINES or len(data.translate(None, TEXT)) >= PROBE_GARBLED:
+                    break
+
+    return None
+
+
+########################################################################################################################
+class PortProbe(QObject):
+    """
+    Sensor discovery: every port is probed in its own thread, all at the same time, so that discovery takes at most
+    one probe timeout whatever the number of ports and baud rates. Results are signalled to the GUI thread, the
+    dialog stays responsive.
+    Every start() is a new generation with its own stopping event: threads of a stopped generation which are still
+    reading a port when stop() returns never signal nor count anymore.
+    """
+    identified = pyqtSignal(str, str, str)
+    finished = pyqtSignal(int)
+
+    def __init__(self, timeout=PROBE_TIMEOUT, parent=None):
+        """
+        :param timeout: seconds spent on each port
+        """
+        QObject.__init__(self, parent)
+        self.timeout = timeout
+        self.stopping = threading.Event()
+        self.lock = threading.Lock()
+        self.generation = 0
+        self.threads = []
+        self.pending = 0
+        self.found = 0
+
+    # **************************************************************************************************************** #
+    @property
+    def running(self):
+        return self.pending > 0
+
+    # **************************************************************************************************************** #
+    def start(self, ports):
+        """
+        Probe ports, identified(port, sensor, scales) is emitted for every sensor found, then finished(sensors found)
+        :param ports: system locations of the ports
+        """
+        self.stop()
+        with self.lock:
+            self.stopping = threading.Event()
+            self.pending = len(ports)
+            self.found = 0
+        if not ports:
+            self.finished.emit(0)
+            return
+
+        self.threads = [threading.Thread(target=self.probe, args=(port, self.generation, self.stopping), daemon=True)
+                        for port in ports]
+        for thread in self.threads:
+            thread.start()
+
+    # **************************************************************************************************************** #
+    def probe(self, port, generation, stopping):
+        result = probe_port(port, timeout=self.timeout, stopping=stopping)
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # signals are emitted holding the lock, stop() cannot complete in between
+        with self.lock:
+            if generation != self.generation:
+                return
+            if result is not None:
+                self.found += 1
+                self.identified.emit(port, *result)
+            # last port done
+            self.pending -= 1
+            if self.pending == 0:
+                self.finished.emit(self.found)
+
+    # **************************************************************************************************************** #
+    def stop(self):
+        """
+        Give up probing and release the ports, before they are opened by the acquisition
+        """
+        with self.lock:
+            self.stopping.set()
+            self.generation += 1
+            self.pending = 0
+        for thread in self.threads:
+            thread.join(timeout=1.0)
+        self.threads = []
@@ -0,0 +1,160 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       src\comm\ProcessReader.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+########################################################################################################################
+
+# python packages
+import multiprocessing
+import numpy as np
+import threading
+# custom packages
+from src.comm.SerialReader import SerialReader
+from src.core.SharedRing import SharedRing
+
+
+########################################################################################################################
+def acquire_port(acquisition_class, settings, ring_name, capacity, ready, stopped):
+    """
+    Reading process of one port: SerialReader and the parser of the device acquisition, samples are written to the
+    shared ring. Nothing is recorded here, the GUI process records what it reads from the ring.
+    :param acquisition_class: acquisition class of the device
+    :param settings: settings of the sensor
+    :param ring_name: name of the SharedRing created by the GUI process
+    :param capacity: samples kept by the ring
+    :param ready: multiprocessing Event set once the port is open
+    :param stopped: multiprocessing Event set by the GUI process to stop reading
+    """
+    acquisition = acquisition_class(settings=dict(settings, record=False))
+    shape = acquisition_class.sample_shape
+    ring = SharedRing(capacity=capacity, channels=1 + int(np.prod(shape)), name=ring_name)
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+    # one row per sample: time, then the values (frames are flattened by the acquisition)
+    reader = SerialReader(port=settings['com_port'], baudrate=acquisition.baudrate, parser=acquisition.handle_chunk,
+                          sink=ring.extend, debug=settings['debug'])
+    reader.start()
+    ready.set()
+    try:
+        stopped.wait()
+    except KeyboardInterrupt:
+        pass
+
+    reader.stop()
+    ring.close()
+
+
+########################################################################################################################
+class ProcessReader(threading.Thread):
+    """
+    Port read and parsed in its own process, so that heavy parsing (AMG8833 frames) of several ports does not compete
+    for the GIL of the GUI process. The reading process writes the samples to a SharedRing, this thread copies
+    the new rows out of the ring every tick (one copy, safe against the writer, see SharedRing.read), records them
+    with the acquisition of the GUI process and hands the same block to the sink: an array with one row per sample,
+    time then the values (frames are flattened).
+    """
+
+    def __init__(self, acquisition=None, settings=None, sink=None, capacity=4096, tick=0.02, debug=False,
+                 metrics=None):
+        threading.Thread.__init__(self, daemon=True)
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        self.acquisition = acquisition
+        self.port = settings['com_port']
+        self.sink = sink
+        self.tick = tick
+        self.debug = debug
+        self.metrics = metrics
+        self.stopping = threading.Event()
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # shared ring created here, mapped by the reading process
+        self.shape = acquisition.sample_shape
+        self.ring = SharedRing(capacity=capacity, channels=1 + int(np.prod(self.shape)))
+        self.position = 0
+        self.samples_lost = 0
+        self.samples_total = 0
+
+        # spawn: same behaviour on Windows and Linux, the reading process does not inherit the Qt state
+        context = multiprocessing.get_context('spawn')
+        self.ready = context.Event()
+        self.stopped = context.Event()
+        self.process = context.Process(target=acquire_port, daemon=True,
+                                       args=(type(acquisition), settings, self.ring.name, capacity, self.ready,
+                                             self.stopped))
+
+        if self.metrics is not None:
+            self.metrics.watch('samples_lost', lambda: self.samples_lost)
+
+    # **************************************************************************************************************** #
+    def start(self):
+        """
+        Start the reading process, then the thread draining the ring. Does not wait for the port to be open (ready)
+        """
+        self.process.start()
+        threading.Thread.start(self)
+
+    # **************************************************************************************************************** #
+    def run(self):
+        while not self.stopping.wait(self.tick):
+            self.drain()
+            if not self.process.is_alive() and not self.stopped.is_set():
+                print("[ERR] Reading process of {} stopped (exit code {})".format(self.port, self.process.exitcode))
+                break
+
+    # **************************************************************************************************************** #
+    def drain(self):
+        """
+        Record and hand over the block of samples written to the ring since last tick
+        """
+        rows, self.position, lost = self.ring.read(self.position)
+        if lost:
+            self.samples_lost += lost
+            if self.debug:
+                print("[ERR] {} samples of {} overwritten before being read".format(lost, self.port))
+        if not len(rows):
+            return
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.event('chunk')
+            metrics.count('samples', len(rows))
+
+        # the block is recorded and handed to the views as it is, no work per sample in the GUI process
+        self.acquisition.save_block(rows)
+        self.samples_total += len(rows)
+
+        if metrics is not None:
+            start = metrics.clock()
+        self.sink(rows)
+        if metrics is not None:
+            metrics.record('sink', start)
+
+    # **************************************************************************************************************** #
+    def stop(self):
+        """
+        Stop the reading process, hand over its last samples and free the ring
+        """
+        self.stopped.set()
+        self.process.join(timeout=2.0)
+        if self.process.is_alive():
+            self.process.terminate()
+
+        self.stopping.set()
+        if self.is_alive():
+            self.join(timeout=1.0)
+        self.drain()
+        self.ring.close()
+
+        if self.samples_lost:
+            print("[ERR] {} samples of {} lost in shared memory".format(self.samples_lost, self.port))
@@ -0,0 +1,178 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       src\comm\QtSerialReader.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+########################################################################################################################
+
+# python packages
+from PyQt6.QtCore import *
+from PyQt6.QtSerialPort import *
+import sys
+# custom packages
+from src.core.Clock import now
+from src.comm.LineBuffer import LineBuffer
+
+
+########################################################################################################################
+class QtSerialReader(QObject):
+    """
+    Event-driven serial reader: bytes are parsed as soon as QSerialPort signals readyRead, nothing runs while the
+    board is silent. Same interface as SerialReader but lives in the GUI thread.
+    """
+
+    def __init__(self, port=None, baudrate=9600, parser=None, sink=None, debug=False, metrics=None):
+        QObject.__init__(self)
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        self.parser = parser
+        self.sink = sink
+        self.debug = debug
+        self.metrics = metrics
+        self.lines = LineBuffer()
+        self.running = False
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # throughput counters
+        self.lines_per_tick = 0
+        self.lines_total = 0
+        # arrival of the last chunk which completed lines, the lines of the next one were sent since then
+        self.last_block = now()
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # SERIAL COMMUNICATION
+        self.ser = QSerialPort(self)
+        self.ser.setPortName(port)
+        self.ser.setBaudRate(baudrate)
+        self.ser.errorOccurred.connect(self.handle_error)
+
+    # **************************************************************************************************************** #
+    def start(self):
+        """
+        Open the port and start processing readyRead events
+        """
+        if not self.ser.open(QIODeviceBase.OpenModeFlag.ReadOnly):
+            print("[ERR.] Please make sure than you use the right COM port: {}".format(self.ser.errorString()))
+            sys.exit(-1)
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # remove old data in input buffer
+        self.bytes_dropped = 0
+        self.reset_input()
+        self.lines.clear()
+        if self.metrics is not None:
+            self.metrics.watch('bytes_dropped', lambda: self.bytes_dropped + self.lines.dropped)
+        self.ser.readyRead.connect(self.handle_ready_read)
+        self.running = True
+
+    # **************************************************************************************************************** #
+    def reset_input(self):
+        """
+        Throw away bytes received before the port was (re)opened
+        """
+        self.bytes_dropped += self.ser.bytesAvailable()
+        self.ser.clear(QSerialPort.Direction.Input)
+        # the first lines read were sent since the port was emptied
+        self.last_block = now()
+
+    # **************************************************************************************************************** #
+    def handle_ready_read(self):
+        """
+        Parse every complete line received and hand samples over
+        """
+        metrics = self.metrics
+        if metrics is not None:
+            start = metrics.clock()
+
+        chunk = self.ser.readAll().data()
+        # lines of a chunk are spread between the previous chunk and this one by the parser
+        timestamp = now()
+
+        if metrics is not None:
+            metrics.record('read', start)
+            metrics.event('chunk')
+            metrics.count('bytes', len(chunk))
+            start = metrics.clock()
+
+        block = self.lines.feed_block(chunk)
+
+        if metrics is not None:
+            metrics.record('split', start)
+
+        if not block:
+            return
+
+        lines = block.count(b"\n") + 1
+        self.lines_per_tick = lines
+        self.lines_total += lines
+        if metrics is not None:
+            metrics.count('lines', lines)
+        if self.debug and lines > 1:
+            print("[DBG] {} lines drained".format(lines))
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # all the lines of the chunk are parsed at once, straight into an array of samples
+        previous, self.last_block = self.last_block, timestamp
+        if metrics is not None:
+            start = metrics.clock()
+        try:
+            samples = self.parser(block, timestamp, previous)
+        except Exception as e:
+            print("[ERR] Unable to handle lines: {} - {}".format(block, e))
+            return
+        if metrics is not None:
+            metrics.record('parse', start)
+
+        if len(samples):
+            if metrics is not None:
+                metrics.count('samples', len(samples))
+                start = metrics.clock()
+            self.sink(samples)
+            if metrics is not None:
+                metrics.record('sink', start)
+
+    # **************************************************************************************************************** #
+    def handle_error(self, error):
+        """
+        Reconnection with board when it disappears
+        """
+        if error == QSerialPort.SerialPortError.NoError:
+            return
+
+        print("[ERR] serial port error: {}".format(self.ser.errorString()))
+        if error == QSerialPort.SerialPortError.ResourceError:
+            self.try_reconnect()
+
+    # **************************************************************************************************************** #
+    def try_reconnect(self):
+        """
+        Reconnection with board
+        """
+        if not self.running:
+            return
+
+        self.ser.close()
+        if self.ser.open(QIODeviceBase.OpenModeFlag.ReadOnly):
+            self.reset_input()
+            self.lines.clear()
+            print("[INFO] reconnected to the board")
+        else:
+            print("[ERR] connection failed: {}".format(self.ser.errorString()))
+            # try again later, without blocking the GUI
+            QTimer.singleShot(500, self.try_reconnect)
+
+    # **************************************************************************************************************** #
+    def stop(self):
+        """
+        Stop reception and close the port
+        """
+        self.running = False
+        self.ser.close()
@@ -0,0 +1,129 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       src\comm\RenderLoop.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+########################################################################################################################
+
+# python packages
+from PyQt6.QtCore import *
+import math
+import time
+
+# refresh rates accepted by the loop (Hz)
+MIN_RATE = 1.0
+MAX_RATE = 240.0
+
+# share of a frame the GUI thread may spend rendering before the loop slows down
+FRAME_BUDGET = 0.5
+# slowest refresh rate of a loop which backed off (ms)
+MAX_INTERVAL = 1000
+# fast frames in a row before the loop speeds up again
+RECOVERY_FRAMES = 30
+
+
+########################################################################################################################
+def clamp_rate(rate):
+    """
+    :param rate: refresh rate asked for, in Hz
+    :return: rate limited to MIN_RATE..MAX_RATE, MIN_RATE if not a number
+    """
+    if math.isnan(rate):
+        return MIN_RATE
+    return min(max(rate, MIN_RATE), MAX_RATE)
+
+
+########################################################################################################################
+class RenderLoop(QObject):
+    """
+    One timer in the GUI thread refreshes all the views of a session. Every sensor keeps its own acquisition thread,
+    which only stores samples in its bridge; the loop hands the stored samples to the views, which only mark
+    themselves dirty, then repaints the dirty views once per frame. The GUI cost depends on the number of views and
+    on the refresh rate, not on the rate of the sensors.
+    When a frame takes more than half of its interval the refresh rate is halved, so that the GUI thread keeps time
+    for user inputs; it goes back up to the requested rate once frames are fast again.
+    """
+
+    def __init__(self, rate=30.0, debug=False, parent=None):
+        """
+        :param rate: refreshes per second, limited to MIN_RATE..MAX_RATE
+        :param debug: print refresh rate changes
+        """
+        QObject.__init__(self, parent)
+        self.interval = self.target = int(round(1000 / clamp_rate(rate)))
+        self.debug = debug
+        self.bridges = []
+        self.views = []
+        self.fast_frames = 0
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.render)
+
+    # **************************************************************************************************************** #
+    @property
+    def rate(self):
+        """
+        Current refresh rate in Hz, lower than the requested one after a back-off
+        """
+        return 1000 / self.interval
+
+    # **************************************************************************************************************** #
+    def add(self, view):
+        """
+        :param view: device view with a SampleBridge, its samples are now emitted and drawn by the loop
+        """
+        view.bridge.buffered = True
+        self.bridges.append(view.bridge)
+        self.views.append(view)
+        # render events of the view come at the pace of the loop
+        if view.metrics is not None:
+            view.metrics.expect('render', self.interval / 1000)
+
+    # **************************************************************************************************************** #
+    def start(self):
+        self.timer.start(self.interval)
+
+    # **************************************************************************************************************** #
+    def stop(self):
+        self.timer.stop()
+
+    # **************************************************************************************************************** #
+    def render(self):
+        start = time.perf_counter()
+        # views ingest samples received since last frame, then the dirty ones are repainted
+        for bridge in self.bridges:
+            bridge.flush()
+        for view in self.views:
+            view.render()
+        elapsed = 1000 * (time.perf_counter() - start)
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # back-off: frames too slow for the interval
+        budget = FRAME_BUDGET * self.interval
+        if elapsed > budget and self.interval < MAX_INTERVAL:
+            self.set_interval(min(2 * self.interval, MAX_INTERVAL))
+        elif elapsed < budget / 4 and self.interval > self.target:
+            self.fast_frames += 1
+            if self.fast_frames >= RECOVERY_FRAMES:
+                self.set_interval(max(self.interval // 2, self.target))
+        else:
+            self.fast_frames = 0
+
+    # **************************************************************************************************************** #
+    def set_interval(self, interval):
+        self.interval = interval
+        self.fast_frames = 0
+        self.timer.setInterval(interval)
+        for view in self.views:
+            if view.metrics is not None:
+                view.metrics.expect('render', interval / 1000)
+        if self.debug:
+            print("[INFO] Display refresh rate: {:.1f} Hz".format(self.rate))
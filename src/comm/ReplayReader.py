@@ -0,0 +1,170 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       src\comm\ReplayReader.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+########################################################################################################################
+
+# python packages
+from PyQt6.QtCore import *
+from pathlib import *
+import numpy as np
+import time
+# custom packages
+from src.options.LogReader import LogReader
+from src.options.ThermalReader import ThermalReader
+from src.options.ThermalRecord import HEADER_FILE
+
+
+########################################################################################################################
+def load_recording(filename):
+    """
+    Load a recording once, replay and seeking only index the arrays
+    :param filename: CSV log (Temp2Record, DxRecord, Dx2Record) or thermal recording folder (ThermalRecord)
+    :return: (arrival times in ns, samples without their time, which is added back when handed to the views)
+    """
+    filename = Path(filename)
+    if filename.name == HEADER_FILE:
+        filename = filename.parent
+
+    # ------------------------------------------------------------------------------------------------------------ #
+    # thermal frames are memory-mapped, not read
+    if filename.is_dir():
+        recording = ThermalReader(filename)
+        return recording.timestamps, recording.frames
+
+    # ------------------------------------------------------------------------------------------------------------ #
+    # same samples as the acquisition classes: error of MLX90614 is computed by the view
+    data = LogReader(filename).load()
+    times = data['time'].astype('datetime64[ns]').view(np.int64)
+    names = [name for name in data.dtype.names[1:] if name != 'error']
+    if len(names) == 1:
+        return times, data[names[0]]
+    return times, np.column_stack([data[name] for name in names])
+
+
+########################################################################################################################
+class ReplayReader(QObject):
+    """
+    Replay a recording in place of a serial port: samples are handed to the sink as if they came from the board, at
+    the recorded pace times speed, or as fast as possible when speed is 0. Lives in the GUI thread like QtSerialReader,
+    so that the view has processed each batch before the next one is sent.
+    The rate printed at the end of a replay as fast as possible is the ingest rate of the view (bridge, rolling window,
+    history): recordings hold parsed samples, the parser is not used, and the plots are repainted by the render loop at
+    its own rate. Parsing and rendering are measured by bench.bench_suite.
+    """
+    progress = pyqtSignal(float)
+    # emitted when seeking back in time, views forget the samples they hold
+    rewound = pyqtSignal()
+
+    def __init__(self, filename=None, sink=None, speed=1.0, tick=20, batch=1000, debug=False, metrics=None):
+        QObject.__init__(self)
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        self.sink = sink
+        self.speed = speed
+        self.batch = batch
+        self.debug = debug
+        self.metrics = metrics
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        self.times, self.samples = load_recording(filename)
+        self.duration = (self.times[-1] - self.times[0]) / 1e9 if len(self.times) else 0.0
+        print("[INFO] Replay of {}: {} samples, {:.1f} s".format(filename, len(self.times), self.duration))
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # position in recording, and recording time (ns) matching wall clock time origin
+        self.position = 0
+        self.origin = 0.0
+        self.origin_time = self.times[0] if len(self.times) else 0
+        self.samples_sent = 0
+        self.started = 0.0
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(0 if self.speed == 0 else tick)
+        self.timer.timeout.connect(self.handle_tick)
+
+    # **************************************************************************************************************** #
+    def start(self):
+        self.origin = time.monotonic()
+        self.started = self.origin
+        self.timer.start()
+
+    # **************************************************************************************************************** #
+    def seek(self, seconds):
+        """
+        Jump in recording
+        :param seconds: time from beginning of recording
+        """
+        if not len(self.times):
+            return
+        self.origin_time = self.times[0] + int(seconds * 1e9)
+        position = int(np.searchsorted(self.times, self.origin_time))
+        if position < self.position:
+            self.rewound.emit()
+        self.position = position
+        self.origin = time.monotonic()
+
+        # replay finished: play again from the new position
+        if not self.timer.isActive():
+            self.samples_sent = 0
+            self.started = self.origin
+            self.timer.start()
+
+    # **************************************************************************************************************** #
+    # CALLBACK (GUI thread)
+    def handle_tick(self):
+        """
+        Send samples that are due
+        """
+        # ------------------------------------------------------------------------------------------------------------ #
+        if self.position >= len(self.times):
+            self.timer.stop()
+            elapsed = time.monotonic() - self.started
+            print("[INFO] Replay finished: {} samples in {:.2f} s ({:.0f} samples/s ingested by the view)".format(
+                self.samples_sent, elapsed, self.samples_sent / max(elapsed, 1e-9)))
+            return
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        if self.speed == 0:
+            end = min(self.position + self.batch, len(self.times))
+        else:
+            due = self.origin_time + int((time.monotonic() - self.origin) * self.speed * 1e9)
+            end = int(np.searchsorted(self.times, due, side='right'))
+            if end == self.position:
+                return
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        samples = self.samples[self.position:end]
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.event('chunk')
+            metrics.count('samples', end - self.position)
+            start = metrics.clock()
+
+        # samples are handed to the views with their recorded arrival time in s, like the acquisition classes do.
+        # frames stay views on the recording, other samples are one block with one row per sample
+        times = self.times[self.position:end] / 1e9
+        if samples.ndim > 2:
+            self.sink(list(zip(times, samples)))
+        else:
+            self.sink(np.column_stack((times, samples)))
+
+        if metrics is not None:
+            metrics.record('sink', start)
+        self.samples_sent += end - self.position
+        self.position = end
+
+        self.progress.emit((self.times[end - 1] - self.times[0]) / 1e9)
+
+    # **************************************************************************************************************** #
+    def stop(self):
+        self.timer.stop()
@@ -0,0 +1,68 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       src\comm\SampleBridge.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+########################################################################################################################
+
+# python packages
+from PyQt6.QtCore import *
+import numpy as np
+import threading
+
+
+########################################################################################################################
+class SampleBridge(QObject):
+    """
+    Hand samples from an acquisition thread to the GUI thread. The signal is emitted from the reader thread and, as
+    the bridge lives in the GUI thread, Qt queues the call to the connected slot.
+    Once added to a RenderLoop, the bridge only stores the samples, the loop emits them at its own rate.
+    Samples are lists of tuples or, from the 'process' transport and replays, arrays with one row per sample: lists
+    stored between two frames are joined, arrays are emitted one by one as they are, without any copy.
+    """
+    samples_ready = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        QObject.__init__(self, parent)
+        self.buffered = False
+        self.pending = []
+        self.lock = threading.Lock()
+
+    # **************************************************************************************************************** #
+    def push(self, samples):
+        if not self.buffered:
+            self.samples_ready.emit(samples)
+            return
+        with self.lock:
+            self.pending.append(samples)
+
+    # **************************************************************************************************************** #
+    def flush(self):
+        """
+        Emit samples stored since last flush, if any (GUI thread)
+        """
+        with self.lock:
+            blocks, self.pending = self.pending, []
+        if not blocks:
+            return
+        if isinstance(blocks[0], np.ndarray):
+            for block in blocks:
+                self.samples_ready.emit(block)
+        else:
+            self.samples_ready.emit([sample for block in blocks for sample in block])
+
+    # **************************************************************************************************************** #
+    def clear(self):
+        """
+        Drop samples stored since last flush
+        """
+        with self.lock:
+            self.pending = []
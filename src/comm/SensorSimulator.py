@@ -0,0 +1,155 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       src\comm\SensorSimulator.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+########################################################################################################################
+
+# python packages
+import numpy as np
+import threading
+import time
+import pty
+import tty
+import os
+
+
+########################################################################################################################
+class SensorSimulator(threading.Thread):
+    """
+    Virtual board on a pseudo-terminal (Linux/macOS): writes the lines of one sensor firmware at rate samples per
+    second (frames per second for the AMG8833). The slave side (self.port, e.g. /dev/pts/3) is opened like a COM port.
+    Options:
+        noise: standard deviation added to the measures
+        dropout: probability to lose each line
+        burst, burst_period: burst samples sent at once every burst_period seconds, on top of the steady rate
+    Bytes are dropped, like on the board, when nobody reads the port.
+    """
+
+    def __init__(self, sensor, rate=10.0, noise=0.0, dropout=0.0, burst=0, burst_period=1.0, scales='Celsius',
+                 seed=None, tick=0.01):
+        threading.Thread.__init__(self, daemon=True)
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        self.lines = {
+            'AMG8833': self.amg8833_lines,
+            'MLX90614': self.mlx90614_lines,
+            'VL53L4CD': self.vl53l4cd_lines,
+            'HC-SR04': self.hc_sr04_lines,
+        }[sensor]
+        self.sensor = sensor
+        self.rate = rate
+        self.noise = noise
+        self.dropout = dropout
+        self.burst = burst
+        self.burst_period = burst_period
+        self.unit = b"F" if scales == 'Fahrenheit' else b"C"
+        self.tick = tick
+        self.rng = np.random.default_rng(seed)
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # pseudo-terminal, raw mode so that \r\n are sent as is
+        self.master, self.slave = pty.openpty()
+        tty.setraw(self.slave)
+        os.set_blocking(self.master, False)
+        self.port = os.ttyname(self.slave)
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        self.stopped = threading.Event()
+        self.samples_sent = 0
+        self.lines_dropped = 0
+        self.bytes_sent = 0
+        self.bytes_dropped = 0
+
+    # **************************************************************************************************************** #
+    # FIRMWARE LINE FORMATS
+    def amg8833_lines(self, t):
+        """
+        8x8 frame: rows of 8 values ending with ', ', first row prefixed by '[', then ']' and an empty line
+        """
+        y, x = np.mgrid[0:8, 0:8]
+        spot_x, spot_y = 3.5 + 3 * np.cos(t), 3.5 + 3 * np.sin(t)
+        frame = 22 + 10 * np.exp(-((x - spot_x) ** 2 + (y - spot_y) ** 2) / 4)
+        frame += self.noise * self.rng.standard_normal((8, 8))
+
+        rows = [b"".join(b"%.2f, " % value for value in row) + b"\r\n" for row in frame]
+        rows[0] = b"[" + rows[0]
+        return rows + [b"]\r\n", b"\r\n"]
+
+    def mlx90614_lines(self, t):
+        ambient = 22 + 0.5 * np.sin(t / 10) + self.noise * self.rng.standard_normal()
+        target = 30 + 5 * np.sin(t) + self.noise * self.rng.standard_normal()
+        if self.unit == b"F":
+            ambient, target = ambient * 9 / 5 + 32, target * 9 / 5 + 32
+        return [b"Ambient = %.2f*%s\tObject = %.2f*%s\r\n" % (ambient, self.unit, target, self.unit)]
+
+    def vl53l4cd_lines(self, t):
+        distance = max(0, int(500 + 300 * np.sin(t) + self.noise * self.rng.standard_normal()))
+        signal = max(0, int(2000 - 2 * distance + self.noise * self.rng.standard_normal()))
+        return [b"Status = %3u, Distance = %5u mm, Signal = %6u kcps/spad\r\n" % (0, distance, signal)]
+
+    def hc_sr04_lines(self, t):
+        distance = max(0.0, 50 + 30 * np.sin(t) + self.noise * self.rng.standard_normal())
+        return [b"1: %.2f cm\r\n" % distance]
+
+    # **************************************************************************************************************** #
+    def write(self, data):
+        """
+        Write to the pseudo-terminal, what does not fit is lost
+        """
+        try:
+            written = os.write(self.master, data)
+        except BlockingIOError:
+            written = 0
+        self.bytes_sent += written
+        self.bytes_dropped += len(data) - written
+
+    # **************************************************************************************************************** #
+    def run(self):
+        """
+        Send samples that are due every tick
+        """
+        start = time.monotonic()
+        next_burst = start + self.burst_period
+        due = 0
+        while not self.stopped.is_set():
+            # -------------------------------------------------------------------------------------------------------- #
+            now = time.monotonic()
+            count = int((now - start) * self.rate) - due
+            due += count
+            if self.burst and now >= next_burst:
+                count += self.burst
+                next_burst += self.burst_period
+
+            # -------------------------------------------------------------------------------------------------------- #
+            lines = []
+            for i in range(count):
+                lines += self.lines(now - start)
+            if self.dropout:
+                kept = self.rng.random(len(lines)) >= self.dropout
+                self.lines_dropped += len(lines) - int(kept.sum())
+                lines = [line for line, keep in zip(lines, kept) if keep]
+            if lines:
+                self.write(b"".join(lines))
+            self.samples_sent += count
+
+            self.stopped.wait(self.tick)
+
+    # **************************************************************************************************************** #
+    def stop(self):
+        """
+        Stop simulation and close pseudo-terminal
+        """
+        self.stopped.set()
+        if self.is_alive():
+            self.join(timeout=1.0)
+        os.close(self.master)
+        os.close(self.slave)
@@ -0,0 +1,176 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       src\comm\SerialReader.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+########################################################################################################################
+
+# python packages
+from serial import *
+import sys
+import threading
+import time
+# custom packages
+from src.core.Clock import now
+from src.comm.LineBuffer import LineBuffer
+
+
+########################################################################################################################
+class SerialReader(threading.Thread):
+    """
+    Background thread reading a serial port. Each tick drains everything waiting in the input buffer, the complete
+    lines are given at once to the parser of the device and the array of samples it returns is handed to the sink
+    (thread-safe), so a slow or silent board never blocks the GUI and no measure is thrown away.
+    """
+
+    def __init__(self, port=None, baudrate=9600, parser=None, sink=None, debug=False, metrics=None):
+        threading.Thread.__init__(self, daemon=True)
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        self.parser = parser
+        self.sink = sink
+        self.debug = debug
+        self.metrics = metrics
+        self.running = threading.Event()
+        self.lines = LineBuffer()
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # throughput counters
+        self.lines_per_tick = 0
+        self.lines_total = 0
+        # arrival of the last chunk which completed lines, the lines of the next one were sent since then
+        self.last_block = now()
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # SERIAL COMMUNICATION
+        # open serial port
+        try:
+            self.ser = Serial(port, baudrate, timeout=0.5, exclusive=True)
+        except Exception as err_com_port:
+            print("[ERR.] Please make sure than you use the right COM port: {}".format(err_com_port))
+            sys.exit(-1)
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # remove old data in input buffer
+        self.bytes_dropped = 0
+        self.reset_input()
+        if self.metrics is not None:
+            self.metrics.watch('bytes_dropped', lambda: self.bytes_dropped + self.lines.dropped)
+
+    # **************************************************************************************************************** #
+    def reset_input(self):
+        """
+        Throw away bytes received before the port was (re)opened
+        """
+        self.bytes_dropped += self.ser.in_waiting
+        self.ser.reset_input_buffer()
+        # the first lines read were sent since the port was emptied
+        self.last_block = now()
+
+    # **************************************************************************************************************** #
+    def run(self):
+        """
+        Acquisition loop: drain, parse and hand samples over until stopped
+        """
+        self.running.set()
+        while self.running.is_set():
+            # -------------------------------------------------------------------------------------------------------- #
+            # bulk read of the whole backlog, waits for at least one byte (or timeout) when nothing is pending
+            metrics = self.metrics
+            try:
+                pending = self.ser.in_waiting
+                if metrics is not None:
+                    start = metrics.clock()
+                chunk = self.ser.read(pending or 1)
+            except Exception as e:
+                print("[ERR] unable to read line: {}".format(e))
+                self.try_reconnect()
+                continue
+
+            if not chunk:
+                continue
+            # lines of a chunk are spread between the previous chunk and this one by the parser
+            timestamp = now()
+
+            # -------------------------------------------------------------------------------------------------------- #
+            if metrics is not None:
+                # waiting for data is not part of the read stage
+                if pending:
+                    metrics.record('read', start)
+                metrics.event('chunk')
+                metrics.count('bytes', len(chunk))
+                start = metrics.clock()
+
+            block = self.lines.feed_block(chunk)
+
+            if metrics is not None:
+                metrics.record('split', start)
+
+            if not block:
+                continue
+
+            lines = block.count(b"\n") + 1
+            self.lines_per_tick = lines
+            self.lines_total += lines
+            if metrics is not None:
+                metrics.count('lines', lines)
+            if self.debug and lines > 1:
+                print("[DBG] {} lines drained".format(lines))
+
+            # -------------------------------------------------------------------------------------------------------- #
+            # all the lines of the chunk are parsed at once, straight into an array of samples
+            previous, self.last_block = self.last_block, timestamp
+            if metrics is not None:
+                start = metrics.clock()
+            try:
+                samples = self.parser(block, timestamp, previous)
+            except Exception as e:
+                print("[ERR] Unable to handle lines: {} - {}".format(block, e))
+                continue
+            if metrics is not None:
+                metrics.record('parse', start)
+
+            if len(samples):
+                if metrics is not None:
+                    metrics.count('samples', len(samples))
+                    start = metrics.clock()
+                self.sink(samples)
+                if metrics is not None:
+                    metrics.record('sink', start)
+
+        self.ser.close()
+
+    # **************************************************************************************************************** #
+    def try_reconnect(self):
+        """
+        Reconnection with board
+        """
+        self.ser.close()
+        try:
+            self.ser.open()
+            self.reset_input()
+            self.lines.clear()
+            print("[INFO] reconnected to the board")
+        except Exception as err_connection:
+            print("[ERR] connection failed: {}".format(err_connection))
+            # avoid spinning on a board which is unplugged
+            time.sleep(0.5)
+
+    # **************************************************************************************************************** #
+    def stop(self):
+        """
+        Stop the acquisition loop and wait for the thread to release the port
+        """
+        self.running.clear()
+        if self.is_alive():
+            self.join(timeout=1.0)
+        else:
+            self.ser.close()
@@ -0,0 +1,52 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       src\comm\Transport.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+########################################################################################################################
+
+# custom packages
+from src.comm.ProcessReader import ProcessReader
+from src.comm.QtSerialReader import QtSerialReader
+from src.comm.ReplayReader import ReplayReader
+from src.comm.SerialReader import SerialReader
+
+
+########################################################################################################################
+def open_reader(settings=None, baudrate=9600, parser=None, sink=None, metrics=None, acquisition=None):
+    """
+    Create the serial reader chosen by the user
+    :param settings: settings from ComSelect, 'transport' is either 'thread' (pyserial in a background thread) or
+                     'event' (QSerialPort, driven by readyRead) or 'process' (port read and parsed in its own
+                     process), 'replay' is a recording played instead of the port
+    :param baudrate: baud rate of the board
+    :param parser: function parsing the complete lines of a chunk, with its arrival time and the one of the previous
+                   chunk (monotonic, ns), returns an array with one sample per row
+    :param sink: function receiving the array of samples parsed at each tick
+    :param metrics: Metrics instance, None when instrumentation is disabled
+    :param acquisition: acquisition of the device, rebuilt in the reading process by the 'process' transport
+    :return: reader with start() / stop()
+    """
+    if settings.get('replay'):
+        # samples are read from the recording, the parser is not used
+        return ReplayReader(filename=settings['replay'], sink=sink, speed=settings.get('replay_speed', 1.0),
+                            debug=settings['debug'], metrics=metrics)
+
+    if settings.get('transport') == 'process':
+        return ProcessReader(acquisition=acquisition, settings=settings, sink=sink, debug=settings['debug'],
+                             metrics=metrics)
+
+    if settings.get('transport') == 'event':
+        return QtSerialReader(port=settings['com_port'], baudrate=baudrate, parser=parser, sink=sink,
+                              debug=settings['debug'], metrics=metrics)
+
+    return SerialReader(port=settings['com_port'], baudrate=baudrate, parser=parser, sink=sink,
+                        debug=settings['debug'], metrics=metrics)
@@ -0,0 +1,39 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       src\core\Clock.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+#
+# Arrival timestamps of the lines: monotonic clock in ns, taken when the bytes are read from the port.
+# Recordings need wall clock time, the offset between both clocks is measured once so that a clock adjustment during
+# a run does not create jumps in recorded times.
+########################################################################################################################
+
+# python packages
+import time
+
+WALL_OFFSET = time.time_ns() - time.monotonic_ns()
+
+
+########################################################################################################################
+def now():
+    """
+    :return: monotonic time in ns
+    """
+    return time.monotonic_ns()
+
+
+def to_wall(timestamp):
+    """
+    :param timestamp: monotonic time in ns
+    :return: wall clock time in ns since epoch
+    """
+    return timestamp + WALL_OFFSET
@@ -0,0 +1,78 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       src\core\Decimator.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+########################################################################################################################
+
+# python packages
+import numpy as np
+
+
+########################################################################################################################
+class Decimator:
+    """
+    Peak-preserving decimation of a trace to the width of a plot. Samples are grouped in one bucket per pixel and
+    every bucket is drawn as its minimum and maximum, in their order of arrival: a single sample spike stays visible
+    whatever the number of samples per pixel. The output is written to x/y buffers allocated once and grown only
+    when the plot gets wider, the curve of the plot keeps views of them.
+    """
+
+    def __init__(self, pixels=1024):
+        """
+        :param pixels: expected plot width, buffers grow if needed
+        """
+        self.x = np.empty(2 * pixels + 2)
+        self.y = np.empty(2 * pixels + 2)
+
+    # **************************************************************************************************************** #
+    def apply(self, t, y, pixels):
+        """
+        :param t: times, increasing
+        :param y: values, same length
+        :param pixels: plot width in pixels
+        :return: (x, y) to draw, the inputs themselves if they already have at most 2 points per pixel
+        """
+        t = np.asarray(t, dtype=float)
+        y = np.asarray(y, dtype=float)
+        n = len(t)
+        pixels = max(int(pixels), 1)
+        if n <= 2 * pixels:
+            return t, y
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # full buckets of `size` samples, the last incomplete one is a bucket too
+        size = -(-n // pixels)
+        buckets = -(-n // size)
+        full = n // size
+        if len(self.x) < 2 * buckets:
+            self.x = np.empty(2 * buckets)
+            self.y = np.empty(2 * buckets)
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # index of the minimum and maximum of every bucket, the first one in time comes first
+        groups = y[:full * size].reshape(full, size)
+        i_min = groups.argmin(axis=1)
+        i_max = groups.argmax(axis=1)
+        offsets = np.arange(full) * size
+        index = np.empty(2 * buckets, dtype=np.intp)
+        index[0:2 * full:2] = offsets + np.minimum(i_min, i_max)
+        index[1:2 * full:2] = offsets + np.maximum(i_min, i_max)
+        if buckets > full:
+            tail = y[full * size:]
+            first = full * size + np.array((tail.argmin(), tail.argmax()))
+            index[-2:] = np.sort(first)
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        count = 2 * buckets
+        np.take(t, index, out=self.x[:count])
+        np.take(y, index, out=self.y[:count])
+        return self.x[:count], self.y[:count]
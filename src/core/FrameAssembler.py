@@ -0,0 +1,104 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       src\core\FrameAssembler.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+########################################################################################################################
+
+# python packages
+import numpy as np
+
+
+########################################################################################################################
+class FrameAssembler:
+    """
+    Assemble AMG8833 thermal frames sent as text:
+        [25.00, 25.25, ..., 25.00,
+        25.00, 25.25, ..., 25.00,
+        ... (8 rows)
+        ]
+    Rows are converted by NumPy directly into a preallocated float32 buffer. Frames are synchronised on the '['/']'
+    markers: a frame with a missing or broken row is dropped and counted, the next '[' starts a new frame.
+    """
+
+    def __init__(self, rows=8, cols=8):
+        # ------------------------------------------------------------------------------------------------------------ #
+        self.rows = rows
+        self.cols = cols
+        self.frame = np.zeros((rows, cols), dtype=np.float32)
+        # index of next row to fill, -1 while waiting for the beginning of a frame
+        self.row = -1
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # counters
+        self.frames = 0
+        self.torn_frames = 0
+
+    # **************************************************************************************************************** #
+    def feed(self, line):
+        """
+        Add one line received from the board
+        :param line: raw line read from serial port
+        :return: copy of the 8x8 frame when it is complete, None otherwise
+        """
+        line = line.strip()
+        if not line:
+            return None
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # end of frame
+        if line.startswith(b"]"):
+            return self.end_frame()
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # beginning of frame, a complete frame whose ']' got lost is still valid
+        frame = None
+        if line.startswith(b"["):
+            if self.row >= 0:
+                frame = self.end_frame()
+            self.row = 0
+            line = line[1:]
+
+        if self.row < 0:
+            # header or lines of a frame already dropped
+            return frame
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # one row: NumPy converts the numbers straight into the frame buffer
+        values = line.split(b",")
+        try:
+            if self.row >= self.rows or len(values) < self.cols:
+                raise ValueError("unexpected row {}".format(line))
+            self.frame[self.row] = values[:self.cols]
+        except ValueError:
+            self.torn_frames += 1
+            self.row = -1
+            return frame
+
+        self.row += 1
+        return frame
+
+    # **************************************************************************************************************** #
+    def end_frame(self):
+        """
+        Close current frame
+        :return: copy of the frame if all rows were received, None otherwise
+        """
+        row, self.row = self.row, -1
+        if row < 0:
+            return None
+
+        if row != self.rows:
+            self.torn_frames += 1
+            return None
+
+        self.frames += 1
+        return self.frame.copy()
@@ -0,0 +1,143 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       src\core\HistoryStore.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+########################################################################################################################
+
+# python packages
+import numpy as np
+# custom packages
+from src.core.RingBuffer import RingBuffer
+
+
+########################################################################################################################
+class HistoryStore:
+    """
+    Long history of a sensor for scrollable plots: raw samples plus a pyramid of min/max/mean levels, each level
+    grouping `factor` rows of the previous one (x10, x100, x1000 by default). Levels are updated incrementally when
+    samples are appended, and the plots ask for the coarsest level which still has about one point per pixel in the
+    visible range. Every level is a RingBuffer: the oldest rows of each level are forgotten first, coarse levels go
+    back further in time than the raw samples.
+    """
+
+    def __init__(self, values=1, capacity=1 << 18, factor=10, levels=3, level_capacity=1 << 16):
+        """
+        :param values: values per sample, after its time
+        :param capacity: raw samples kept
+        :param factor: rows of a level grouped in one row of the next level
+        :param levels: number of min/max/mean levels
+        :param level_capacity: rows kept per level
+        """
+        self.values = values
+        self.factor = factor
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # level 0: time, values. Next levels: time of the first sample, min, max and mean of every value
+        self.levels = [RingBuffer(capacity=capacity, channels=1 + values)]
+        self.levels += [RingBuffer(capacity=level_capacity, channels=1 + 3 * values) for _ in range(levels)]
+        # rows waiting for a complete group, in the layout of the levels
+        self.partial = [np.empty((0, 1 + 3 * values)) for _ in range(levels)]
+
+    # **************************************************************************************************************** #
+    def __len__(self):
+        return len(self.levels[0])
+
+    # **************************************************************************************************************** #
+    def clear(self):
+        """
+        Forget every sample, e.g. before times start again from an earlier point
+        """
+        for level in self.levels:
+            level.clear()
+        self.partial = [partial[:0] for partial in self.partial]
+
+    # **************************************************************************************************************** #
+    def extend(self, samples):
+        """
+        Append samples and update the levels
+        :param samples: array-like of shape (n, 1 + values), time first
+        """
+        samples = np.asarray(samples, dtype=float).reshape(-1, 1 + self.values)
+        if not len(samples):
+            return
+        self.levels[0].extend(samples)
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # raw samples are their own min, max and mean
+        values = samples[:, 1:]
+        rows = np.hstack((samples[:, :1], values, values, values))
+        v = self.values
+        for level in range(len(self.partial)):
+            rows = np.vstack((self.partial[level], rows))
+            complete = len(rows) // self.factor * self.factor
+            self.partial[level] = rows[complete:]
+            if not complete:
+                break
+
+            groups = rows[:complete].reshape(-1, self.factor, 1 + 3 * v)
+            rows = np.hstack((groups[:, 0, :1],
+                              groups[:, :, 1:1 + v].min(axis=1),
+                              groups[:, :, 1 + v:1 + 2 * v].max(axis=1),
+                              groups[:, :, 1 + 2 * v:].mean(axis=1)))
+            self.levels[level + 1].extend(rows)
+
+    # **************************************************************************************************************** #
+    def select(self, t_start, t_end, pixels):
+        """
+        Rows to draw between two times
+        :param t_start: beginning of the visible range
+        :param t_end: end of the visible range
+        :param pixels: width of the plot in pixels
+        :return: (time, min, max, mean), one row per point, values in columns
+        """
+        # finest level covering the beginning of the range with at most ~2 points per pixel
+        for level in range(len(self.levels)):
+            t = self.levels[level].view()[0]
+            if not len(t):
+                continue
+            covers = t[0] <= t_start or level == len(self.levels) - 1
+            i0, i1 = np.searchsorted(t, (t_start, t_end))
+            if covers and i1 - i0 <= 2 * pixels:
+                break
+
+        return self.rows(level, t_start, t_end)
+
+    # **************************************************************************************************************** #
+    def rows(self, level, t_start, t_end):
+        """
+        Rows of one level between two times, completed by finer levels after the last complete group
+        :return: (time, min, max, mean)
+        """
+        data = self.levels[level].view()
+        t = data[0]
+        # one point before and after the range, so that lines reach the borders
+        i0, i1 = np.searchsorted(t, (t_start, t_end))
+        i0 = max(i0 - 1, 0)
+        i1 = min(i1 + 1, len(t))
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        v = self.values
+        if level == 0:
+            values = data[1:, i0:i1].T
+            result = (t[i0:i1], values, values, values)
+        else:
+            result = (t[i0:i1], data[1:1 + v, i0:i1].T, data[1 + v:1 + 2 * v, i0:i1].T, data[1 + 2 * v:, i0:i1].T)
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # newest samples are not grouped yet at this level
+        if level > 0 and (not len(t) or t[-1] < t_end):
+            last = t[-1] if len(t) else -np.inf
+            tail = self.rows(level - 1, last, t_end)
+            keep = tail[0] > last
+            result = tuple(np.concatenate((a, b[keep])) for a, b in zip(result, tail))
+
+        return result
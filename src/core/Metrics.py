@@ -0,0 +1,194 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       src\core\Metrics.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+########################################################################################################################
+
+# python packages
+from collections import deque
+import numpy as np
+import json
+import time
+
+# histogram bins of stage durations, in us
+HISTOGRAM_BINS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 20000, 50000, 100000, np.inf)
+
+
+########################################################################################################################
+class Metrics:
+    """
+    Instrumentation of the acquisition and display path, shared by reader, acquisition and view:
+        stages:    durations of the last `history` calls of each stage (read, split, parse, record, sink, plot...)
+        counters:  totals (bytes, lines, samples, dropped bytes...) from which rates are computed
+        intervals: time between consecutive events (e.g. view updates), with their jitter for events of known period
+        gauges:    values read when a snapshot is taken (e.g. bytes flushed by the recorder)
+    Instrumented code keeps a reference set to None when disabled and tests it, so that nothing is measured.
+        if self.metrics is not None:
+            start = self.metrics.clock()
+        ...
+        if self.metrics is not None:
+            self.metrics.record('parse', start)
+    """
+    clock = staticmethod(time.perf_counter_ns)
+
+    def __init__(self, history=1000):
+        # ------------------------------------------------------------------------------------------------------------ #
+        self.history = history
+        # expected period of events, in s
+        self.periods = {}
+        self.start = time.monotonic()
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        self.stages = {}
+        self.counters = {}
+        self.intervals = {}
+        self.last_event = {}
+        self.gauges = {}
+
+        # counters at previous snapshot, for current rates
+        self.last_snapshot = (self.start, {})
+
+    # **************************************************************************************************************** #
+    def record(self, stage, start):
+        """
+        End of one stage
+        :param stage: name of stage
+        :param start: clock() at beginning of stage
+        """
+        duration = time.perf_counter_ns() - start
+        durations = self.stages.get(stage)
+        if durations is None:
+            durations = self.stages[stage] = deque(maxlen=self.history)
+        durations.append(duration)
+
+    # **************************************************************************************************************** #
+    def count(self, counter, n=1):
+        self.counters[counter] = self.counters.get(counter, 0) + n
+
+    # **************************************************************************************************************** #
+    def event(self, name):
+        """
+        Time between consecutive calls
+        :param name: name of event
+        """
+        now = time.perf_counter_ns()
+        last = self.last_event.get(name)
+        self.last_event[name] = now
+        if last is None:
+            return
+        intervals = self.intervals.get(name)
+        if intervals is None:
+            intervals = self.intervals[name] = deque(maxlen=self.history)
+        intervals.append(now - last)
+
+    # **************************************************************************************************************** #
+    def expect(self, name, period):
+        """
+        Expected period of an event, its jitter is reported. Events without period (chunks of serial data...) only
+        report their intervals
+        :param name: name of event
+        :param period: time between two events in s
+        """
+        self.periods[name] = period
+
+    # **************************************************************************************************************** #
+    def watch(self, gauge, function):
+        """
+        :param gauge: name of value
+        :param function: called at each snapshot
+        """
+        self.gauges[gauge] = function
+
+    # **************************************************************************************************************** #
+    def snapshot(self):
+        """
+        :return: dict with statistics of stages and intervals, counters, rates since start and since last snapshot
+        """
+        now = time.monotonic()
+        counters = dict(self.counters)
+        last_time, last_counters = self.last_snapshot
+        self.last_snapshot = (now, counters)
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        stages = {}
+        for stage, durations in list(self.stages.items()):
+            us = np.array(durations, dtype=float) / 1000
+            if not len(us):
+                continue
+            stages[stage] = {
+                'calls': len(us),
+                'mean_us': float(us.mean()),
+                'p50_us': float(np.percentile(us, 50)),
+                'p99_us': float(np.percentile(us, 99)),
+                'max_us': float(us.max()),
+                'histogram_us': dict(zip(["<{:g}".format(edge) for edge in HISTOGRAM_BINS[1:]],
+                                         np.histogram(us, bins=HISTOGRAM_BINS)[0].tolist())),
+            }
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        intervals = {}
+        for name, values in list(self.intervals.items()):
+            seconds = np.array(values, dtype=float) / 1e9
+            if not len(seconds):
+                continue
+            intervals[name] = {
+                'mean_s': float(seconds.mean()),
+                'std_s': float(seconds.std()),
+                'p99_s': float(np.percentile(seconds, 99)),
+            }
+            period = self.periods.get(name)
+            if period:
+                # jitter versus expected period
+                intervals[name]['jitter_p99_s'] = float(np.percentile(np.abs(seconds - period), 99))
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        elapsed = max(now - self.start, 1e-9)
+        window = max(now - last_time, 1e-9)
+        return {
+            'uptime_s': elapsed,
+            'periods_s': dict(self.periods),
+            'stages': stages,
+            'intervals': intervals,
+            'counters': counters,
+            'rates': {counter: value / elapsed for counter, value in counters.items()},
+            'current_rates': {counter: (value - last_counters.get(counter, 0)) / window
+                              for counter, value in counters.items()},
+            'gauges': {gauge: function() for gauge, function in self.gauges.items()},
+        }
+
+    # **************************************************************************************************************** #
+    def report(self, snapshot=None):
+        """
+        :return: snapshot as text, one line per item
+        """
+        snapshot = snapshot or self.snapshot()
+        lines = []
+        for counter, rate in snapshot['current_rates'].items():
+            lines.append("{:<16}{:>12,.0f} /s {:>14,} total".format(counter, rate, snapshot['counters'][counter]))
+        for stage, stats in snapshot['stages'].items():
+            lines.append("{:<16}p50 {:>9.1f} us  p99 {:>9.1f} us  max {:>9.1f} us".format(
+                stage, stats['p50_us'], stats['p99_us'], stats['max_us']))
+        for name, stats in snapshot['intervals'].items():
+            jitter = "  jitter p99 {:.4f} s".format(stats['jitter_p99_s']) if 'jitter_p99_s' in stats else ""
+            lines.append("{:<16}every {:.4f} s  std {:.4f} s{}".format(name, stats['mean_s'], stats['std_s'], jitter))
+        for gauge, value in snapshot['gauges'].items():
+            lines.append("{:<16}{:>12,}".format(gauge, value))
+        return "\n".join(lines)
+
+    # **************************************************************************************************************** #
+    def dump(self, filename):
+        """
+        Save snapshot to JSON file
+        """
+        with open(filename, 'w') as file:
+            json.dump(self.snapshot(), file, indent=4)
+        print("[INFO] Metrics saved to: {}".format(filename))
@@ -0,0 +1,207 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       src\core\Parsers.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+########################################################################################################################
+
+# python packages
+from itertools import chain
+import numpy as np
+import re
+
+# number as printed by Arduino Serial.print(), nan when the sensor read fails
+NUMBER = rb"([-+]?(?:\d+\.?\d*|nan))"
+
+
+########################################################################################################################
+def spread(count, seconds, since=None):
+    """
+    Times of the samples of one chunk: they were sent one after the other since the previous chunk, not all at once
+    :param count: number of samples in the chunk
+    :param seconds: arrival time of the chunk, time of its last sample
+    :param since: arrival time of the previous chunk, all the samples get `seconds` if None
+    :return: array of `count` times, evenly spaced in ]since, seconds]
+    """
+    if since is None or count < 2:
+        return np.full(count, seconds)
+    return since + (seconds - since) * np.arange(1, count + 1) / count
+
+
+########################################################################################################################
+class LineParser:
+    """
+    Precompiled parser of one text format sent by a board. Works on raw bytes, without decoding, in a single pass.
+    """
+
+    def __init__(self, pattern=b"", convert=None, fields=1):
+        # ------------------------------------------------------------------------------------------------------------ #
+        self.regex = re.compile(pattern, re.MULTILINE)
+        # bound methods, avoid attribute lookups for every line
+        self.search = self.regex.search
+        self.findall = self.regex.findall
+        # converts a match into a tuple of typed values
+        self.convert = convert
+        self.fields = fields
+
+    # **************************************************************************************************************** #
+    def parse(self, line):
+        """
+        Parse one line
+        :param line: raw line read from serial port
+        :return: tuple of typed values or None if the line does not match the format
+        """
+        match = self.search(line)
+        if match is None:
+            return None
+
+        try:
+            return self.convert(match)
+        except ValueError:
+            return None
+
+    # **************************************************************************************************************** #
+    def parse_batch(self, buffer, out=None):
+        """
+        Parse every measure found in a buffer of many lines, lines which do not match the format are skipped
+        :param buffer: raw bytes read from serial port or from a file
+        :param out: optional preallocated float array of shape (>= n, fields) filled in place
+        :return: float array of shape (n, fields), a view of out when it is given
+        """
+        found = self.findall(buffer)
+        if self.fields > 1:
+            found = chain.from_iterable(found)
+        values = np.fromiter(map(float, found), dtype=float).reshape(-1, self.fields)
+        if out is None:
+            return values
+
+        out[:len(values)] = values
+        return out[:len(values)]
+
+    # **************************************************************************************************************** #
+    def parse_samples(self, buffer, seconds, since=None):
+        """
+        Samples of the measures found in a buffer, parsed straight into the rows returned
+        :param buffer: complete lines read from serial port
+        :param seconds: arrival time of the buffer [s]
+        :param since: arrival time of the previous buffer [s], the samples are spread in between (see spread)
+        :return: float array of shape (n, 1 + fields): time, then the values
+        """
+        samples = np.empty((buffer.count(b"\n") + 1, 1 + self.fields))
+        samples = samples[:len(self.parse_batch(buffer, out=samples[:, 1:]))]
+        samples[:, 0] = spread(len(samples), seconds, since)
+        return samples
+
+
+########################################################################################################################
+class ValueParser(LineParser):
+    """
+    Parser of a line holding one number between a prefix and a unit, e.g. "1: 12.50 cm". One line is cut with bytes
+    methods, cheaper than the regex, which is only used for buffers of many lines.
+    """
+
+    def __init__(self, prefix=b"", unit=b""):
+        LineParser.__init__(self, pattern=rb"^" + re.escape(prefix) + rb"\s*" + NUMBER + re.escape(unit),
+                            convert=lambda m: (float(m[1]),), fields=1)
+        self.prefix = prefix
+        self.unit = unit
+        self.start = len(prefix)
+
+    # **************************************************************************************************************** #
+    def parse(self, line):
+        """
+        Parse one line
+        :param line: raw line read from serial port
+        :return: (value,) or None if the line does not match the format
+        """
+        head, unit, _ = line.partition(self.unit)
+        if not unit or not head.startswith(self.prefix):
+            return None
+
+        try:
+            return (float(head[self.start:]),)
+        except ValueError:
+            return None
+
+
+########################################################################################################################
+class RowParser:
+    """
+    Bytes-level parser of a row of comma separated numbers, e.g. one row of an AMG8833 frame. Same interface as
+    LineParser, splitting is cheaper than a regex with one group per number.
+    """
+
+    def __init__(self, strip=b"", fields=8):
+        # ------------------------------------------------------------------------------------------------------------ #
+        self.strip = strip
+        self.fields = fields
+        # characters removed to turn a buffer of rows into one comma separated list
+        self.delete = strip.replace(b" ", b"") + b"\r\n"
+
+    # **************************************************************************************************************** #
+    def parse(self, line):
+        """
+        Parse one line
+        :param line: raw line read from serial port
+        :return: tuple of floats or None if the line is not a row
+        """
+        values = line.lstrip(self.strip).split(b",")
+        if len(values) < self.fields:
+            return None
+
+        try:
+            return tuple(map(float, values[:self.fields]))
+        except ValueError:
+            return None
+
+    # **************************************************************************************************************** #
+    def parse_batch(self, buffer, out=None):
+        """
+        Parse every row found in a buffer of many lines, lines which are not rows are skipped
+        :param buffer: raw bytes read from serial port or from a file
+        :param out: optional preallocated float array of shape (>= n, fields) filled in place
+        :return: float array of shape (n, fields), a view of out when it is given
+        """
+        # rows only: NumPy parses the whole buffer at once, every row must give exactly `fields` numbers
+        lines = buffer.count(b"\n") + (not buffer.endswith(b"\n"))
+        try:
+            values = np.fromstring(buffer.translate(None, self.delete).rstrip(b", "), sep=",")
+        except ValueError:
+            values = None
+
+        # other lines or broken rows: row by row
+        if values is None or len(values) != lines * self.fields:
+            rows = [row for row in map(self.parse, buffer.split(b"\n")) if row is not None]
+            values = np.array(rows, dtype=float)
+        values = values.reshape(-1, self.fields)
+        if out is None:
+            return values
+
+        out[:len(values)] = values
+        return out[:len(values)]
+
+
+########################################################################################################################
+# MLX90614: "Ambient = 21.53*C\tObject = 30.25*C"
+MLX90614_CELSIUS = LineParser(pattern=rb"Ambient = " + NUMBER + rb"\*C\s*Object = " + NUMBER + rb"\*C",
+                              convert=lambda m: (float(m[1]), float(m[2])), fields=2)
+MLX90614_FAHRENHEIT = LineParser(pattern=rb"Ambient = " + NUMBER + rb"\*F\s*Object = " + NUMBER + rb"\*F",
+                                 convert=lambda m: (float(m[1]), float(m[2])), fields=2)
+
+# VL53L4CD: "Status =   0, Distance =   123 mm, Signal =    456 kcps/spad"
+VL53L4CD = LineParser(pattern=rb"Status =\s*(\d+),\s*Distance =\s*(\d+) mm,\s*Signal =\s*(\d+) kcps/spad",
+                      convert=lambda m: (int(m[1]), int(m[2]), int(m[3])), fields=3)
+
+# AMG8833, one row of a thermal frame: "[25.00, 25.25, 25.50, 25.00, 24.75, 25.00, 25.25, 25.00, "
+AMG8833_ROW = RowParser(strip=b"[ ", fields=8)
+
+# HC-SR04, sensor 1 only: "1: 12.50 cm"
+HC_SR04 = ValueParser(prefix=b"1:", unit=b" cm")
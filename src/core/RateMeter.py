@@ -0,0 +1,48 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       src\core\RateMeter.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+########################################################################################################################
+
+# custom packages
+from src.core.RingBuffer import RingBuffer
+
+
+########################################################################################################################
+class RateMeter:
+    """
+    Effective sample rate measured on the arrival times of the last `history` samples
+    """
+
+    def __init__(self, history=100):
+        self.times = RingBuffer(capacity=history)
+
+    # **************************************************************************************************************** #
+    def extend(self, times):
+        """
+        :param times: arrival times in s
+        """
+        self.times.extend(times)
+
+    # **************************************************************************************************************** #
+    def rate(self):
+        """
+        :return: samples per second, 0 until two samples with different times are received
+        """
+        times = self.times.view()[0]
+        if len(times) < 2 or times[-1] <= times[0]:
+            return 0.0
+        return (len(times) - 1) / (times[-1] - times[0])
+
+    # **************************************************************************************************************** #
+    def clear(self):
+        self.times.clear()
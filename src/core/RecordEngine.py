@@ -0,0 +1,298 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       src\core\RecordEngine.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+########################################################################################################################
+
+# python packages
+from pathlib import *
+import gzip
+import io
+import queue
+import threading
+import time
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+########################################################################################################################
+class Block:
+    """
+    Samples queued at once by RecordEngine.put_block, split into rows by the writer thread
+    """
+
+    def __init__(self, timestamps, rows):
+        self.timestamps = timestamps
+        self.rows = rows
+
+
+########################################################################################################################
+class RecordEngine:
+    """
+    Buffered CSV writer. Samples are queued with their arrival time (ns since epoch), a background thread
+    formats and writes them by batches and flushes the file every flush_interval seconds.
+    For long runs the log can be split in files of rotate_size bytes (on disk) or rotate_interval seconds and compressed
+    ('gzip', 'zstd' or 'auto' for zstd when installed). Each file starts with the header, dated with its first sample,
+    and can be read on its own:
+        DxSetup_log_20261018-10h00.00_0001.csv.gz, DxSetup_log_20261018-10h00.00_0002.csv.gz, ...
+    After a rotation the next file is only opened with the next sample, a file never holds a header only. Plain files
+    never exceed rotate_size (unless a single batch does); compressed files are checked on disk, they can exceed it by
+    what the compressor still buffers, at most one flush_interval of samples.
+    """
+
+    def __init__(self, filename=None, header=(), date_line=None, columns=1, flush_interval=1.0, max_batch=1000,
+                 rotate_size=None, rotate_interval=None, compression=None):
+        """
+        :param header: lines written at the beginning of every file, after the date line
+        :param date_line: first line of every file, formatted with the local date of its first sample, e.g. "Date, {}"
+        """
+        # ------------------------------------------------------------------------------------------------------------ #
+        self.filename = Path(filename)
+        self.header = "".join(header)
+        self.date_line = date_line
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.rotate_size = rotate_size
+        self.rotate_interval = rotate_interval
+
+        if compression == 'auto':
+            compression = 'zstd' if zstandard is not None else 'gzip'
+        if compression == 'zstd' and zstandard is None:
+            print("[ERR] zstandard package not installed, logs are compressed with gzip")
+            compression = 'gzip'
+        self.compression = compression
+        # time as HH:MM:SS:ffffff, then one field per column
+        self.row_format = "{}:{:06d}" + ", {}" * columns + "\n"
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # time of day is formatted once per second
+        self.last_second = None
+        self.last_second_text = ""
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # output files, bytes are counted on disk (after compression)
+        self.files = []
+        self.bytes_closed = 0
+        # bytes on disk of all files, only updated by the writer thread: bytes_written() never touches the files
+        self.bytes_on_disk = 0
+        self.start = time.monotonic()
+        self.raw = None
+        self.file = None
+        self.file_bytes = 0
+        self.file_samples = 0
+        self.open_file(time.time_ns())
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        self.queue = queue.SimpleQueue()
+        self.samples_written = 0
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    # **************************************************************************************************************** #
+    def next_filename(self, number=None):
+        """
+        :param number: text standing for the file number when rotating, number of the next file if None
+        :return: name of next output file, the base file name when neither rotating nor compressing
+        """
+        name = self.filename
+        if self.rotate_size or self.rotate_interval:
+            if number is None:
+                number = "{:04d}".format(len(self.files) + 1)
+            name = name.with_name("{}_{}{}".format(name.stem, number, name.suffix))
+        if self.compression == 'gzip':
+            name = name.with_name(name.name + ".gz")
+        elif self.compression == 'zstd':
+            name = name.with_name(name.name + ".zst")
+        return name
+
+    # **************************************************************************************************************** #
+    def open_file(self, timestamp):
+        """
+        Open next output file and write the header
+        :param timestamp: time of the first sample of the file in ns since epoch, dates the header
+        """
+        self.files.append(self.next_filename())
+        self.raw = open(self.files[-1], 'wb')
+        if self.compression == 'gzip':
+            stream = gzip.GzipFile(fileobj=self.raw, mode='wb', compresslevel=6)
+        elif self.compression == 'zstd':
+            stream = zstandard.ZstdCompressor().stream_writer(self.raw)
+        else:
+            stream = self.raw
+        self.file = io.TextIOWrapper(stream)
+        self.file_start = time.monotonic()
+
+        header = self.header
+        if self.date_line is not None:
+            date = time.strftime("%Y %m %d - %H:%M:%S", time.localtime(timestamp // 1000000000))
+            header = self.date_line.format(date) + header
+        self.file.write(header)
+        self.file.flush()
+        self.file_bytes = len(header)
+        self.file_samples = 0
+        self.count_bytes()
+
+    # **************************************************************************************************************** #
+    def close_file(self):
+        self.file.close()
+        # gzip does not close the file it writes to
+        self.raw.close()
+        self.bytes_closed += self.files[-1].stat().st_size
+        self.file = None
+        self.count_bytes()
+
+    # **************************************************************************************************************** #
+    def count_bytes(self):
+        """
+        Update the bytes on disk (writer thread), with what is already flushed to the current file
+        """
+        current = self.raw.tell() if self.file is not None else 0
+        self.bytes_on_disk = self.bytes_closed + current
+
+    # **************************************************************************************************************** #
+    def rotate(self):
+        """
+        Close current file (writer thread), the next one is opened with the next sample
+        """
+        self.close_file()
+        print("[INFO] Record file closed: {} ({:.1f} MB/h)".format(self.files[-1], self.bytes_per_hour() / 1e6))
+
+    # **************************************************************************************************************** #
+    def full(self, size):
+        """
+        :param size: bytes of text about to be written
+        :return: True if the current file must be rotated before, files without samples are never rotated
+        """
+        if not self.rotate_size or not self.file_samples:
+            return False
+        if self.compression is None:
+            return self.file_bytes + size > self.rotate_size
+        return self.raw.tell() >= self.rotate_size
+
+    # **************************************************************************************************************** #
+    def saved_to(self):
+        """
+        :return: output file, or first and last ones when rotating
+        """
+        if len(self.files) == 1:
+            return str(self.files[0])
+        return "{} ... {}".format(self.files[0], self.files[-1])
+
+    # **************************************************************************************************************** #
+    def file_pattern(self):
+        """
+        :return: name of the output files, "####" standing for the file number when rotating
+        """
+        return self.next_filename(number="####")
+
+    # **************************************************************************************************************** #
+    def bytes_written(self):
+        """
+        :return: number of bytes written on disk so far, as counted by the writer thread after each write
+        """
+        return self.bytes_on_disk
+
+    # **************************************************************************************************************** #
+    def bytes_per_hour(self):
+        return 3600 * self.bytes_written() / max(time.monotonic() - self.start, 1e-6)
+
+    # **************************************************************************************************************** #
+    def put(self, *values, timestamp=None):
+        """
+        Queue one sample, cheap enough to be called from the acquisition thread
+        :param values: one value per column
+        :param timestamp: arrival time in ns since epoch, now if None
+        """
+        self.queue.put((time.time_ns() if timestamp is None else timestamp, values))
+
+    # **************************************************************************************************************** #
+    def put_block(self, timestamps, rows):
+        """
+        Queue several samples with one call, rows are only split by the writer thread
+        :param timestamps: numpy array of arrival times in ns since epoch
+        :param rows: numpy array of shape (n, columns)
+        """
+        self.queue.put(Block(timestamps, rows))
+
+    # **************************************************************************************************************** #
+    def format_row(self, timestamp, values):
+        second, nanoseconds = divmod(timestamp, 1000000000)
+        if second != self.last_second:
+            self.last_second = second
+            self.last_second_text = time.strftime("%H:%M:%S", time.localtime(second))
+        return self.row_format.format(self.last_second_text, nanoseconds // 1000, *values)
+
+    # **************************************************************************************************************** #
+    def run(self):
+        """
+        Writer loop: wait for samples, write them by batches, flush periodically
+        """
+        running = True
+        next_flush = time.monotonic() + self.flush_interval
+        while running:
+            # -------------------------------------------------------------------------------------------------------- #
+            # collect a batch, waiting at most until next flush
+            batch = []
+            try:
+                item = self.queue.get(timeout=max(next_flush - time.monotonic(), 0.0))
+                while True:
+                    if item is None:
+                        running = False
+                        break
+                    if isinstance(item, Block):
+                        batch.extend(zip(item.timestamps.tolist(), item.rows.tolist()))
+                    else:
+                        batch.append(item)
+                    if len(batch) >= self.max_batch:
+                        break
+                    item = self.queue.get_nowait()
+            except queue.Empty:
+                pass
+
+            # -------------------------------------------------------------------------------------------------------- #
+            # rotation happens here, the acquisition thread only queues samples
+            if batch:
+                text = "".join([self.format_row(timestamp, values) for timestamp, values in batch])
+                if self.file is not None and self.full(len(text)):
+                    self.rotate()
+                if self.file is None:
+                    self.open_file(batch[0][0])
+                self.file.write(text)
+                self.file_bytes += len(text)
+                self.file_samples += len(batch)
+                self.samples_written += len(batch)
+                self.count_bytes()
+
+            if self.file is not None and (time.monotonic() >= next_flush or not running):
+                self.file.flush()
+                self.count_bytes()
+                next_flush = time.monotonic() + self.flush_interval
+
+            # -------------------------------------------------------------------------------------------------------- #
+            if running and self.file is not None and self.file_samples and self.rotate_interval and \
+                    time.monotonic() - self.file_start >= self.rotate_interval:
+                self.rotate()
+
+        if self.file is not None:
+            self.close_file()
+
+    # **************************************************************************************************************** #
+    def close(self):
+        """
+        Write pending samples and close file
+        """
+        self.queue.put(None)
+        self.thread.join()
+        print("[INFO] {} samples, {:.1f} MB in {} file(s), {:.1f} MB/h".format(
+            self.samples_written, self.bytes_written() / 1e6, len(self.files), self.bytes_per_hour() / 1e6))
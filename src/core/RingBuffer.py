@@ -0,0 +1,98 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       src\core\RingBuffer.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+########################################################################################################################
+
+# python packages
+import numpy as np
+
+
+########################################################################################################################
+class RingBuffer:
+    """
+    Fixed-capacity multi-channel ring buffer used for the rolling plot windows.
+    Every sample is written twice (at index i and i + capacity), so the last `capacity` samples are always
+    contiguous in memory: reading the window is a view, appending a sample costs the same whatever the capacity.
+    """
+
+    def __init__(self, capacity=100, channels=1, dtype=float):
+        # ------------------------------------------------------------------------------------------------------------ #
+        self.capacity = max(int(capacity), 1)
+        self.channels = channels
+        # one row per channel, each channel is contiguous
+        self.data = np.zeros((channels, 2 * self.capacity), dtype=dtype)
+        # next index to write and number of valid samples
+        self.head = 0
+        self.count = 0
+
+    # **************************************************************************************************************** #
+    def __len__(self):
+        return self.count
+
+    # **************************************************************************************************************** #
+    def append(self, sample):
+        """
+        Add one sample
+        :param sample: one value per channel
+        """
+        self.data[:, self.head] = sample
+        self.data[:, self.head + self.capacity] = sample
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    # **************************************************************************************************************** #
+    def extend(self, samples):
+        """
+        Add several samples at once, only the newest `capacity` ones are kept
+        :param samples: array-like of shape (n, channels)
+        """
+        block = np.asarray(samples, dtype=self.data.dtype).reshape(-1, self.channels)[-self.capacity:].T
+        n = block.shape[1]
+        if n == 0:
+            return
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # write until end of first half, then wrap around to the beginning
+        first = min(n, self.capacity - self.head)
+        self.data[:, self.head:self.head + first] = block[:, :first]
+        self.data[:, self.head + self.capacity:self.head + self.capacity + first] = block[:, :first]
+
+        rest = n - first
+        if rest:
+            self.data[:, :rest] = block[:, first:]
+            self.data[:, self.capacity:self.capacity + rest] = block[:, first:]
+
+        self.head = (self.head + n) % self.capacity
+        self.count = min(self.count + n, self.capacity)
+
+    # **************************************************************************************************************** #
+    def view(self):
+        """
+        Valid samples, oldest first
+        :return: view of shape (channels, count), no copy
+        """
+        end = self.head + self.capacity
+        return self.data[:, end - self.count:end]
+
+    # **************************************************************************************************************** #
+    def last(self):
+        """
+        Newest sample
+        :return: view with one value per channel
+        """
+        return self.data[:, self.head + self.capacity - 1]
+
+    # **************************************************************************************************************** #
+    def clear(self):
+        self.head = 0
+        self.count = 0
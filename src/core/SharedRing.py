@@ -0,0 +1,126 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       src\core\SharedRing.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+########################################################################################################################
+
+# python packages
+from multiprocessing import shared_memory
+import numpy as np
+
+# two sequence counters at the beginning of the block, samples start on the next cache line
+HEADER_SIZE = 64
+
+
+########################################################################################################################
+class SharedRing:
+    """
+    Ring buffer of samples in shared memory, written by one process and read by another one without any lock.
+    Samples are rows of `channels` float64 and are numbered from 0 (sequence numbers). The writer announces the rows
+    it is about to overwrite (reserved counter), writes them, then publishes them (committed counter). The reader
+    copies the rows committed since its last read and checks the reserved counter afterwards: rows overwritten during
+    the copy are dropped and counted as lost, the reader never sees a half written sample.
+    """
+
+    def __init__(self, capacity=4096, channels=1, name=None):
+        """
+        :param capacity: number of samples kept
+        :param channels: values per sample
+        :param name: name of an existing block to map, a new block is created if None
+        """
+        # ------------------------------------------------------------------------------------------------------------ #
+        self.capacity = int(capacity)
+        self.channels = int(channels)
+        self.owner = name is None
+        size = HEADER_SIZE + self.capacity * self.channels * np.dtype(np.float64).itemsize
+        self.memory = shared_memory.SharedMemory(name=name, create=self.owner, size=size)
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # [committed, reserved] sequence counters, then the samples
+        self.counters = np.ndarray((2,), dtype=np.int64, buffer=self.memory.buf)
+        self.data = np.ndarray((self.capacity, self.channels), dtype=np.float64, buffer=self.memory.buf,
+                               offset=HEADER_SIZE)
+        if self.owner:
+            self.counters[:] = 0
+
+    # **************************************************************************************************************** #
+    @property
+    def name(self):
+        return self.memory.name
+
+    # **************************************************************************************************************** #
+    def extend(self, samples):
+        """
+        Write samples (writer process only), only the newest `capacity` ones are kept
+        :param samples: array-like of shape (n, channels)
+        """
+        block = np.asarray(samples, dtype=np.float64).reshape(-1, self.channels)
+        total = len(block)
+        if total == 0:
+            return
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # samples which do not fit are numbered anyway, the reader counts them as lost
+        block = block[-self.capacity:]
+        n = len(block)
+        sequence = int(self.counters[0]) + total - n
+        self.counters[1] = sequence + n
+
+        start = sequence % self.capacity
+        first = min(n, self.capacity - start)
+        self.data[start:start + first] = block[:first]
+        self.data[:n - first] = block[first:]
+
+        self.counters[0] = sequence + n
+
+    # **************************************************************************************************************** #
+    def read(self, position):
+        """
+        Copy samples committed since `position` (reader process). The copy is deliberate: the recorder formats rows
+        later in its own thread and the writer may overwrite the ring meanwhile, so the rows are copied once, checked
+        against the reserved counter, and this copy is shared by the recorder and the views
+        :param position: sequence number of the next sample to read
+        :return: (samples of shape (n, channels), next position, number of samples lost)
+        """
+        committed = int(self.counters[0])
+        # samples already overwritten are skipped
+        lost = max(committed - position - self.capacity, 0)
+        position += lost
+        if committed == position:
+            return self.data[:0].copy(), position, lost
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # at most two contiguous slices, the second one when the samples wrap around the end of the ring
+        start = position % self.capacity
+        end = start + committed - position
+        if end <= self.capacity:
+            samples = self.data[start:end].copy()
+        else:
+            samples = np.concatenate((self.data[start:], self.data[:end - self.capacity]))
+
+        # samples overwritten by the writer during the copy
+        overwritten = min(int(self.counters[1]) - self.capacity - position, committed - position)
+        if overwritten > 0:
+            samples = samples[overwritten:]
+            lost += overwritten
+
+        return samples, committed, lost
+
+    # **************************************************************************************************************** #
+    def close(self):
+        """
+        Unmap the block, the creator also frees it
+        """
+        del self.counters, self.data
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
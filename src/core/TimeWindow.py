@@ -0,0 +1,106 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       src\core\TimeWindow.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+########################################################################################################################
+
+# python packages
+import numpy as np
+# custom packages
+from src.core.RingBuffer import RingBuffer
+
+# largest number of samples kept for one plot window, 1000 s at 1 kHz
+MAX_CAPACITY = 1 << 20
+
+
+########################################################################################################################
+class TimeWindow:
+    """
+    Rolling plot window of a fixed duration. Samples are kept in a RingBuffer whose first channel is the time basis:
+    the buffer starts at the size given by the expected rate and doubles whenever it is full of samples younger than
+    the duration, so the window holds `duration` seconds whatever the real rate of the sensor (up to MAX_CAPACITY
+    samples). view() only returns the samples of the last `duration` seconds.
+    """
+
+    def __init__(self, duration, capacity=100, channels=2, max_capacity=MAX_CAPACITY):
+        """
+        :param duration: seconds shown in the plot
+        :param capacity: initial number of samples, e.g. duration / expected period
+        :param channels: time basis + values
+        :param max_capacity: the buffer never grows beyond this number of samples
+        """
+        self.duration = duration
+        self.max_capacity = max(int(max_capacity), 1)
+        self.buffer = RingBuffer(capacity=min(max(int(capacity), 1), self.max_capacity), channels=channels)
+
+    # **************************************************************************************************************** #
+    def __len__(self):
+        return len(self.buffer)
+
+    # **************************************************************************************************************** #
+    def extend(self, samples):
+        """
+        Add several samples at once, growing the buffer if they would push out samples still in the window
+        :param samples: array of shape (n, channels), time in the first column, increasing
+        """
+        samples = np.asarray(samples, dtype=float).reshape(-1, self.buffer.channels)
+        if len(samples) == 0:
+            return
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # oldest sample kept after this block must be older than the window, else the buffer is too small
+        start = samples[-1, 0] - self.duration
+        capacity = self.buffer.capacity
+        while capacity < self.max_capacity and self.oldest_kept(samples, capacity) > start:
+            capacity = min(2 * capacity, self.max_capacity)
+        if capacity != self.buffer.capacity:
+            buffer = RingBuffer(capacity=capacity, channels=self.buffer.channels)
+            buffer.extend(self.buffer.view().T)
+            self.buffer = buffer
+        self.buffer.extend(samples)
+
+    # **************************************************************************************************************** #
+    def oldest_kept(self, samples, capacity):
+        """
+        Time of the oldest sample left in a buffer of `capacity` samples once `samples` are appended
+        :return: time, -inf if nothing is pushed out
+        """
+        stored = len(self.buffer)
+        if stored + len(samples) <= capacity:
+            return -np.inf
+        if len(samples) >= capacity:
+            return samples[-capacity, 0]
+        return self.buffer.view()[0, stored + len(samples) - capacity]
+
+    # **************************************************************************************************************** #
+    def view(self):
+        """
+        Samples of the last `duration` seconds, oldest first
+        :return: view of shape (channels, n), no copy
+        """
+        data = self.buffer.view()
+        if data.shape[1] == 0:
+            return data
+        first = np.searchsorted(data[0], data[0, -1] - self.duration, side='left')
+        return data[:, first:]
+
+    # **************************************************************************************************************** #
+    def last(self):
+        """
+        Newest sample
+        :return: view with one value per channel
+        """
+        return self.buffer.last()
+
+    # **************************************************************************************************************** #
+    def clear(self):
+        self.buffer.clear()
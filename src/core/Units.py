@@ -0,0 +1,45 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       src\core\Units.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+#
+# Durations and sizes typed by the user, on command line or in the dialog. No dependency: the dialog imports this
+# module at startup
+########################################################################################################################
+
+DURATION_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+SIZE_UNITS = {'k': 1e3, 'm': 1e6, 'g': 1e9}
+
+
+########################################################################################################################
+def parse_duration(text):
+    """
+    Duration given on command line
+    :param text: e.g. "90", "45s", "30m", "8h", "2d"
+    :return: duration in seconds
+    """
+    text = text.strip().lower()
+    if text[-1:] in DURATION_UNITS:
+        return float(text[:-1]) * DURATION_UNITS[text[-1]]
+    return float(text)
+
+
+def parse_size(text):
+    """
+    File size given on command line
+    :param text: e.g. "500000", "200k", "100M", "1G"
+    :return: size in bytes
+    """
+    text = text.strip().lower()
+    if text[-1:] in SIZE_UNITS:
+        return int(float(text[:-1]) * SIZE_UNITS[text[-1]])
+    return int(text)
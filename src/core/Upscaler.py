@@ -0,0 +1,87 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       src\core\Upscaler.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+########################################################################################################################
+
+# python packages
+from functools import lru_cache
+import numpy as np
+
+
+########################################################################################################################
+def cubic_kernel(t, a=-0.5):
+    """
+    Keys cubic convolution kernel (a = -0.5 is the usual bicubic)
+    """
+    t = np.abs(t)
+    return np.where(t <= 1, (a + 2) * t ** 3 - (a + 3) * t ** 2 + 1,
+                    np.where(t < 2, a * t ** 3 - 5 * a * t ** 2 + 8 * a * t - 4 * a, 0.0))
+
+
+# ******************************************************************************************************************** #
+@lru_cache(maxsize=None)
+def interpolation_matrix(n_in=8, n_out=64, method='bicubic'):
+    """
+    1D interpolation operator, computed once per size and method
+    :param n_in: number of input samples
+    :param n_out: number of output samples, first and last ones aligned on the input ones
+    :param method: 'bilinear' or 'bicubic'
+    :return: read-only float32 matrix M of shape (n_out, n_in), y = M @ x
+    """
+    x = np.linspace(0, n_in - 1, n_out)
+    rows = np.arange(n_out)
+    matrix = np.zeros((n_out, n_in), dtype=np.float64)
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+    if method == 'bilinear':
+        i0 = np.clip(np.floor(x).astype(int), 0, n_in - 2)
+        w = x - i0
+        matrix[rows, i0] += 1 - w
+        matrix[rows, i0 + 1] += w
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+    # bicubic: 4 neighbours, edges are replicated
+    elif method == 'bicubic':
+        i0 = np.floor(x).astype(int)
+        for k in range(-1, 3):
+            idx = i0 + k
+            np.add.at(matrix, (rows, np.clip(idx, 0, n_in - 1)), cubic_kernel(x - idx))
+
+    else:
+        raise ValueError("unknown interpolation method: {}".format(method))
+
+    matrix = matrix.astype(np.float32)
+    matrix.setflags(write=False)
+    return matrix
+
+
+########################################################################################################################
+class Upscaler:
+    """
+    Separable 2D interpolation of a small frame: out = A @ frame @ B.T, with A and B computed once per output size.
+    """
+
+    def __init__(self, in_shape=(8, 8), out_shape=(64, 64), method='bicubic'):
+        # ------------------------------------------------------------------------------------------------------------ #
+        self.out_shape = out_shape
+        self.rows = interpolation_matrix(in_shape[0], out_shape[0], method)
+        self.cols_t = np.ascontiguousarray(interpolation_matrix(in_shape[1], out_shape[1], method).T)
+
+    # **************************************************************************************************************** #
+    def apply(self, frame):
+        """
+        Upscale one frame
+        :param frame: array of shape in_shape
+        :return: float32 array of shape out_shape
+        """
+        return self.rows @ np.asarray(frame, dtype=np.float32) @ self.cols_t
@@ -14,35 +14,119 @@
 ########################################################################################################################
 
 # python packages
+from datetime import *
+from pathlib import *
 from PyQt6.QtCore import *
 from PyQt6.QtWidgets import *
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from serial import *
-import sys
+import pyqtgraph as pg
+import time
+# custom packages
+from src.acquisition.AMG8833 import AMG8833Acquisition
+from src.comm.SampleBridge import SampleBridge
+from src.comm.Transport import open_reader
+from src.core.Metrics import Metrics
+from src.core.RateMeter import RateMeter
+from src.core.Upscaler import Upscaler
+
+pg.setConfigOption('background', 'w')
+pg.setConfigOption('foreground', 'k')
 
 
 ########################################################################################################################
-class MplCanvas(FigureCanvas):
-    def __init__(self, t_min=None, t_max=None):
+class ThermalCanvas(QWidget):
+    """
+    Thermal image drawn by a pyqtgraph ImageItem. The colour LUT and the temperature levels are computed once, only
+    the image data are pushed for every frame. Frames are optionally upscaled ('bilinear' or 'bicubic') to a smooth
+    size x size heatmap.
+    """
+
+    def __init__(self, parent=None, t_min=None, t_max=None, display='raw', size=64):
+        QWidget.__init__(self, parent=parent)
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        self.t_min = t_min
+        self.t_max = t_max
+        self.frame = np.zeros((8, 8), dtype=np.float32)  # set array with zeros first
+
+        # interpolation operator computed once for the chosen size
+        self.upscaler = None
+        if display in ('bilinear', 'bicubic'):
+            self.upscaler = Upscaler(out_shape=(size, size), method=display)
+
         # ------------------------------------------------------------------------------------------------------------ #
         # Start and Format Figure
-        plt.rcParams.update({'font.size': 16})
-        fig_dims = (12, 9)  # figure size
-        self.fig, self. ax = plt.subplots(figsize=fig_dims)  # start figure
-        pix_res = (8, 8)  # pixel resolution
-        zz = np.zeros(pix_res)  # set array with zeros first
-        self.im1 = self.ax.imshow(zz, vmin=t_min, vmax=t_max)  # plot image, with temperature bounds
-        cbar = self.fig.colorbar(self.im1, fraction=0.0475, pad=0.03)  # colorbar
-        cbar.set_label('Temperature [C]', labelpad=10)  # temp. label
+        graphics_layout = pg.GraphicsLayoutWidget(show=True)
+        view = graphics_layout.addViewBox(lockAspect=True)
+        view.setMouseEnabled(x=False, y=False)
+        # row 0 on top, as a matrix
+        view.invertY(True)
+
+        # image with fixed temperature bounds and precomputed colour LUT
+        self.colormap = pg.colormap.get('viridis')
+        self.image = pg.ImageItem(self.display_data(self.frame), axisOrder='row-major')
+        self.image.setLookupTable(self.colormap.getLookupTable(nPts=256))
+        self.image.setLevels((t_min, t_max))
+        # image always covers the 8x8 sensor pixels, whatever the display size
+        self.image.setRect(QRectF(0, 0, 8, 8))
+        view.addItem(self.image)
 
-        super(MplCanvas, self).__init__(self.fig)
+        # colorbar
+        colorbar = pg.ColorBarItem(values=(t_min, t_max), colorMap=self.colormap, interactive=False,
+                                   label='Temperature [C]')
+        graphics_layout.addItem(colorbar)
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # frame rate displayed, refreshed every second
+        self.fps_label = QLabel("FPS: -")
+        self.fps_count = 0
+        self.fps_time = time.perf_counter()
+        self.fps_timer = QTimer(self)
+        self.fps_timer.timeout.connect(self.update_fps)
+        self.fps_timer.start(1000)
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        main_layout = QVBoxLayout(self)
+        main_layout.setSpacing(3)
+        main_layout.addWidget(graphics_layout)
+        main_layout.addWidget(self.fps_label)
+
+    # **************************************************************************************************************** #
+    def display_data(self, frame):
+        if self.upscaler is None:
+            return frame
+        return self.upscaler.apply(frame)
 
     # **************************************************************************************************************** #
     def update_data(self, new_data):
-        self.im1.set_data(new_data)
-        self.fig.canvas.draw_idle()
+        self.frame = new_data
+        self.image.setImage(self.display_data(new_data), autoLevels=False)
+        self.fps_count += 1
+
+    # **************************************************************************************************************** #
+    def update_fps(self):
+        now = time.perf_counter()
+        self.fps_label.setText("FPS: {:.1f}".format(self.fps_count / (now - self.fps_time)))
+        self.fps_count = 0
+        self.fps_time = now
+
+    # **************************************************************************************************************** #
+    def export_image(self, filename):
+        """
+        Save current frame with matplotlib, only imported when an export is requested
+        :param filename: path of the image
+        """
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+
+        plt.rcParams.update({'font.size': 16})
+        fig, ax = plt.subplots(figsize=(12, 9))
+        im = ax.imshow(self.frame, vmin=self.t_min, vmax=self.t_max)
+        cbar = fig.colorbar(im, fraction=0.0475, pad=0.03)
+        cbar.set_label('Temperature [C]', labelpad=10)
+        fig.savefig(filename)
+        plt.close(fig)
 
 
 ########################################################################################################################
@@ -51,123 +135,125 @@ class pixel_test(QWidget):
         QWidget.__init__(self, parent=parent)
 
         # ------------------------------------------------------------------------------------------------------------ #
-        self.data = None
         self.parameters = settings
-        self.cnt_line = 0
-        self.data_tab = []
-        self.total_data = None
-        self.total_data_float = None
 
         # ------------------------------------------------------------------------------------------------------------ #
-        # SERIAL COMMUNICATION
-        # open serial port
-        try:
-            self.ser = Serial(self.parameters['com_port'], 9600, timeout=0.5)
-        except Exception as err_com_port:
-            print("[ERR.] Please make sure than you use the right COM port: {}".format(err_com_port))
-            sys.exit(-1)
+        # ACQUISITION
+        # frames are assembled by the GUI-free acquisition core, outside of the GUI loop, and come back to the GUI
+        # through the bridge
+        # optional instrumentation of acquisition and display, None when disabled
+        self.metrics = Metrics() if self.parameters.get('metrics') else None
+        self.acquisition = AMG8833Acquisition(settings=self.parameters, metrics=self.metrics)
+        self.bridge = SampleBridge()
+        self.bridge.samples_ready.connect(self.update_view)
+        self.reader = open_reader(settings=self.parameters, baudrate=self.acquisition.baudrate,
+                                  parser=self.acquisition.handle_chunk, sink=self.bridge.push,
+                                  metrics=self.metrics, acquisition=self.acquisition)
 
-        # ------------------------------------------------------------------------------------------------------------ #
-        # remove old data in input buffer
-        self.ser.reset_input_buffer()
+        self.canvas = ThermalCanvas(t_min=self.parameters['t_min'], t_max=self.parameters['t_max'],
+                                    display=self.parameters['display'], size=self.parameters['display_size'])
 
-        # ------------------------------------------------------------------------------------------------------------ #
-        # Read a first time to ensure connection (?)
-        self.ser.readline()
-
-        # ------------------------------------------------------------------------------------------------------------ #
-        # read from serial
-        try:
-            self.ser.readline()
-        except Exception as e:
-            print("[ERR] unable to read line: {}".format(e))
-            self.try_reconnect()
-            return
-
-        self.canvas = MplCanvas(t_min=self.parameters['t_min'], t_max=self.parameters['t_max'])
+        # frame rate of the sensor, measured on the arrival times of the frames (the canvas shows the display rate)
+        self.rate_meter = RateMeter(history=20)
+        self.rate_label = QLabel("Sensor rate: -")
+        # newest frame, drawn by the render loop
+        self.frame = None
+        self.dirty = False
 
     # ****************************************************************************************************************
     def init_vi(self):
         """
         Initialise VI
         """
-        layout_main = QHBoxLayout()
+        # export of current frame (matplotlib)
+        export_button = QPushButton("Save image")
+        export_button.setFixedWidth(100)
+        export_button.clicked.connect(self.export_image)
+
+        layout_main = QVBoxLayout()
         layout_main.setSpacing(0)
         layout_main.addWidget(self.canvas)
-        layout_main.setAlignment(Qt.AlignmentFlag.AlignLeft)
-        layout_main.addStretch(1)
+        layout_main.addWidget(self.rate_label)
+        layout_main.addWidget(export_button)
 
         self.setLayout(layout_main)
 
     # **************************************************************************************************************** #
-    def data_reader_callback(self):
+    def export_image(self):
         """
-        callback function
+        Save current thermal image to logs folder
         """
-        # ------------------------------------------------------------------------------------------------------------ #
-        # read from serial
+        folder = Path("logs")
+        folder.mkdir(parents=True, exist_ok=True)
+        filename = folder.joinpath("ThermalCam_{}.png".format(datetime.now().strftime("%Y%m%d-%Hh%M.%S")))
+
         try:
-            line = self.ser.readline()
-            line = line.decode("utf-8")
-            line = line.replace("\n", "")
+            self.canvas.export_image(filename)
+            print("[INFO] Image saved to: {}".format(filename))
         except Exception as e:
-            print("[ERR] unable to read line: {}".format(e))
-            self.try_reconnect()
-            return
+            print("[ERR] Unable to save image: {}".format(e))
 
-        # -------------------------------------------------------------------------------------------------------- #
-        # handle data
-        # Remove units, spaces, split with coma
-        # Refer to documentation of HVPS to assign data to fields
-        if line.startswith("AMG88xx") or line.startswith("--") or line.startswith("]") or line == "\r":
-            return
+    # **************************************************************************************************************** #
+    def start_comm(self):
+        """
+        Start acquisition
+        """
+        self.reader.start()
+
+    # **************************************************************************************************************** #
+    # CALLBACK (GUI thread)
+    def update_view(self, frames):
+        """
+        Keep newest frame, the thermal image is refreshed by render()
+        :param frames: list of (time, 8x8 temperature matrix) received since last update, only the newest one is shown,
+                       or array with one row per frame (time, then the flattened matrix) from the 'process' transport
+        """
+        if self.metrics is not None:
+            self.metrics.event('update_view')
+
+        if isinstance(frames, np.ndarray):
+            self.rate_meter.extend(frames[:, 0])
+            self.frame = frames[-1, 1:].astype(np.float32).reshape(self.acquisition.sample_shape)
         else:
+            self.rate_meter.extend([frame[0] for frame in frames])
+            self.frame = frames[-1][1]
+        self.dirty = True
 
-            if self.cnt_line == 0:
-                self.data_tab = []
-                self.total_data = None
-                self.total_data_float = None
-                self.data = (line.replace("[", "").replace("\n", "").split(", "))
-                self.data.remove('\r')
-                self.total_data = self.data
-                self.cnt_line += 1
-            elif 0 < self.cnt_line < 7:
-                self.data = (line.replace("[", "").replace("\n", "").split(", "))
-                self.data.remove('\r')
-                self.total_data += self.data
-                self.cnt_line += 1
-            else:
-                self.cnt_line = 0
-                self.data = (line.replace("[", "").replace("\r", "").replace("\n", "").split(", "))
-                self.data.remove('')
-                self.total_data += self.data
-
-                if self.parameters['debug']:
-                    print("[TAB] {}".format(self.total_data))
-
-                # UPDATE FIGURE
-                # Convertir en une matrice 8x8
-                new_data_matrix = np.array(self.total_data, dtype=float).reshape(8, 8)
-
-                self.canvas.update_data(new_data_matrix)
+    # **************************************************************************************************************** #
+    # CALLBACK (render loop, GUI thread)
+    def render(self):
+        """
+        Refresh thermal image, only if a frame was received since last frame of the render loop
+        """
+        # every frame of the render loop, for the jitter of the loop
+        if self.metrics is not None:
+            self.metrics.event('render')
+        if not self.dirty:
+            return
+        self.dirty = False
+
+        metrics = self.metrics
+        if metrics is not None:
+            start = metrics.clock()
+
+        self.canvas.update_data(self.frame)
+        self.rate_label.setText("Sensor rate: {:.1f} Hz".format(self.rate_meter.rate()))
+
+        if metrics is not None:
+            metrics.record('display', start)
 
     # **************************************************************************************************************** #
-    def try_reconnect(self):
+    def reset_view(self):
         """
-        Reconnection with board
+        Forget the frames received so far, e.g. when a replay goes back in time
         """
-        self.ser.close()
-        try:
-            self.ser.open()
-            self.ser.reset_input_buffer()
-            print("[INFO] reconnected to the board")
-        except Exception as err_connection:
-            print("[ERR] connection failed: {}".format(err_connection))
-            pass
+        self.bridge.clear()
+        self.rate_meter.clear()
 
     # **************************************************************************************************************** #
     def stop_comm(self):
         """
         Stop communication and recording
         """
-        return
+        self.reader.stop()
+        self.acquisition.stop()
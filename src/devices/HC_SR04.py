@@ -16,10 +16,14 @@
 # python packages
 from PyQt6.QtWidgets import *
 import numpy as np
-from serial import *
-import sys
 # custom packages
-from src.options.Dx2Record import Dx2Record
+from src.acquisition.HC_SR04 import HCSR04Acquisition
+from src.comm.SampleBridge import SampleBridge
+from src.comm.Transport import open_reader
+from src.core.HistoryStore import HistoryStore
+from src.core.Metrics import Metrics
+from src.core.RateMeter import RateMeter
+from src.core.TimeWindow import TimeWindow
 from src.plots.Dx2Plot import Dx2Plot
 
 
@@ -29,51 +33,38 @@ class HC_SR04_Simple(QWidget):
         QWidget.__init__(self, parent=parent)
 
         # ------------------------------------------------------------------------------------------------------------ #
-        self.data = None
         self.settings = settings
         self.estimateRate = estimate_rate
 
         # ------------------------------------------------------------------------------------------------------------ #
         # TEMP. PLOTS
-        self.distance_plot = Dx2Plot(tittle="Distance", y_max=40)
-        # init data arrays + time basis,...
-        self.tplot = np.arange(-40 * self.estimateRate, 0.0, self.estimateRate, dtype=float)
-        self.t_save = np.zeros(40, dtype=int)
-
-        self.distance = np.zeros(40, dtype=float)
+        self.distance_plot = Dx2Plot(tittle="Distance", y_max=40, high_rate=self.settings['high_rate'])
+        # init rolling window: time basis, distance
+        # time axis starts with the arrival of the first sample
+        self.t0 = None
+        self.rate_meter = RateMeter()
+        self.rate_label = QLabel("Measured rate: -")
+        self.window = TimeWindow(duration=self.settings['window'], capacity=self.settings['window'] / self.estimateRate,
+                                 channels=2)
+        # samples received since last frame of the render loop
+        self.dirty = False
+        # whole run, shown when zooming out or panning: time basis, distance
+        self.history = HistoryStore(values=1)
+        self.distance_plot.set_history(self.history, column=0)
         self.distance_now = []
 
         # ------------------------------------------------------------------------------------------------------------ #
-        # SERIAL COMMUNICATION
-        # open serial port
-        try:
-            self.ser = Serial(self.settings['com_port'], 9600, timeout=0.5)
-        except Exception as err_com_port:
-            print("[ERR.] Please make sure than you use the right COM port: {}".format(err_com_port))
-            sys.exit(-1)
-        # ------------------------------------------------------------------------------------------------------------ #
-        # remove old data in input buffer
-        self.ser.reset_input_buffer()
-
-        # ------------------------------------------------------------------------------------------------------------ #
-        # Read a first time to ensure connection (?)
-        line = self.ser.readline()
-        line.decode("utf-8")
-
-        # ------------------------------------------------------------------------------------------------------------ #
-        # read from serial
-        try:
-            line = self.ser.readline()
-            line.decode("utf-8")
-        except Exception as e:
-            print("[ERR] unable to read line: {}".format(e))
-            self.try_reconnect()
-            return
-
-        # ------------------------------------------------------------------------------------------------------------ #
-        # init file to record data
-        if self.settings['record']:
-            self.RecordData = Dx2Record(port_name=self.settings['com_port'])
+        # ACQUISITION
+        # lines are parsed and recorded by the GUI-free acquisition core, outside of the GUI loop, samples come back
+        # to the GUI through the bridge
+        # optional instrumentation of acquisition and display, None when disabled
+        self.metrics = Metrics() if self.settings.get('metrics') else None
+        self.acquisition = HCSR04Acquisition(settings=self.settings, metrics=self.metrics)
+        self.bridge = SampleBridge()
+        self.bridge.samples_ready.connect(self.update_view)
+        self.reader = open_reader(settings=self.settings, baudrate=self.acquisition.baudrate,
+                                  parser=self.acquisition.handle_chunk, sink=self.bridge.push,
+                                  metrics=self.metrics, acquisition=self.acquisition)
 
     # **************************************************************************************************************** #
     def init_vi(self):
@@ -82,95 +73,98 @@ class HC_SR04_Simple(QWidget):
         """
         layout_main = QVBoxLayout()
         layout_main.addWidget(self.distance_plot)
+        layout_main.addWidget(self.rate_label)
         if self.settings['record']:
-            layout_main.addWidget(self.RecordData)
+            # files of a rotated log are numbered as they are opened
+            saving_to = self.acquisition.RecordData.engine.file_pattern().as_posix()
+            layout_main.addWidget(QLabel("Saving file to: {}".format(saving_to)))
 
         layout_main.setSpacing(3)
         layout_main.addStretch(1)
         self.setLayout(layout_main)
 
     # **************************************************************************************************************** #
-    def data_reader_callback(self):
+    def start_comm(self):
         """
-        callback function
+        Start acquisition
         """
-        # ------------------------------------------------------------------------------------------------------------ #
-        # shift data in the array one sample left
-        self.tplot[:-1] = self.tplot[1:]
-        self.tplot[-1] = self.tplot[-2] + self.estimateRate
-        self.distance[:-1] = self.distance[1:]
+        self.reader.start()
 
-        # ------------------------------------------------------------------------------------------------------------ #
-        # read from serial
-        while 1:
-            try:
-                line = self.ser.readline()
-            except Exception as err_reading:
-                self.try_reconnect()
-                line = b""
-                print(f"[ERR] reading failed: {err_reading}")
-
-            new_line = line.decode("utf-8")
-
-            if new_line.startswith("1:"):
-                break
-
-        try:
-            new_line = new_line.replace("\n", "")
-            if (self.settings['debug']) and (new_line != "\r"):
-                print("[DBG] {}".format(new_line))
-        except Exception as e:
-            print("[ERR] unable to read line: {}".format(e))
-            self.try_reconnect()
-            return
+    # **************************************************************************************************************** #
+    # CALLBACK (GUI thread)
+    def update_view(self, samples):
+        """
+        Append parsed samples to the rolling window and history, plots/labels are refreshed by render()
+        :param samples: list or array of rows (time, distance) received since last update
+        """
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.event('update_view')
+            start = metrics.clock()
 
         # ------------------------------------------------------------------------------------------------------------ #
-        # handle data
-        # Remove units, spaces, split with coma
-        # Refer to documentation of HVPS to assign data to fields
-        self.data = (new_line.replace("1: ", "").replace(" cm", "")
-                     .replace("\t", "").replace("\r\n", ""))
-
-        try:
-            self.distance[-1] = float(self.data)
-            self.distance_now = format(float(self.data))
-        except Exception as e:
-            print("[ERR] Unable to convert line: {} - {}".format(new_line, e))
+        # every sample goes to the history, only the newest ones fit in the plot window
+        samples = np.asarray(samples, dtype=float)
 
         # ------------------------------------------------------------------------------------------------------------ #
-        # UPDATE PLOTS/LABELS
-        self.distance_plot.update_plot(t=self.tplot, y=self.distance)
-        self.distance_plot.update_label(label=self.distance_now)
+        # append samples to the rolling window, with their arrival times
+        if self.t0 is None:
+            self.t0 = samples[0, 0]
+        t = samples[:, 0] - self.t0
+        self.rate_meter.extend(samples[:, 0])
+        self.window.extend(np.column_stack((t, samples[:, 1])))
+        self.history.extend(np.column_stack((t, samples[:, 1])))
 
-        # ------------------------------------------------------------------------------------------------------------ #
-        # save data to file
-        if self.settings['record']:
-            self.RecordData.save_data(distance=self.distance[-1])
+        self.distance_now = format(self.window.last()[1])
+
+        self.dirty = True
+        if metrics is not None:
+            metrics.record('window', start)
+
+    # **************************************************************************************************************** #
+    # CALLBACK (render loop, GUI thread)
+    def render(self):
+        """
+        Refresh plots and labels, only if samples were received since last frame
+        """
+        # every frame of the render loop, for the jitter of the loop
+        if self.metrics is not None:
+            self.metrics.event('render')
+        if not self.dirty:
+            return
+        self.dirty = False
 
         # ------------------------------------------------------------------------------------------------------------ #
-        # flush input if too much data not handled: avoid keeping very old values
-        if self.ser.in_waiting > 200:
-            # print(self.ser.in_waiting)
-            self.ser.reset_input_buffer()
+        # UPDATE PLOTS/LABELS
+        metrics = self.metrics
+        if metrics is not None:
+            start = metrics.clock()
+        tplot, distance = self.window.view()
+        self.distance_plot.update_plot(t=tplot, y=distance)
+        if metrics is not None:
+            metrics.record('plot', start)
+            start = metrics.clock()
+        self.distance_plot.update_label(label=self.distance_now)
+        self.rate_label.setText("Measured rate: {:.2f} Hz".format(self.rate_meter.rate()))
+        if metrics is not None:
+            metrics.record('label', start)
 
     # **************************************************************************************************************** #
-    def try_reconnect(self):
+    def reset_view(self):
         """
-        Reconnection with board
+        Forget the samples shown so far, e.g. when a replay goes back in time: window and history must stay sorted
         """
-        self.ser.close()
-        try:
-            self.ser.open()
-            self.ser.reset_input_buffer()
-            print("[INFO] reconnected to the board")
-        except Exception as err_connection:
-            print("[ERR] connection failed: {}".format(err_connection))
-            pass
+        self.bridge.clear()
+        self.t0 = None
+        self.window.clear()
+        self.history.clear()
+        self.rate_meter.clear()
+        self.dirty = True
 
     # **************************************************************************************************************** #
     def stop_comm(self):
         """
         Stop communication and recording
         """
-        if self.settings['record']:
-            self.RecordData.close_record()
+        self.reader.stop()
+        self.acquisition.stop()
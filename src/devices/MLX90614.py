@@ -16,10 +16,14 @@
 # python packages
 from PyQt6.QtWidgets import *
 import numpy as np
-from serial import *
-import sys
 # custom packages
-from src.options.Temp2Record import Temp2Record
+from src.acquisition.MLX90614 import MLX90614Acquisition
+from src.comm.SampleBridge import SampleBridge
+from src.comm.Transport import open_reader
+from src.core.HistoryStore import HistoryStore
+from src.core.Metrics import Metrics
+from src.core.RateMeter import RateMeter
+from src.core.TimeWindow import TimeWindow
 from src.plots.Temp2Plot import Temp2Plot
 
 
@@ -29,63 +33,42 @@ class mlxtest(QWidget):
         QWidget.__init__(self, parent=parent)
 
         # ------------------------------------------------------------------------------------------------------------ #
-        self.data = None
         self.settings = settings
         self.estimateRate = estimate_rate
 
         # ------------------------------------------------------------------------------------------------------------ #
         # TEMP. PLOTS
-        self.temp_plot = Temp2Plot(plot_tittle="Temp. Monitor", scale=self.settings['scales'])
-
-        size = 0
-        if self.estimateRate == 0.5:
-            size = 20
-        elif self.estimateRate == 0.1:
-            size = 100
-
-        # init data arrays + time basis,...
-        self.tplot = np.arange(-size * self.estimateRate, 0.0, self.estimateRate, dtype=float)
-        self.t_save = np.zeros(size, dtype=int)
-        # Low Voltage set by user
-        self.temp_ambient = np.zeros(size, dtype=float)
+        self.temp_plot = Temp2Plot(plot_tittle="Temp. Monitor", scale=self.settings['scales'],
+                                   high_rate=self.settings['high_rate'])
+
+        # init rolling window: time basis, ambient, object, error
+        # time axis starts with the arrival of the first sample
+        self.t0 = None
+        self.rate_meter = RateMeter()
+        self.rate_label = QLabel("Measured rate: -")
+        self.window = TimeWindow(duration=self.settings['window'], capacity=self.settings['window'] / self.estimateRate,
+                                 channels=4)
+        # samples received since last frame of the render loop
+        self.dirty = False
+        # whole run, shown when zooming out or panning: time basis, ambient, object
+        self.history = HistoryStore(values=2)
+        self.temp_plot.set_history(self.history, columns=(0, 1))
         self.temp_ambient_now = []
-        # Low Voltage monitor
-        self.temp_object = np.zeros(size, dtype=float)
         self.temp_object_now = []
-        # High Voltage error
-        self.temp_err = np.zeros(size, dtype=float)
         self.temp_err_now = []
 
         # ------------------------------------------------------------------------------------------------------------ #
-        # SERIAL COMMUNICATION
-        # open serial port
-        try:
-            self.ser = Serial(self.settings['com_port'], 9600, timeout=0.5)
-        except Exception as err_com_port:
-            print("[ERR.] Please make sure than you use the right COM port: {}".format(err_com_port))
-            sys.exit(-1)
-        # ------------------------------------------------------------------------------------------------------------ #
-        # remove old data in input buffer
-        self.ser.reset_input_buffer()
-
-        # ------------------------------------------------------------------------------------------------------------ #
-        # Read a first time to ensure connection (?)
-        line = self.ser.readline()
-        line.decode("utf-8")
-
-        # read from serial
-        try:
-            line = self.ser.readline()
-            line.decode("utf-8")
-        except Exception as e:
-            print("[ERR] unable to read line: {}".format(e))
-            self.try_reconnect()
-            return
-
-        # ------------------------------------------------------------------------------------------------------------ #
-        # init file to record data
-        if self.settings['record']:
-            self.RecordData = Temp2Record(parameters=self.settings)
+        # ACQUISITION
+        # lines are parsed and recorded by the GUI-free acquisition core, outside of the GUI loop, samples come back
+        # to the GUI through the bridge
+        # optional instrumentation of acquisition and display, None when disabled
+        self.metrics = Metrics() if self.settings.get('metrics') else None
+        self.acquisition = MLX90614Acquisition(settings=self.settings, metrics=self.metrics)
+        self.bridge = SampleBridge()
+        self.bridge.samples_ready.connect(self.update_view)
+        self.reader = open_reader(settings=self.settings, baudrate=self.acquisition.baudrate,
+                                  parser=self.acquisition.handle_chunk, sink=self.bridge.push,
+                                  metrics=self.metrics, acquisition=self.acquisition)
 
     # **************************************************************************************************************** #
     def init_vi(self):
@@ -98,97 +81,97 @@ class mlxtest(QWidget):
         # ************************************************************************************************************ #
         # add top layout to main layout
         layout_main.addWidget(self.temp_plot)
+        layout_main.addWidget(self.rate_label)
 
         # ************************************************************************************************************ #
         # Layout of all widgets not plot
         layout_main.addStretch(1)
 
     # **************************************************************************************************************** #
-    # CALLBACK
-    def data_reader_callback(self):
+    def start_comm(self):
         """
-        callback function
+        Start acquisition
         """
-        # ------------------------------------------------------------------------------------------------------------ #
-        # shift data in the array one sample left
-        self.tplot[:-1] = self.tplot[1:]
-        self.tplot[-1] = self.tplot[-2] + self.estimateRate
-        # ------------------------------------------------------------------------------------------------------------ #
-        self.temp_ambient[:-1] = self.temp_ambient[1:]
-        self.temp_object[:-1] = self.temp_object[1:]
-        self.temp_err[:-1] = self.temp_err[1:]
-        # ------------------------------------------------------------------------------------------------------------ #
-        # read from serial
-        try:
-            line = self.ser.readline()
-            line = line.decode("utf-8")
-            line = line.replace("\n", "")
-            if (self.settings['debug']) and (line != "\r"):
-                print("[DBG] {}".format(line))
-        except Exception as e:
-            print("[ERR] unable to read line: {}".format(e))
-            self.try_reconnect()
-            return
-
-        # ------------------------------------------------------------------------------------------------------------ #
-        # handle data
-        # Remove units, spaces, split with coma
-        # Refer to documentation of HVPS to assign data to fields
-        if (self.settings['scales'] == 'Celsius') and ('C' in line):
-            self.data = (line.replace("Ambient = ", "").replace("Object = ", "").
-                         replace("*C", "").replace("\r\n", "").split("\t"))
-        elif (self.settings['scales'] == 'Fahrenheit') and ('F' in line):
-            self.data = (line.replace("Ambient = ", "").replace("Object = ", "").
-                         replace("*F", "").replace("\r\n", "").split("\t"))
+        self.reader.start()
 
-        try:
-            self.temp_ambient[-1] = float(self.data[0])
-            self.temp_ambient_now = format(float(self.data[0]), '2.2f')
+    # **************************************************************************************************************** #
+    # CALLBACK (GUI thread)
+    def update_view(self, samples):
+        """
+        Append parsed samples to the rolling window and history, plots/labels are refreshed by render()
+        :param samples: list or array of rows (time, ambient, object) received since last update
+        """
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.event('update_view')
+            start = metrics.clock()
 
-            self.temp_object[-1] = float(self.data[1])
-            self.temp_object_now = format(float(self.data[1]), '2.2f')
+        # ------------------------------------------------------------------------------------------------------------ #
+        # every sample goes to the history, only the newest ones fit in the plot window
+        samples = np.asarray(samples, dtype=float)
 
-            self.temp_err[-1] = float(self.data[1]) - float(self.data[0])
-            self.temp_err_now = format((float(self.data[1]) - float(self.data[0])), '2.2f')
+        # ------------------------------------------------------------------------------------------------------------ #
+        # append samples to the rolling window, with their arrival times
+        if self.t0 is None:
+            self.t0 = samples[0, 0]
+        t = samples[:, 0] - self.t0
+        self.rate_meter.extend(samples[:, 0])
+        self.window.extend(np.column_stack((t, samples[:, 1], samples[:, 2], samples[:, 2] - samples[:, 1])))
+        self.history.extend(np.column_stack((t, samples[:, 1:3])))
+
+        _, t_ambient, t_object, t_err = self.window.last()
+        self.temp_ambient_now = format(t_ambient, '2.2f')
+        self.temp_object_now = format(t_object, '2.2f')
+        self.temp_err_now = format(t_err, '2.2f')
+
+        self.dirty = True
+        if metrics is not None:
+            metrics.record('window', start)
 
-        except Exception as e:
-            print("[ERR] Unable to convert line: {} - {}".format(line, e))
+    # **************************************************************************************************************** #
+    # CALLBACK (render loop, GUI thread)
+    def render(self):
+        """
+        Refresh plots and labels, only if samples were received since last frame
+        """
+        # every frame of the render loop, for the jitter of the loop
+        if self.metrics is not None:
+            self.metrics.event('render')
+        if not self.dirty:
+            return
+        self.dirty = False
 
         # ------------------------------------------------------------------------------------------------------------ #
         # UPDATE PLOTS/LABELS
-        self.temp_plot.update_plot(t=self.tplot, y1=self.temp_ambient, y2=self.temp_object)
+        metrics = self.metrics
+        if metrics is not None:
+            start = metrics.clock()
+        tplot, temp_ambient, temp_object, _ = self.window.view()
+        self.temp_plot.update_plot(t=tplot, y1=temp_ambient, y2=temp_object)
+        if metrics is not None:
+            metrics.record('plot', start)
+            start = metrics.clock()
         self.temp_plot.update_label(label1=self.temp_ambient_now, label2=self.temp_object_now, label3=self.temp_err_now)
-
-        # ------------------------------------------------------------------------------------------------------------ #
-        # save data to file
-        if self.settings['record']:
-            self.RecordData.save_data(t_ambient=self.temp_ambient[-1],
-                                      t_object=self.temp_object[-1],
-                                      t_error=self.temp_err[-1])
-        # ------------------------------------------------------------------------------------------------------------ #
-        # flush input if too much data not handled: avoid keeping very old values
-        if self.ser.in_waiting > 200:
-            # print(self.ser.in_waiting)
-            self.ser.reset_input_buffer()
+        self.rate_label.setText("Measured rate: {:.2f} Hz".format(self.rate_meter.rate()))
+        if metrics is not None:
+            metrics.record('label', start)
 
     # **************************************************************************************************************** #
-    def try_reconnect(self):
+    def reset_view(self):
         """
-        Reconnection with board
+        Forget the samples shown so far, e.g. when a replay goes back in time: window and history must stay sorted
         """
-        self.ser.close()
-        try:
-            self.ser.open()
-            self.ser.reset_input_buffer()
-            print("[INFO] reconnected to the board")
-        except Exception as err_connection:
-            print("[ERR] connection failed: {}".format(err_connection))
-            pass
+        self.bridge.clear()
+        self.t0 = None
+        self.window.clear()
+        self.history.clear()
+        self.rate_meter.clear()
+        self.dirty = True
 
     # **************************************************************************************************************** #
     def stop_comm(self):
         """
         Stop communication and recording
         """
-        if self.settings['record']:
-            self.RecordData.close_record()
+        self.reader.stop()
+        self.acquisition.stop()
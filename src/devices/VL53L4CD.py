@@ -16,10 +16,14 @@
 # python packages
 from PyQt6.QtWidgets import *
 import numpy as np
-from serial import *
-import sys
 # custom packages
-from src.options.DxRecord import DxRecord
+from src.acquisition.VL53L4CD import VL53L4CDAcquisition
+from src.comm.SampleBridge import SampleBridge
+from src.comm.Transport import open_reader
+from src.core.HistoryStore import HistoryStore
+from src.core.Metrics import Metrics
+from src.core.RateMeter import RateMeter
+from src.core.TimeWindow import TimeWindow
 from src.plots.DxPlot import DxPlot
 
 
@@ -29,61 +33,43 @@ class VL53L4CD_Sat_HelloWorld(QWidget):
         QWidget.__init__(self, parent=parent)
 
         # ------------------------------------------------------------------------------------------------------------ #
-        self.data = None
         self.settings = settings
         self.estimateRate = estimate_rate
 
         # ------------------------------------------------------------------------------------------------------------ #
         # TEMP. PLOTS
-        self.distance_plot = DxPlot(tittle="Distance", y_max=1000)
-        self.signal_plot = DxPlot(tittle="Signal", y_max=50000)
-
-        # init data arrays + time basis,...
-        self.tplot = np.arange(-20 * self.estimateRate, 0.0, self.estimateRate, dtype=float)
-        self.t_save = np.zeros(20, dtype=int)
-
-        # Low Voltage set by user
-        self.status = np.zeros(20, dtype=float)
+        self.distance_plot = DxPlot(tittle="Distance", y_max=1000, high_rate=self.settings['high_rate'])
+        self.signal_plot = DxPlot(tittle="Signal", y_max=50000, high_rate=self.settings['high_rate'])
+
+        # init rolling window: time basis, status, distance, signal
+        # time axis starts with the arrival of the first sample
+        self.t0 = None
+        self.rate_meter = RateMeter()
+        self.rate_label = QLabel("Measured rate: -")
+        self.window = TimeWindow(duration=self.settings['window'], capacity=self.settings['window'] / self.estimateRate,
+                                 channels=4)
+        # samples received since last frame of the render loop
+        self.dirty = False
+        # whole run, shown when zooming out or panning: time basis, distance, signal
+        self.history = HistoryStore(values=2)
+        self.distance_plot.set_history(self.history, column=0)
+        self.signal_plot.set_history(self.history, column=1)
         self.status_now = []
-
-        # Low Voltage monitor
-        self.distance = np.zeros(20, dtype=float)
         self.distance_now = []
-
-        # High Voltage error
-        self.signal = np.zeros(20, dtype=float)
         self.signal_now = []
 
         # ------------------------------------------------------------------------------------------------------------ #
-        # SERIAL COMMUNICATION
-        # open serial port
-        try:
-            self.ser = Serial(self.settings['com_port'], 115200, timeout=0.5)
-        except Exception as err_com_port:
-            print("[ERR.] Please make sure than you use the right COM port: {}".format(err_com_port))
-            sys.exit(-1)
-        # ------------------------------------------------------------------------------------------------------------ #
-        # remove old data in input buffer
-        self.ser.reset_input_buffer()
-
-        # ------------------------------------------------------------------------------------------------------------ #
-        # Read a first time to ensure connection (?)
-        line = self.ser.readline()
-        line.decode("utf-8")
-
-        # read from serial
-        try:
-            line = self.ser.readline()
-            line.decode("utf-8")
-        except Exception as e:
-            print("[ERR] unable to read line: {}".format(e))
-            self.try_reconnect()
-            return
-
-        # ------------------------------------------------------------------------------------------------------------ #
-        # init file to record data
-        if self.settings['record']:
-            self.RecordData = DxRecord(parameters=self.settings)
+        # ACQUISITION
+        # lines are parsed and recorded by the GUI-free acquisition core, outside of the GUI loop, samples come back
+        # to the GUI through the bridge
+        # optional instrumentation of acquisition and display, None when disabled
+        self.metrics = Metrics() if self.settings.get('metrics') else None
+        self.acquisition = VL53L4CDAcquisition(settings=self.settings, metrics=self.metrics)
+        self.bridge = SampleBridge()
+        self.bridge.samples_ready.connect(self.update_view)
+        self.reader = open_reader(settings=self.settings, baudrate=self.acquisition.baudrate,
+                                  parser=self.acquisition.handle_chunk, sink=self.bridge.push,
+                                  metrics=self.metrics, acquisition=self.acquisition)
 
     # **************************************************************************************************************** #
     # INITIALIZE HXL PS VI
@@ -95,105 +81,104 @@ class VL53L4CD_Sat_HelloWorld(QWidget):
         layout_main.setSpacing(3)
         layout_main.addWidget(self.distance_plot)
         layout_main.addWidget(self.signal_plot)
+        layout_main.addWidget(self.rate_label)
         # Data save info
         if self.settings['record']:
-            layout_main.addWidget(self.RecordData)
+            # files of a rotated log are numbered as they are opened
+            saving_to = self.acquisition.RecordData.engine.file_pattern().as_posix()
+            layout_main.addWidget(QLabel("Saving file to: {}".format(saving_to)))
 
         layout_main.addStretch(1)
 
         self.setLayout(layout_main)
 
     # **************************************************************************************************************** #
-    # CALLBACK
-    def data_reader_callback(self):
+    def start_comm(self):
         """
-        callback function
+        Start acquisition
         """
+        self.reader.start()
+
+    # **************************************************************************************************************** #
+    # CALLBACK (GUI thread)
+    def update_view(self, samples):
+        """
+        Append parsed samples to the rolling window and history, plots/labels are refreshed by render()
+        :param samples: list or array of rows (time, status, distance, signal) received since last update
+        """
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.event('update_view')
+            start = metrics.clock()
+
         # ------------------------------------------------------------------------------------------------------------ #
-        # shift data in the array one sample left
-        self.tplot[:-1] = self.tplot[1:]
-        self.tplot[-1] = self.tplot[-2] + self.estimateRate
-        # ------------------------------------------------------------------------------------------------------------ #
-        self.status[:-1] = self.status[1:]
-        self.distance[:-1] = self.distance[1:]
-        self.signal[:-1] = self.signal[1:]
-        # ------------------------------------------------------------------------------------------------------------ #
-        # read from serial
-        try:
-            line = self.ser.readline()
-            line = line.decode("utf-8")
-            line = line.replace("\n", "")
-            if (self.settings['debug']) and (line != "\r"):
-                print("[DBG] {}".format(line))
-        except Exception as e:
-            print("[ERR] unable to read line: {}".format(e))
-            self.try_reconnect()
-            return
+        # every sample goes to the history, only the newest ones fit in the plot window
+        samples = np.asarray(samples, dtype=float)
 
         # ------------------------------------------------------------------------------------------------------------ #
-        # handle data
-        # Remove units, spaces, split with coma
-        # Refer to documentation of HVPS to assign data to fields
-        self.data = (line.replace("Status = ", "").
-                     replace("Distance = ", "").replace(" mm", "").
-                     replace("Signal = ", "").replace(" kcps/spad", "").
-                     replace("\t", "").replace("\r\n", "").split(","))
-
-        try:
-            self.status[-1] = int(self.data[0])
-            self.status_now = format(int(self.data[0]))
-
-            if int(self.data[0]) != 0:
-                self.distance[-1] = 0
-                self.distance_now = 0
-            else:
-                self.distance[-1] = int(self.data[1])
-                self.distance_now = format(int(self.data[1]))
-
-            self.signal[-1] = int(self.data[2])
-            self.signal_now = format(int(self.data[2]))
-
-        except Exception as e:
-            print("[ERR] Unable to convert line: {} - {}".format(line, e))
+        # append samples to the rolling window, with their arrival times
+        if self.t0 is None:
+            self.t0 = samples[0, 0]
+        t = samples[:, 0] - self.t0
+        self.rate_meter.extend(samples[:, 0])
+        self.window.extend(np.column_stack((t, samples[:, 1:])))
+        self.history.extend(np.column_stack((t, samples[:, 2:4])))
+
+        _, status, distance, signal = self.window.last()
+        self.status_now = format(int(status))
+        self.distance_now = format(int(distance))
+        self.signal_now = format(int(signal))
+
+        self.dirty = True
+        if metrics is not None:
+            metrics.record('window', start)
+
+    # **************************************************************************************************************** #
+    # CALLBACK (render loop, GUI thread)
+    def render(self):
+        """
+        Refresh plots and labels, only if samples were received since last frame
+        """
+        # every frame of the render loop, for the jitter of the loop
+        if self.metrics is not None:
+            self.metrics.event('render')
+        if not self.dirty:
+            return
+        self.dirty = False
 
         # ------------------------------------------------------------------------------------------------------------ #
         # UPDATE PLOTS/LABELS
-        self.distance_plot.update_plot(t=self.tplot, y=self.distance)
+        metrics = self.metrics
+        if metrics is not None:
+            start = metrics.clock()
+        tplot, _, distance, signal = self.window.view()
+        self.distance_plot.update_plot(t=tplot, y=distance)
+        self.signal_plot.update_plot(t=tplot, y=signal)
+        if metrics is not None:
+            metrics.record('plot', start)
+            start = metrics.clock()
         self.distance_plot.update_label(label=self.distance_now)
-
-        self.signal_plot.update_plot(t=self.tplot, y=self.signal)
         self.signal_plot.update_label(label=self.signal_now)
-
-        # ------------------------------------------------------------------------------------------------------------ #
-        # save data to file
-        if self.settings['record']:
-            self.RecordData.save_data(status=self.status[-1], distance=self.distance[-1], signal=self.signal[-1])
-        # ************************************************************************************************************ #
-        # flush input if too much data not handled: avoid keeping very old values
-        if self.ser.in_waiting > 200:
-            # print(self.ser.in_waiting)
-            self.ser.reset_input_buffer()
+        self.rate_label.setText("Measured rate: {:.2f} Hz".format(self.rate_meter.rate()))
+        if metrics is not None:
+            metrics.record('label', start)
 
     # **************************************************************************************************************** #
-    # RECONNECTION WITH BOARD
-    def try_reconnect(self):
+    def reset_view(self):
         """
-        Reconnection with board
+        Forget the samples shown so far, e.g. when a replay goes back in time: window and history must stay sorted
         """
-        self.ser.close()
-        try:
-            self.ser.open()
-            self.ser.reset_input_buffer()
-            print("[INFO] reconnected to the board")
-        except Exception as err_connection:
-            print("[ERR] connection failed: {}".format(err_connection))
-            pass
+        self.bridge.clear()
+        self.t0 = None
+        self.window.clear()
+        self.history.clear()
+        self.rate_meter.clear()
+        self.dirty = True
 
     # **************************************************************************************************************** #
-    # RECONNECTION WITH BOARD
     def stop_comm(self):
         """
         Stop communication and recording
         """
-        if self.settings['record']:
-            self.RecordData.close_record()
+        self.reader.stop()
+        self.acquisition.stop()
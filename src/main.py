@@ -17,18 +17,30 @@
 from PyQt6.QtCore import *
 from PyQt6.QtGui import *
 from PyQt6.QtWidgets import *
+from datetime import *
 from os.path import *
+from pathlib import *
+import importlib
 import sys
 # custom packages
 from src.ComSelect import ComSelect
-from src.devices.AMG8833 import pixel_test
-from src.devices.HC_SR04 import HC_SR04_Simple
-from src.devices.MLX90614 import mlxtest
-from src.devices.VL53L4CD import VL53L4CD_Sat_HelloWorld
+from src.comm.RenderLoop import RenderLoop
+from src.plots.MetricsPanel import MetricsPanel
 from src.Userdef import *
 
 fw_mods = True
 
+# Views of the sensors: module, class, groupbox title, width, height and estimation of data rate transmission. The
+# module of a view (plots, pyqtgraph, recorder, parser) is only imported when its sensor is selected. The estimation
+# only sets the initial size of the rolling plot windows, which grow to hold their duration at the measured rate
+DEVICES = {
+    'devices': ('src.devices.AMG8833', 'pixel_test', "Thermal cam devices", 1000, 1000, None),
+    # if custom firmware, board sends every 100ms, else every 500ms
+    'MLX90614': ('src.devices.MLX90614', 'mlxtest', "Thermal sensor MLX90614", 1200, 500, 0.1 if fw_mods else 0.5),
+    'VL53L4CD': ('src.devices.VL53L4CD', 'VL53L4CD_Sat_HelloWorld', "Distance Sensor VL53L4CD", 1200, 500, 0.2),
+    'HC-SR04': ('src.devices.HC_SR04', 'HC_SR04_Simple', "Distance Sensor HC-SR04", 1200, 500, 0.25),
+}
+
 
 ########################################################################################################################
 def resource_path(relative_path):
@@ -43,89 +55,140 @@ def resource_path(relative_path):
     return join(abspath('cmd'), relative_path)
 
 
+########################################################################################################################
+def load_device(setup):
+    """
+    Import the view of a sensor, with its plots and recorder, the first time the sensor is used
+    :param setup: key of DEVICES
+    :return: class of the view
+    """
+    module, name = DEVICES[setup][:2]
+    return getattr(importlib.import_module(module), name)
+
+
+# ******************************************************************************************************************** #
+def create_device(settings):
+    """
+    Build the view of one sensor
+    :param settings: settings of the sensor
+    :return: (groupbox title, width, height, view)
+    """
+    title, width, height, estimate_rate = DEVICES[settings['setup']][2:]
+    view_class = load_device(settings['setup'])
+    if estimate_rate is None:
+        return title, width, height, view_class(settings=settings)
+    return title, width, height, view_class(settings=settings, estimate_rate=estimate_rate)
+
+
+########################################################################################################################
+def record_file(settings, stamp):
+    """
+    Record file of a sensor in a session: default names of the recorders only hold the start time, sensors started
+    together would write to the same file
+    :param settings: settings of the sensor
+    :param stamp: start time of the session
+    :return: path in logs folder, named after sensor and port
+    """
+    folder = Path("logs")
+    folder.mkdir(parents=True, exist_ok=True)
+    if settings['setup'] == "devices":
+        return folder.joinpath("AMG8833_{}_log_{}.thermal".format(Path(settings['com_port']).name, stamp))
+    return folder.joinpath("{}_{}_log_{}.csv".format(settings['setup'], Path(settings['com_port']).name, stamp))
+
+
+########################################################################################################################
 class MainTask(QWidget):
-    def __init__(self):
+    def __init__(self, auto=False):
+        """
+        :param auto: open the sensors found on the ports without showing the dialog, if any
+        """
         QWidget.__init__(self)
 
         # ------------------------------------------------------------------------------------------------------------ #
         # open a dialog to ask port
         dialog = ComSelect("")
-        if not dialog.exec():
-            print("[ERR] Canceled")
-            sys.exit(0)
+        # auto: sensors found on the ports are opened without asking, the dialog is shown if none is found
+        if not (auto and dialog.detect()):
+            # sensors are identified in background while the user fills the dialog
+            if not auto:
+                dialog.start_detection()
+            if not dialog.exec():
+                print("[ERR] Canceled")
+                sys.exit(0)
 
         # ------------------------------------------------------------------------------------------------------------ #
         # get user choices
         self.settings = dialog.get_settings()
+        sensors = self.settings['sensors']
+        session = len(sensors) > 1
 
-        groupbox_text = None
+        # ------------------------------------------------------------------------------------------------------------ #
+        # every sensor has its own acquisition thread, all views are refreshed by the same render loop
+        self.render_loop = RenderLoop(rate=self.settings['render_rate'], debug=self.settings['debug'],
+                                      parent=self)
+        self.setups = []
+        self.metrics_panels = []
+
+        # sensors of a session are shown side by side, two per row
+        columns = 2 if session else 1
+        grid_layout = QGridLayout()
+        stamp = datetime.now().strftime("%Y%m%d-%Hh%M.%S")
         width = 0
         height = 0
 
-        # ------------------------------------------------------------------------------------------------------------ #
-        # Estimation of data rate transmission used for nice beginning of plot and not totally inaccurate time basis
-        # on plots
-        self.time = 0
-        self.estimateRate = 0
-
-        # ------------------------------------------------------------------------------------------------------------ #
-        if self.settings['setup'] == "devices":
-            groupbox_text = "Thermal cam devices"
-            width = 1000
-            height = 1000
-
-            # if custom firmware, wait 1000ms between next reception, else wait 100ms
-            self.time = 5 if fw_mods else 100
-            self.setup = pixel_test(settings=self.settings)
-
-        # ------------------------------------------------------------------------------------------------------------ #
-        elif self.settings['setup'] == "MLX90614":
-            groupbox_text = "Thermal sensor MLX90614"
-            width = 1200
-            height = 500
-
-            # if custom firmware, wait only 100ms between next reception, else wait 500ms
-            self.time = 100 if fw_mods else 500
-            self.estimateRate = 0.1 if fw_mods else 0.5
-            self.setup = mlxtest(settings=self.settings, estimate_rate=self.estimateRate)
-
-        # ------------------------------------------------------------------------------------------------------------ #
-        elif self.settings['setup'] == "VL53L4CD":
-            groupbox_text = "Distance Sensor VL53L4CD"
-            width = 1200
-            height = 500
-
-            self.time = 200
-            self.estimateRate = 0.2
-            self.DxBoard = VL53L4CD_Sat_HelloWorld(settings=self.settings, estimate_rate=self.estimateRate)
-
-        # ------------------------------------------------------------------------------------------------------------ #
-        elif self.settings['setup'] == "HC-SR04":
-            groupbox_text = "Distance Sensor HC-SR04"
-            width = 1200
-            height = 500
-
-            self.time = 250
-            self.estimateRate = 0.25
-            self.setup = HC_SR04_Simple(settings=self.settings, estimate_rate=self.estimateRate)
-
         # ------------------------------------------------------------------------------------------------------------ #
         # INITIALIZE PROGRAM
+        for index, sensor in enumerate(sensors):
+            settings = dict(self.settings, **sensor)
+            if session and settings['record']:
+                settings['record_file'] = record_file(settings, stamp)
+
+            groupbox_text, width, height, setup = create_device(settings)
+
+            groupbox = QGroupBox("{} - {}".format(groupbox_text, settings['com_port']) if session else groupbox_text)
+            groupbox.setStyleSheet('QGroupBox {font-weight: bold;}')
+            groupbox.setAlignment(Qt.AlignmentFlag.AlignLeft)
+            if session:
+                groupbox.setMinimumSize(width // 2, height // 2)
+            else:
+                groupbox.setFixedWidth(width)
+                groupbox.setFixedHeight(height)
+
+            horizontal_layout = QHBoxLayout(groupbox)
+            horizontal_layout.addWidget(setup)
+            groupbox.setLayout(horizontal_layout)
+
+            setup.init_vi()
+            self.render_loop.add(setup)
+
+            # -------------------------------------------------------------------------------------------------------- #
+            # metrics shown over the plots, top left corner
+            if self.settings['metrics']:
+                metrics_panel = MetricsPanel(metrics=setup.metrics, parent=groupbox)
+                metrics_panel.move(20, 30)
+                metrics_panel.raise_()
+                self.metrics_panels.append(metrics_panel)
+
+            grid_layout.addWidget(groupbox, index // columns, index % columns)
+            self.setups.append(setup)
+
+        self.setup = self.setups[0]
 
-        groupbox = QGroupBox(groupbox_text)
-        groupbox.setStyleSheet('QGroupBox {font-weight: bold;}')
-        groupbox.setAlignment(Qt.AlignmentFlag.AlignLeft)
-        groupbox.setFixedWidth(width)
-        groupbox.setFixedHeight(height)
-
-        horizontal_layout = QHBoxLayout(groupbox)
-        horizontal_layout.addWidget(self.setup)
-        groupbox.setLayout(horizontal_layout)
+        vertical_layout = QVBoxLayout()
+        vertical_layout.addLayout(grid_layout)
 
-        self.setup.init_vi()
+        # ------------------------------------------------------------------------------------------------------------ #
+        # replay: slider to seek in recording (1/10 s steps)
+        if self.settings['replay']:
+            reader = self.setup.reader
+            self.seek_slider = QSlider(Qt.Orientation.Horizontal)
+            self.seek_slider.setFixedWidth(width)
+            self.seek_slider.setRange(0, int(reader.duration * 10))
+            self.seek_slider.sliderMoved.connect(lambda value: reader.seek(value / 10))
+            reader.progress.connect(self.update_seek_slider)
+            reader.rewound.connect(self.setup.reset_view)
+            vertical_layout.addWidget(self.seek_slider)
 
-        vertical_layout = QVBoxLayout()
-        vertical_layout.addWidget(groupbox)
         vertical_layout.addStretch(1)
 
         self.main_layout = QHBoxLayout(self)
@@ -133,26 +196,34 @@ class MainTask(QWidget):
         self.main_layout.addStretch(1)
 
         self.setWindowTitle("{} - {}".format(PROGRAM_NAME, PROGRAM_VERSION))
-        self.setGeometry(0, 0, width, height)
-        self.show()
+        if session:
+            self.showMaximized()
+        else:
+            self.setGeometry(0, 0, width, height)
+            self.show()
 
         # ------------------------------------------------------------------------------------------------------------ #
-        # set a timer with the callback function which reads data from serial port and plot
-        # period is 500ms => 2Hz, if enough data sent by the board
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.data_reader_callback)
-        self.timer.start(self.time)
+        # start acquisition threads of the devices: data are read and parsed in background, GUI only renders
+        self.render_loop.start()
+        for setup in self.setups:
+            setup.start_comm()
 
     # **************************************************************************************************************** #
-    def data_reader_callback(self):
-        self.setup.data_reader_callback()
+    def update_seek_slider(self, seconds):
+        """
+        Follow replay position, unless user is dragging the slider
+        """
+        if not self.seek_slider.isSliderDown():
+            self.seek_slider.setValue(int(seconds * 10))
 
     # **************************************************************************************************************** #
     def closeEvent(self, event):
         reply = QMessageBox.question(self, "Window Close", "Are you sure you want to close the window?")
 
         if reply == QMessageBox.StandardButton.Yes:
-            self.setup.stop_comm()
+            self.render_loop.stop()
+            for setup in self.setups:
+                setup.stop_comm()
 
             event.accept()
             if self.settings['debug']:
@@ -167,7 +238,8 @@ def main():
     app.setApplicationName(PROGRAM_NAME)
     app.setWindowIcon(QIcon('epfl_icon.ico'))
 
-    window = MainTask()
+    # python -m src.main --auto: skip the dialog when sensors are found
+    window = MainTask(auto='--auto' in sys.argv)
     window.show()
 
     app.exec()
@@ -16,36 +16,38 @@
 # python packages
 from datetime import *
 from pathlib import *
-from PyQt6.QtWidgets import *
 # custom packages
+from src.core.RecordEngine import RecordEngine
 from src.Userdef import *
 
 
-class Dx2Record(QWidget):
-    def __init__(self, parent=None, port_name=None):
-
-        QWidget.__init__(self, parent=parent)
-
-        folder = Path("logs")
-        folder.mkdir(parents=True, exist_ok=True)
-
+class Dx2Record:
+    def __init__(self, port_name=None, filename=None, **options):
         print("[INFO] Recording data.")
-        self.filename = folder.joinpath("DxSetup_log_{}.csv".format(datetime.now().strftime("%Y%m%d-%Hh%M.%S")))
-
-        self.file = open(self.filename, 'w')
-        self.file.write("Date, {}\r\n".format(datetime.now().strftime("%Y %m %d - %H:%M:%S")))
-        self.file.write("Interface,{},{}\n".format(PROGRAM_NAME, PROGRAM_VERSION))
-        self.file.write("Distance Setup\n")
-        self.file.write("Port,{}\r\n".format(port_name))
-        self.file.write("Time, Status, Distance (mm), Signal (kcps/spad)\r\n")
-
-        self.data_save_label = QLabel("Saving file to: {}".format(self.filename.as_posix()))
-        data_save_layout = QVBoxLayout()
-        data_save_layout.addWidget(self.data_save_label)
-
-    def save_data(self, distance=None):
-        self.file.write("{}, {}\n".format(datetime.now().strftime("%H:%M:%S:%f"), distance))
+        if filename:
+            self.filename = Path(filename)
+        else:
+            # default file name based on start time, in logs folder
+            folder = Path("logs")
+            folder.mkdir(parents=True, exist_ok=True)
+            self.filename = folder.joinpath("DxSetup_log_{}.csv".format(datetime.now().strftime("%Y%m%d-%Hh%M.%S")))
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # samples are written by batches in a background thread
+        # every file of a rotated log is dated with its first sample
+        self.engine = RecordEngine(filename=self.filename, date_line="Date, {}\r\n", header=(
+            "Interface,{},{}\n".format(PROGRAM_NAME, PROGRAM_VERSION),
+            "Distance Setup\n",
+            "Port,{}\r\n".format(port_name),
+            "Time, Status, Distance (mm), Signal (kcps/spad)\r\n",
+        ), columns=1, **options)
+
+    def save_data(self, distance=None, timestamp=None):
+        self.engine.put(distance, timestamp=timestamp)
+
+    def save_block(self, timestamps, rows):
+        self.engine.put_block(timestamps, rows)
 
     def close_record(self):
-        self.file.close()
-        print("[INFO] Data saved to: {}".format(self.filename))
+        self.engine.close()
+        print("[INFO] Data saved to: {}".format(self.engine.saved_to()))
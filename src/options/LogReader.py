@@ -0,0 +1,202 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       src\options\LogReader.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+########################################################################################################################
+
+# python packages
+from pathlib import *
+import numpy as np
+import gzip
+import io
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+HEADER_LINES = 5
+# Dx2Record writes only the distance below the DxRecord column names
+KNOWN_COLUMNS = {
+    ('Distance Setup', 1): ('distance',),
+}
+# columns of integers (VL53L4CD), as named in the header. Missing values (None) are read as MISSING_INTEGER
+INTEGER_COLUMNS = {'Status', 'Distance (mm)', 'Signal (kcps/spad)'}
+MISSING_INTEGER = -1
+# digits of HH:MM:SS:ffffff
+TIME_WIDTH = 15
+TIME_DIGITS = np.array([0, 1, 3, 4, 6, 7, 9, 10, 11, 12, 13, 14])
+TIME_WEIGHTS = np.array([36000, 3600, 600, 60, 10, 1]) * 1000000
+TIME_WEIGHTS = np.concatenate((TIME_WEIGHTS, [100000, 10000, 1000, 100, 10, 1]))
+DAY = np.timedelta64(1, 'D')
+
+
+########################################################################################################################
+class LogReader:
+    """
+    Load CSV logs written by Temp2Record, DxRecord and Dx2Record (plain, .gz or .zst) into structured arrays:
+    'time' as datetime64[us] followed by one field per column, int64 for the integer columns of the VL53L4CD and
+    float64 otherwise, e.g. ('time', 'status', 'distance', 'signal').
+        data = LogReader("logs/DxSetup_log_20261018-10h00.00.csv").load()
+    Large files are read by chunks of chunk_size bytes with chunks(), memory stays bounded by the chunk size.
+    """
+
+    def __init__(self, filename, chunk_size=1 << 26):
+        self.filename = Path(filename)
+        self.chunk_size = chunk_size
+        self.rows = 0
+        self.bad_lines = 0
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # header: Date, Interface, Setup title, Port, column names
+        with self.open() as file:
+            lines = [file.readline().decode('latin-1').strip() for _ in range(HEADER_LINES)]
+            first_row = file.readline()
+        self.header = {
+            'date': lines[0].split(",", 1)[-1].strip(),
+            'interface': lines[1].split(",", 1)[-1],
+            'setup': lines[2],
+            'port': lines[3].split(",", 1)[-1],
+            'columns': [name.strip() for name in lines[4].split(",")],
+        }
+
+        # day of the first sample, rows only hold the time of day. Time of the header: first reference of the
+        # midnight rollover, a log started just before midnight has its first rows on the next day
+        date = self.header['date'].split(" - ")[0].split()
+        self.date = np.datetime64("-".join(date), 'D') if len(date) == 3 else np.datetime64('1970-01-01', 'D')
+        clock = self.header['date'].split(" - ")[-1].split(":")
+        self.start_time = None
+        if len(date) == 3 and len(clock) == 3:
+            self.start_time = ((int(clock[0]) * 60 + int(clock[1])) * 60 + int(clock[2])) * 1000000
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # fields: names from header, unless data rows do not match it
+        count = first_row.count(b",") if first_row.strip() else len(self.header['columns']) - 1
+        names = [column.split()[0].lower() for column in self.header['columns'][1:]]
+        types = ['i8' if column in INTEGER_COLUMNS else 'f8' for column in self.header['columns'][1:]]
+        if len(names) != count:
+            names = KNOWN_COLUMNS.get((self.header['setup'], count), ["value{}".format(i) for i in range(count)])
+            types = ['f8'] * count
+        self.names = tuple(names)
+        self.missing = tuple(MISSING_INTEGER if kind == 'i8' else np.nan for kind in types)
+        fields = list(zip(self.names, types))
+        self.dtype = np.dtype([('time', 'datetime64[us]')] + fields)
+        self.text_dtype = np.dtype([('time', 'S{}'.format(TIME_WIDTH))] + fields)
+
+        # midnight rollover, carried over chunks
+        self.day = 0
+        self.last_time = self.start_time
+
+    # **************************************************************************************************************** #
+    def open(self):
+        """
+        :return: binary file object, decompressed on the fly
+        """
+        if self.filename.suffix == '.gz':
+            return gzip.open(self.filename, 'rb')
+        if self.filename.suffix == '.zst':
+            if zstandard is None:
+                raise ImportError("zstandard package is needed to read {}".format(self.filename))
+            return zstandard.ZstdDecompressor().stream_reader(open(self.filename, 'rb'), closefd=True)
+        return open(self.filename, 'rb')
+
+    # **************************************************************************************************************** #
+    def chunks(self):
+        """
+        Read file by chunks
+        :return: generator of structured arrays
+        """
+        self.day = 0
+        self.last_time = self.start_time
+        with self.open() as file:
+            for _ in range(HEADER_LINES):
+                file.readline()
+
+            rest = b""
+            while True:
+                block = file.read(self.chunk_size)
+                if not block:
+                    break
+                # cut on last complete line
+                block = rest + block
+                end = block.rfind(b"\n") + 1
+                rest = block[end:]
+                if end:
+                    yield self.parse(block[:end])
+            # last line without end of line (record not closed)
+            if rest.strip():
+                yield self.parse(rest)
+
+    # **************************************************************************************************************** #
+    def load(self):
+        """
+        Load whole file
+        :return: structured array
+        """
+        chunks = list(self.chunks())
+        if not chunks:
+            return np.empty(0, dtype=self.dtype)
+        return np.concatenate(chunks)
+
+    # **************************************************************************************************************** #
+    def parse(self, block):
+        """
+        Parse complete lines in one pass
+        :param block: bytes holding complete lines, \r\n or \n
+        :return: structured array
+        """
+        try:
+            text = np.loadtxt(io.BytesIO(block), delimiter=",", dtype=self.text_dtype, encoding='latin-1', ndmin=1)
+        except ValueError:
+            text = self.parse_lines(block)
+        self.rows += len(text)
+        if not len(text):
+            return np.empty(0, dtype=self.dtype)
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # HH:MM:SS:ffffff to microseconds of the day
+        digits = np.ascontiguousarray(text['time']).view(np.uint8).reshape(-1, TIME_WIDTH)[:, TIME_DIGITS]
+        time_of_day = (digits.astype(np.int64) - ord('0')) @ TIME_WEIGHTS
+
+        # time going back more than 12 h: next day
+        previous = np.concatenate(([time_of_day[0] if self.last_time is None else self.last_time], time_of_day[:-1]))
+        days = self.day + np.cumsum(time_of_day - previous < -43200 * 1000000)
+        if len(time_of_day):
+            self.day = int(days[-1])
+            self.last_time = time_of_day[-1]
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        data = np.empty(len(text), dtype=self.dtype)
+        data['time'] = self.date + days * DAY + time_of_day.astype('timedelta64[us]')
+        for name in self.names:
+            data[name] = text[name]
+        return data
+
+    # **************************************************************************************************************** #
+    def parse_lines(self, block):
+        """
+        Slow path when a chunk holds malformed lines (cut line, None values...): parse line by line, None is read as
+        NaN (MISSING_INTEGER in integer columns) and bad lines are skipped
+        :param block: bytes holding complete lines
+        :return: structured array with time as text
+        """
+        rows = []
+        for line in block.splitlines():
+            fields = line.split(b",")
+            try:
+                if len(fields) != len(self.names) + 1 or len(fields[0].strip()) != TIME_WIDTH:
+                    raise ValueError
+                rows.append((fields[0].strip(),) + tuple(missing if field.strip() == b"None" else float(field)
+                                                         for field, missing in zip(fields[1:], self.missing)))
+            except ValueError:
+                if line.strip():
+                    self.bad_lines += 1
+        return np.array(rows, dtype=self.text_dtype)
@@ -16,36 +16,38 @@
 # python packages
 from datetime import *
 from pathlib import *
-from PyQt6.QtWidgets import *
 # custom packages
+from src.core.RecordEngine import RecordEngine
 from src.Userdef import *
 
 
-class Temp2Record(QWidget):
-    def __init__(self, parent=None, parameters=None):
-
-        QWidget.__init__(self, parent=parent)
-
-        folder = Path("logs")
-        folder.mkdir(parents=True, exist_ok=True)
-
+class Temp2Record:
+    def __init__(self, parameters=None, filename=None, **options):
         print("[INFO] Recording data.")
-        self.filename = folder.joinpath("Temp2Setup_log_{}.csv".format(datetime.now().strftime("%Y%m%d-%Hh%M.%S")))
-
-        self.file = open(self.filename, 'w')
-        self.file.write("Date, {}\r\n".format(datetime.now().strftime("%Y %m %d - %H:%M:%S")))
-        self.file.write("Interface,{},{}\n".format(PROGRAM_NAME, PROGRAM_VERSION))
-        self.file.write("Temperature #2 Setup\n")
-        self.file.write("Port,{}\r\n".format(parameters['com_port']))
-        self.file.write("Time, Ambient, Object, error\r\n")
-
-        self.data_save_label = QLabel("Saving file to: {}".format(self.filename.as_posix()))
-        data_save_layout = QVBoxLayout()
-        data_save_layout.addWidget(self.data_save_label)
-
-    def save_data(self, t_ambient=None, t_object=None, t_error=None):
-        self.file.write("{}, {}, {}, {}\n".format(datetime.now().strftime("%H:%M:%S:%f"), t_ambient, t_object, t_error))
+        if filename:
+            self.filename = Path(filename)
+        else:
+            # default file name based on start time, in logs folder
+            folder = Path("logs")
+            folder.mkdir(parents=True, exist_ok=True)
+            self.filename = folder.joinpath("Temp2Setup_log_{}.csv".format(datetime.now().strftime("%Y%m%d-%Hh%M.%S")))
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # samples are written by batches in a background thread
+        # every file of a rotated log is dated with its first sample
+        self.engine = RecordEngine(filename=self.filename, date_line="Date, {}\r\n", header=(
+            "Interface,{},{}\n".format(PROGRAM_NAME, PROGRAM_VERSION),
+            "Temperature #2 Setup\n",
+            "Port,{}\r\n".format(parameters['com_port']),
+            "Time, Ambient, Object, error\r\n",
+        ), columns=3, **options)
+
+    def save_data(self, t_ambient=None, t_object=None, t_error=None, timestamp=None):
+        self.engine.put(t_ambient, t_object, t_error, timestamp=timestamp)
+
+    def save_block(self, timestamps, rows):
+        self.engine.put_block(timestamps, rows)
 
     def close_record(self):
-        self.file.close()
-        print("[INFO] Data saved to: {}".format(self.filename))
+        self.engine.close()
+        print("[INFO] Data saved to: {}".format(self.engine.saved_to()))
@@ -0,0 +1,87 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       src\options\ThermalReader.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+########################################################################################################################
+
+# python packages
+from pathlib import *
+import numpy as np
+import json
+# custom packages
+from src.options.ThermalRecord import HEADER_FILE
+
+
+########################################################################################################################
+class ThermalReader:
+    """
+    Read-only access to a recording made by ThermalRecord. Frames and timestamps are memory-mapped, indexing returns
+    zero-copy views:
+        recording = ThermalReader("logs/ThermalCam_log_20261018-10h00.00.thermal")
+        times, frames = recording[1000:2000]
+    """
+
+    def __init__(self, filename):
+        self.filename = Path(filename)
+        with open(self.filename.joinpath(HEADER_FILE)) as file:
+            self.header = json.load(file)
+        self.shape = tuple(self.header['shape'])
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        self.timestamps = self.map(self.header['timestamps'], ())
+        self.frames = self.map(self.header['frames'], self.shape)
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        # recording not closed properly: last chunk is partially written, keep frames with a timestamp
+        count = self.header['count']
+        if not self.header['closed']:
+            written = np.flatnonzero(self.timestamps == 0)
+            count = int(written[0]) if len(written) else len(self.timestamps)
+            print("[INFO] Recording not closed, {} frames recovered".format(count))
+
+        self.timestamps = self.timestamps[:count]
+        self.frames = self.frames[:count]
+
+    # **************************************************************************************************************** #
+    def map(self, description, shape):
+        """
+        Map one of the data files read-only
+        :param description: file entry of the header
+        :param shape: shape of one item
+        :return: memory-mapped array (N,) + shape
+        """
+        path = self.filename.joinpath(description['file'])
+        dtype = np.dtype(description['dtype'])
+        count = path.stat().st_size // (dtype.itemsize * int(np.prod(shape)))
+        if count == 0:
+            # empty files cannot be mapped
+            return np.empty((0,) + shape, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode='r', shape=(count,) + shape)
+
+    # **************************************************************************************************************** #
+    def __len__(self):
+        return len(self.frames)
+
+    # **************************************************************************************************************** #
+    def __getitem__(self, index):
+        """
+        :param index: frame index or slice
+        :return: (timestamps, frames) views
+        """
+        return self.timestamps[index], self.frames[index]
+
+    # **************************************************************************************************************** #
+    def times(self):
+        """
+        :return: arrival times as a datetime64[ns] view
+        """
+        return self.timestamps.view('datetime64[ns]')
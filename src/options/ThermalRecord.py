@@ -0,0 +1,149 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       src\options\ThermalRecord.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+########################################################################################################################
+
+# python packages
+from datetime import *
+from pathlib import *
+import numpy as np
+import json
+import time
+# custom packages
+from src.Userdef import *
+
+HEADER_FILE = "header.json"
+FRAMES_FILE = "frames.f32"
+TIMESTAMPS_FILE = "timestamps.i64"
+
+
+########################################################################################################################
+class ThermalRecord:
+    """
+    Append-only recording of AMG8833 frames. A recording is a folder holding a JSON header, the frames as a raw float32
+    (N, 8, 8) array and their arrival times as a raw int64 (N,) array (ns since epoch). Both files are memory-mapped and
+    grown by chunks of frames. Use ThermalReader to open a recording.
+    """
+
+    def __init__(self, parameters=None, filename=None, chunk=4096, shape=(8, 8)):
+        print("[INFO] Recording data.")
+        if filename:
+            self.filename = Path(filename)
+        else:
+            # default folder name based on start time, in logs folder
+            folder = Path("logs")
+            folder.mkdir(parents=True, exist_ok=True)
+            timestamp = datetime.now().strftime("%Y%m%d-%Hh%M.%S")
+            self.filename = folder.joinpath("ThermalCam_log_{}.thermal".format(timestamp))
+        self.filename.mkdir(parents=True, exist_ok=True)
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        self.chunk = chunk
+        self.shape = tuple(shape)
+        self.count = 0
+        self.capacity = 0
+        self.frames = None
+        self.timestamps = None
+
+        self.header = {
+            'format': "AMG8833 thermal frames",
+            'version': 1,
+            'interface': "{} {}".format(PROGRAM_NAME, PROGRAM_VERSION),
+            'date': datetime.now().strftime("%Y %m %d - %H:%M:%S"),
+            'port': parameters['com_port'] if parameters else None,
+            'shape': list(self.shape),
+            'frames': {'file': FRAMES_FILE, 'dtype': '<f4', 'unit': "degC"},
+            'timestamps': {'file': TIMESTAMPS_FILE, 'dtype': '<i8', 'unit': "ns since epoch"},
+            'count': 0,
+            'closed': False,
+        }
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        self.grow()
+
+    # **************************************************************************************************************** #
+    def write_header(self):
+        self.header['count'] = self.count
+        with open(self.filename.joinpath(HEADER_FILE), 'w') as file:
+            json.dump(self.header, file, indent=4)
+
+    # **************************************************************************************************************** #
+    def resize(self, capacity):
+        """
+        Resize both files to capacity frames and map them again
+        :param capacity: number of frames
+        """
+        # ------------------------------------------------------------------------------------------------------------ #
+        # release current mappings before resizing the files
+        if self.frames is not None:
+            self.frames.flush()
+            self.timestamps.flush()
+        self.frames = None
+        self.timestamps = None
+
+        frame_size = int(np.prod(self.shape))
+        for name, size in ((FRAMES_FILE, 4 * frame_size), (TIMESTAMPS_FILE, 8)):
+            with open(self.filename.joinpath(name), 'ab') as file:
+                file.truncate(capacity * size)
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        self.capacity = capacity
+        if capacity:
+            self.frames = np.memmap(self.filename.joinpath(FRAMES_FILE), dtype='<f4', mode='r+',
+                                    shape=(capacity,) + self.shape)
+            self.timestamps = np.memmap(self.filename.joinpath(TIMESTAMPS_FILE), dtype='<i8', mode='r+',
+                                        shape=(capacity,))
+
+    # **************************************************************************************************************** #
+    def grow(self):
+        """
+        Add one chunk to the recording, header is updated so that a crash loses at most one chunk
+        """
+        self.resize(self.capacity + self.chunk)
+        self.write_header()
+
+    # **************************************************************************************************************** #
+    def save_data(self, frame, timestamp=None):
+        """
+        Append one frame
+        :param frame: 8x8 temperature matrix
+        :param timestamp: arrival time in ns since epoch, now if None
+        """
+        if self.count == self.capacity:
+            self.grow()
+
+        self.frames[self.count] = frame
+        self.timestamps[self.count] = time.time_ns() if timestamp is None else timestamp
+        self.count += 1
+
+    # **************************************************************************************************************** #
+    def save_block(self, frames, timestamps):
+        """
+        Append several frames with one copy
+        :param frames: array of shape (n, 8, 8)
+        :param timestamps: array of arrival times in ns since epoch
+        """
+        while self.count + len(frames) > self.capacity:
+            self.grow()
+
+        self.frames[self.count:self.count + len(frames)] = frames
+        self.timestamps[self.count:self.count + len(frames)] = timestamps
+        self.count += len(frames)
+
+    # **************************************************************************************************************** #
+    def close_record(self):
+        # drop unused part of last chunk
+        self.resize(self.count)
+        self.header['closed'] = True
+        self.write_header()
+        print("[INFO] Data saved to: {}".format(self.filename))
@@ -16,8 +16,10 @@
 # python packages
 from PyQt6.QtCore import *
 from PyQt6.QtWidgets import *
+import numpy as np
 import pyqtgraph as pg
 # custom packages
+from src.core.Decimator import Decimator
 from src.plots.ColorPlots import *
 
 pg.setConfigOption('background', 'w')
@@ -26,7 +28,7 @@ pg.setConfigOptions(antialias=True)
 
 
 class DxPlot(QWidget):
-    def __init__(self, parent=None, tittle=None, y_max=0):
+    def __init__(self, parent=None, tittle=None, y_max=0, high_rate=False):
         QWidget.__init__(self, parent=parent)
 
         if tittle == 'Distance':
@@ -49,6 +51,15 @@ class DxPlot(QWidget):
         plot_layout = QVBoxLayout()
         plot_layout.addWidget(graphics_layout)
 
+        # history shown instead of the live window when the user zooms or pans
+        self.view_box = dx_plot.getViewBox()
+        self.history = None
+        self.column = 0
+
+        # high-rate mode: live window decimated to the plot width, dense traces drawn without antialiasing
+        self.high_rate = high_rate
+        self.decimator = Decimator()
+
         self.value_plot = dx_plot.plot(pen=self.color_used, name=tittle)
 
         # ------------------------------------------------------------------------------------------------------------ #
@@ -72,9 +83,43 @@ class DxPlot(QWidget):
         main_layout.addLayout(plot_layout)
         main_layout.addLayout(labels_layout)
 
+    ####################################################################################################################
+    def set_history(self, history, column=0):
+        """
+        Show the history of the sensor when the user zooms or pans, the 'A' button of the plot goes back to the live
+        window
+        :param history: HistoryStore of the sensor
+        :param column: value of the history drawn
+        """
+        self.history = history
+        self.column = column
+        self.view_box.sigXRangeChanged.connect(self.update_history)
+
     ####################################################################################################################
     def update_plot(self, t, y):
-        self.value_plot.setData(x=t, y=y)  # plot
+        if self.history is None or self.view_box.autoRangeEnabled()[0]:
+            if self.high_rate:
+                pixels = max(int(self.view_box.width()), 1)
+                x, y_plot = self.decimator.apply(t, y, pixels)
+                self.value_plot.setData(x=x, y=y_plot, antialias=len(t) <= pixels)
+            else:
+                self.value_plot.setData(x=t, y=y)  # plot
+        else:
+            self.update_history()
+
+    ####################################################################################################################
+    def update_history(self):
+        """
+        Draw the min/max envelope of the history level matching the visible range and the plot width
+        """
+        if self.history is None or self.view_box.autoRangeEnabled()[0]:
+            return
+        (t_start, t_end), _ = self.view_box.viewRange()
+        pixels = max(int(self.view_box.width()), 1)
+        t, y_min, y_max, _ = self.history.select(t_start, t_end, pixels=pixels)
+        self.value_plot.setData(x=np.repeat(t, 2),
+                                y=np.column_stack((y_min[:, self.column], y_max[:, self.column])).ravel(),
+                                antialias=not self.high_rate or len(t) <= pixels)
 
     ####################################################################################################################
     def update_label(self, label):
@@ -0,0 +1,64 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       src\plots\MetricsPanel.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+########################################################################################################################
+
+# python packages
+from datetime import *
+from pathlib import *
+from PyQt6.QtCore import *
+from PyQt6.QtGui import *
+from PyQt6.QtWidgets import *
+
+
+class MetricsPanel(QFrame):
+    """
+    Overlay showing the metrics of the acquisition and display path, refreshed every second
+    """
+
+    def __init__(self, metrics=None, parent=None):
+        QFrame.__init__(self, parent=parent)
+        self.metrics = metrics
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        self.setStyleSheet("MetricsPanel {background-color: rgba(255, 255, 255, 220); border: 1px solid gray;}")
+
+        self.text_label = QLabel("")
+        self.text_label.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+
+        dump_button = QPushButton("Save metrics")
+        dump_button.setFixedWidth(100)
+        dump_button.clicked.connect(self.dump)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.text_label)
+        layout.addWidget(dump_button)
+
+        # ------------------------------------------------------------------------------------------------------------ #
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.update_text)
+        self.timer.start(1000)
+
+    ####################################################################################################################
+    def update_text(self):
+        self.text_label.setText(self.metrics.report())
+        self.adjustSize()
+
+    ####################################################################################################################
+    def dump(self):
+        """
+        Save metrics to logs folder
+        """
+        folder = Path("logs")
+        folder.mkdir(parents=True, exist_ok=True)
+        self.metrics.dump(folder.joinpath("Metrics_{}.json".format(datetime.now().strftime("%Y%m%d-%Hh%M.%S"))))
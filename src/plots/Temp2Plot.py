@@ -16,8 +16,10 @@
 # python packages
 from PyQt6.QtCore import *
 from PyQt6.QtWidgets import *
+import numpy as np
 import pyqtgraph as pg
 # custom packages
+from src.core.Decimator import Decimator
 from src.plots.ColorPlots import *
 
 pg.setConfigOption('background', 'w')
@@ -26,7 +28,7 @@ pg.setConfigOptions(antialias=True)
 
 
 class Temp2Plot(QWidget):
-    def __init__(self, parent=None, plot_tittle=None, scale=None):
+    def __init__(self, parent=None, plot_tittle=None, scale=None, high_rate=False):
         QWidget.__init__(self, parent=parent)
 
         self.scale = scale
@@ -50,6 +52,16 @@ class Temp2Plot(QWidget):
         # V_set // V_vm
         self.t_ambient_plot = self.temp_plot.plot(pen=color[2], name="Temp. Ambient")
         self.t_object_plot = self.temp_plot.plot(pen=color[0], name="Temp. Object")
+
+        # history shown instead of the live window when the user zooms or pans
+        self.view_box = self.temp_plot.getViewBox()
+        self.history = None
+        self.columns = (0, 1)
+
+        # high-rate mode: live window decimated to the plot width, dense traces drawn without antialiasing. One
+        # decimator per curve, each curve keeps views of its buffers
+        self.high_rate = high_rate
+        self.decimators = (Decimator(), Decimator())
         # ************************************************************************************************************ #
         # voltage labels
         # ------------------------------------------------------------------------------------------------------------ #
@@ -101,10 +113,45 @@ class Temp2Plot(QWidget):
         self.layout_plot.addWidget(self.graphics_layout)
         self.layout_plot.addLayout(self.temp_labels_layout)
 
+    ####################################################################################################################
+    def set_history(self, history, columns=(0, 1)):
+        """
+        Show the history of the sensor when the user zooms or pans, the 'A' button of the plot goes back to the live
+        window
+        :param history: HistoryStore of the sensor
+        :param columns: values of the history drawn as ambient and object temperatures
+        """
+        self.history = history
+        self.columns = columns
+        self.view_box.sigXRangeChanged.connect(self.update_history)
+
     ####################################################################################################################
     def update_plot(self, t, y1, y2):
-        self.t_ambient_plot.setData(t, y1)  # plot
-        self.t_object_plot.setData(t, y2)
+        if self.history is None or self.view_box.autoRangeEnabled()[0]:
+            if self.high_rate:
+                pixels = max(int(self.view_box.width()), 1)
+                for curve, decimator, y in zip((self.t_ambient_plot, self.t_object_plot), self.decimators, (y1, y2)):
+                    curve.setData(*decimator.apply(t, y, pixels), antialias=len(t) <= pixels)
+            else:
+                self.t_ambient_plot.setData(t, y1)  # plot
+                self.t_object_plot.setData(t, y2)
+        else:
+            self.update_history()
+
+    ####################################################################################################################
+    def update_history(self):
+        """
+        Draw the min/max envelopes of the history level matching the visible range and the plot width
+        """
+        if self.history is None or self.view_box.autoRangeEnabled()[0]:
+            return
+        (t_start, t_end), _ = self.view_box.viewRange()
+        pixels = max(int(self.view_box.width()), 1)
+        t, y_min, y_max, _ = self.history.select(t_start, t_end, pixels=pixels)
+        antialias = not self.high_rate or len(t) <= pixels
+        t = np.repeat(t, 2)
+        for curve, column in zip((self.t_ambient_plot, self.t_object_plot), self.columns):
+            curve.setData(t, np.column_stack((y_min[:, column], y_max[:, column])).ravel(), antialias=antialias)
 
     ####################################################################################################################
     def update_label(self, label1, label2, label3):
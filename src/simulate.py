@@ -0,0 +1,67 @@
+########################################################################################################################
+# @project    EPFL-Herb_Sensors
+# @file       src\simulate.py
+# @brief      Author:             MBE
+#             Institute:          EPFL
+#             Laboratory:         LMTS
+#             Software version:   v1.00
+#             Created on:         18.10.2026
+#             Last modifications: 18.10.2026
+#
+# Copyright 2021/2024 EPFL-LMTS
+# All rights reserved.
+# NO HELP WILL BE GIVEN IF YOU MODIFY THIS CODE !!!
+#
+# Virtual board on a pseudo-terminal (Linux/macOS), the printed port is given to the GUI or to src.acquire:
+#   python -m src.simulate --sensor VL53L4CD --rate 1000 --noise 5 --dropout 0.01
+#   python -m src.acquire --sensor VL53L4CD --port /dev/pts/3 --duration 1m
+########################################################################################################################
+
+# python packages
+import argparse
+import time
+# custom packages
+from src.comm.SensorSimulator import SensorSimulator
+from src.core.Units import parse_duration
+
+SENSORS = ('AMG8833', 'MLX90614', 'VL53L4CD', 'HC-SR04')
+
+
+########################################################################################################################
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate one sensor board on a pseudo-terminal")
+    parser.add_argument('--sensor', required=True, choices=SENSORS)
+    parser.add_argument('--rate', default=10.0, type=float,
+                        help="samples per second, frames per second for AMG8833 (default: 10)")
+    parser.add_argument('--noise', default=0.0, type=float, help="standard deviation added to the measures")
+    parser.add_argument('--dropout', default=0.0, type=float, help="probability to lose each line")
+    parser.add_argument('--burst', default=0, type=int, help="samples sent at once every burst period")
+    parser.add_argument('--burst-period', default=1.0, type=parse_duration, help="time between bursts (default: 1s)")
+    parser.add_argument('--scales', default='Celsius', choices=('Celsius', 'Fahrenheit'), help="MLX90614 unit")
+    parser.add_argument('--seed', default=None, type=int, help="seed of the noise generator")
+    parser.add_argument('--duration', default=None, type=parse_duration,
+                        help="stop after this duration, e.g. 30m, 8h (default: until Ctrl+C)")
+    args = parser.parse_args(argv)
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+    simulator = SensorSimulator(sensor=args.sensor, rate=args.rate, noise=args.noise, dropout=args.dropout,
+                                burst=args.burst, burst_period=args.burst_period, scales=args.scales, seed=args.seed)
+    print("[INFO] {} simulated on {}".format(args.sensor, simulator.port), flush=True)
+
+    start = time.monotonic()
+    deadline = None if args.duration is None else start + args.duration
+    simulator.start()
+    try:
+        while deadline is None or time.monotonic() < deadline:
+            time.sleep(1.0 if deadline is None else max(0.0, min(1.0, deadline - time.monotonic())))
+    except KeyboardInterrupt:
+        print("[INFO] Interrupted")
+
+    simulator.stop()
+    print("[INFO] {} samples in {:.1f} s, {} lines dropped, {} bytes sent, {} bytes lost (port not read)".format(
+        simulator.samples_sent, time.monotonic() - start, simulator.lines_dropped, simulator.bytes_sent,
+        simulator.bytes_dropped))
+
+
+if __name__ == '__main__':
+    main()